@@ -1,148 +1,515 @@
 # app/agent_orchestrator_clean.py
-from typing import Dict, Tuple
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 import os
+import uuid
 import pandas as pd
 
 from app.connectors import similarweb as sw
 from app.connectors import zoominfo as zi
 from app.connectors import salesforce as sf
-from app.utils.dedupe import normalize, fuzzy_dedupe
-from app.utils.sales_navigator_csv import accounts_csv
+from app.schema import LEAD_COLUMNS, as_companies, concat_leads
+from app.utils.dedupe import normalize, fuzzy_dedupe, variant_keys, FuzzyDeduper
+from app.utils.sales_navigator_csv import AccountsCsvWriter
+from app.utils.cache import EnrichmentCache
+from app.utils.enrichment import DomainRandom, MiniModeStream, enrich_companies, random_sources, run_seed
+from app.utils.chunked_output import ChunkedWriter
+from app.utils.checkpoint import CheckpointStore, stage
+from app.utils.export import build_exports, get_exports
+from app.utils.instrumentation import RunReport
+from app.utils.lead_merge import LeadIndex
+from app.utils.lead_scoring import rank_leads
+from app.utils.lead_store import LeadStore
+from app.utils.sharding import shard_pool, sharded_dedupe, sharded_enrich
+from app.utils.stage_graph import StageMemo, frame_from_rows, rows_by_domain
 
+OUTPUT_DIR = "data/outputs"
+DEDUPE_THRESHOLD = 0.92
 
-def run_pipeline(params: Dict, ui_decisions: Dict) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """
-    Orchestrates the mock end-to-end pipeline:
-      Similarweb (mock) → Normalize & Dedupe → Salesforce check (mock)
-      → ZoomInfo personas (mock) → optional Sales Navigator personas (mock)
-      → Sales Navigator CSV + final Excel (with CSV fallback).
-    Returns:
-      companies (DataFrame), leads_df (DataFrame), companies_no_personas (DataFrame)
-    """
 
-    # --- Mini Mode: deterministic seed for reproducible demos ---
-    if params.get("mini_mode"):
-        import random
-        random.seed(42)
-        try:
-            import numpy as np
-            np.random.seed(42)
-        except Exception:
-            pass
+def _output_dir(params: Dict) -> str:
+    """params["output_dir"]: where the run writes its files (one per job in a batch)."""
+    return params.get("output_dir") or OUTPUT_DIR
+
+
+def _memoized(memo: Optional[StageMemo], name: str, params: Dict, ui_decisions: Dict, compute):
+    """compute(), or its memoized output when a StageMemo is given (see app/utils/stage_graph.py)."""
+    if memo is None:
+        return compute()
+    return memo.run(name, params, ui_decisions, compute)
+
 
-    # 1) Similarweb (mock search)
-    raw = sw.search_companies(
+def _search_kwargs(params: Dict) -> Dict:
+    # params["synthetic_rows"]: generated territory of that size (benchmarks, load tests)
+    # params["similarweb_api_url"]: page through the search API (filters pushed down)
+    kwargs = {}
+    if run_seed(params) is not None:
+        kwargs["seed"] = run_seed(params)
+    if params.get("synthetic_rows"):
+        kwargs["size"] = params["synthetic_rows"]
+    if params.get("similarweb_api_url"):
+        kwargs["base_url"] = params["similarweb_api_url"]
+    return kwargs
+
+
+def _search(params: Dict, connector=sw) -> pd.DataFrame:
+    return as_companies(connector.search_companies(
         params["verticals"],
         params["countries"],
         params["min_monthly_visits"],
-    )
+        **_search_kwargs(params),
+    ))
+
+
+def _search_pages(params: Dict, page_size: int, connector=sw) -> Iterator[pd.DataFrame]:
+    """Search results page by page, the next page prefetched while the current one is processed."""
+    for page in connector.search_pages(
+        params["verticals"],
+        params["countries"],
+        params["min_monthly_visits"],
+        page_size=page_size,
+        **_search_kwargs(params),
+    ):
+        yield as_companies(page)
+
+
+def _salesforce_check(deduped: pd.DataFrame, ui_decisions: Dict, connector=sf) -> pd.DataFrame:
+    """Adds sf_account_id (one join against the synced account-domain index) in place."""
+    try:
+        deduped["sf_account_id"] = connector.match_accounts(deduped["domain"])
+    except Exception as e:
+        print(f"[WARN] Salesforce lookup unavailable: {e}")
+        deduped["sf_account_id"] = None
+
+    # Optional: create new SF accounts for selected, still unmatched domains (one bulk insert)
+    to_create = deduped[
+        deduped["domain"].isin(ui_decisions.get("create_sf_accounts", []))
+        & deduped["sf_account_id"].isna()
+    ]
+    if not to_create.empty:
+        try:
+            deduped.loc[to_create.index, "sf_account_id"] = connector.create_accounts(to_create)
+        except Exception as e:
+            print(f"[WARN] Salesforce account creation failed: {e}")
+    return deduped
+
+
+def _sales_navigator_leads(
+    companies: pd.DataFrame,
+    leads: LeadIndex,
+    params: Dict,
+    report: Optional[RunReport] = None,
+    memo: Optional[StageMemo] = None,
+    randoms: Optional[DomainRandom] = None,
+) -> pd.DataFrame:
+    """
+    OPTIONAL: Sales Navigator personas (emails must remain blank) merged into `leads`
+    (a person already found by ZoomInfo keeps one row). Returns the merged leads frame.
+    With a memo, only domains no earlier run looked up (same params) are requested.
+    Seeded runs draw per domain (randoms, default random_sources(params)), so resumed
+    and memoized runs get the same leads.
+    """
+    if not params.get("use_sales_navigator_mock"):
+        return leads.frame()
+    try:
+        from app.connectors import sales_navigator as sn
+        connector = sn.for_run(params)
+        connector = report.connector(connector, "sales_navigator") if report is not None else connector
+        # Include SN leads for ALL companies, filtered by the same titles regex
+        sn_domains = companies["domain"].tolist()
+        regex = params.get("titles_regex", "")
+        randoms = randoms or random_sources(params)
+
+        def lookup(domains):
+            rngs = [randoms.sales_navigator(d) for d in domains] if randoms is not None else None
+            return connector.find_personas_from_account_list(domains, regex, rngs=rngs)
 
-    # 2) Normalize & Dedupe (stdlib difflib inside fuzzy_dedupe)
+        if memo is None:
+            sn_leads = lookup(sn_domains)
+        else:
+            per_domain = memo.run_domains("sales_navigator", params, sn_domains, lambda domains: rows_by_domain(
+                lookup(domains), domains, LEAD_COLUMNS))
+            sn_leads = frame_from_rows(sn_domains, per_domain, LEAD_COLUMNS)
+        leads.add(sn_leads)
+    except Exception as e:
+        # Non-fatal: just log; pipeline continues
+        print(f"[WARN] Sales Navigator mock unavailable: {e}")
+    return leads.frame()
+
+
+def _normalize_and_dedupe(
+    raw: pd.DataFrame, params: Dict, ui_decisions: Dict, pool=None, memo: Optional[StageMemo] = None
+) -> pd.DataFrame:
     norm = normalize(raw)
-    deduped = fuzzy_dedupe(norm, threshold=0.92)
 
-    # Cap to 5 companies in Mini Mode
-    if params.get("mini_mode"):
-        deduped = deduped.head(5).reset_index(drop=True)
+    def dedupe() -> pd.DataFrame:
+        # stdlib difflib inside fuzzy_dedupe (one country per task when sharded)
+        if pool is not None:
+            deduped = sharded_dedupe(norm, DEDUPE_THRESHOLD, pool)
+        else:
+            deduped = fuzzy_dedupe(norm, threshold=DEDUPE_THRESHOLD)
+        # Cap to 5 companies in Mini Mode
+        if params.get("mini_mode"):
+            deduped = deduped.head(5).reset_index(drop=True)
+        return deduped
+
+    deduped = _memoized(memo, "dedupe", params, ui_decisions, dedupe)
 
     # Optional UI overrides: keep specific domains
     if ui_decisions.get("keep_domains"):
         extra = norm[norm["domain"].isin(ui_decisions["keep_domains"])]
-        deduped = (
+        deduped = as_companies(
             pd.concat([deduped, extra])
             .drop_duplicates(subset=["domain"])
             .reset_index(drop=True)
         )
+    return deduped
 
-    # 3) Salesforce check (mock) — SAFE FALLBACKS
-    lookup_fn = getattr(sf, "find_account_by_domain", None)
-    if callable(lookup_fn):
-        deduped["sf_account_id"] = deduped["domain"].apply(lookup_fn)
-    else:
-        deduped["sf_account_id"] = None
 
-    # Optional: create new SF accounts (mock) for selected domains — SAFE FALLBACK
-    create_fn = getattr(sf, "create_account", None)
-    if callable(create_fn):
-        for d in ui_decisions.get("create_sf_accounts", []):
-            idx = deduped.index[deduped["domain"] == d]
-            if len(idx):
-                deduped.loc[idx, "sf_account_id"] = create_fn(
-                    deduped.loc[idx[0], "company_name"], d
-                )
-
-    # 4) ZoomInfo enrichment + personas (mock)
-    enriched_rows = []
-    leads_frames = []
-    for _, row in deduped.iterrows():
-        z = zi.enrich_company(row["domain"])
-        li_url = z.get("linkedin_url") if z else None
-        zi_id = z.get("id") if z else None
-
-        ppl = (
-            zi.find_personas(
-                zi_id,
-                params.get("titles_regex", ""),
-                row.get("country"),
-                row["domain"],
-                enable_email_enrichment=params.get("enable_zoominfo_email_enrichment", True),
-            )
-            if zi_id
-            else pd.DataFrame()
-        )
-        if not ppl.empty:
-            leads_frames.append(ppl)
-
-        enriched_rows.append(
-            {
-                **row.to_dict(),
-                "zoominfo_company_id": zi_id,
-                "li_company_url": li_url,
-            }
-        )
+def _enrich(
+    deduped: pd.DataFrame,
+    params: Dict,
+    ck: Optional[CheckpointStore],
+    connector=zi,
+    pool=None,
+    report: Optional[RunReport] = None,
+    memo: Optional[StageMemo] = None,
+    randoms: Optional[DomainRandom] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    enrich_companies, checkpointed every params["checkpoint_every"] domains when a
+    store is active: finished batches are saved as parts and flagged 'enriched' in the
+    per-company progress table, so a resumed run only enriches what is still pending.
+    With a shard pool the (country, vertical) shards run in worker processes and the
+    stage is checkpointed as a whole.
+    With a memo, only domains no earlier run enriched (same params) are enriched.
+    """
+    if memo is not None:
+        return _enrich_memoized(deduped, params, memo, connector, pool, report, randoms)
+    if pool is not None:
+        return sharded_enrich(deduped, params, pool, report, randoms)
+    if ck is None:
+        return enrich_companies(deduped, params, connector=connector, randoms=randoms)
 
-    companies = pd.DataFrame(enriched_rows)
-    leads_df = (
-        pd.concat(leads_frames, ignore_index=True)
-        if leads_frames
-        else pd.DataFrame(
-            columns=["company_domain", "full_name", "title", "email", "li_profile", "source", "confidence"]
-        )
+    progress = ck.progress(deduped)
+    pending = deduped[deduped["domain"].isin(progress.loc[progress["status"] != "enriched", "domain"])]
+    every = params.get("checkpoint_every", 200)
+    for start in range(0, len(pending), every):
+        companies, leads_df = enrich_companies(pending.iloc[start:start + every], params, connector=connector,
+                                               randoms=randoms)
+        ck.save_part("enrichment", (companies, leads_df))
+        enriched = companies.set_index("domain")
+        done = progress["domain"].isin(enriched.index)
+        for col in ("zoominfo_company_id", "li_company_url"):
+            progress.loc[done, col] = progress.loc[done, "domain"].map(enriched[col])
+        progress.loc[done, "status"] = "enriched"
+        ck.save_progress(progress)
+
+    parts = ck.load_parts("enrichment")
+    if not parts:
+        return enrich_companies(deduped.iloc[0:0], params, connector=connector, randoms=randoms)
+    companies = pd.concat([c for c, _ in parts], ignore_index=True)
+    order = pd.Series(range(len(deduped)), index=deduped["domain"])
+    companies = as_companies(
+        companies.drop_duplicates(subset=["domain"])
+        .assign(_order=lambda c: c["domain"].map(order))
+        .dropna(subset=["_order"])
+        .sort_values("_order", kind="stable")
+        .drop(columns="_order")
+        .reset_index(drop=True)
     )
+    leads_df = concat_leads(l for _, l in parts)
+    leads_df = leads_df[leads_df["company_domain"].isin(companies["domain"])].reset_index(drop=True)
+    return companies, leads_df
 
-    # Companies still needing Sales Navigator (no personas from ZoomInfo)
-    companies_no_personas = companies[~companies["domain"].isin(leads_df["company_domain"])]
 
-    # 4b) OPTIONAL: Sales Navigator personas (emails must remain blank)
-    if params.get("use_sales_navigator_mock"):
-        try:
-            from app.connectors.sales_navigator import find_personas_from_account_list
-            # Include SN leads for ALL companies, filtered by the same titles regex
-            sn_domains = companies["domain"].tolist()
-            sn_leads = find_personas_from_account_list(sn_domains, params.get("titles_regex", ""))
-            if not sn_leads.empty:
-                leads_df = pd.concat([leads_df, sn_leads], ignore_index=True)
-        except Exception as e:
-            # Non-fatal: just log; pipeline continues
-            print(f"[WARN] Sales Navigator mock unavailable: {e}")
+def _enrich_memoized(
+    deduped: pd.DataFrame,
+    params: Dict,
+    memo: StageMemo,
+    connector=zi,
+    pool=None,
+    report: Optional[RunReport] = None,
+    randoms: Optional[DomainRandom] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """_enrich over the domains missing from the memo; per domain it keeps (ZoomInfo id, LinkedIn URL, lead rows)."""
+    def compute(domains):
+        companies, leads_df = _enrich(deduped[deduped["domain"].isin(domains)], params, None, connector, pool, report,
+                                      randoms=randoms)
+        leads = rows_by_domain(leads_df, domains, LEAD_COLUMNS)
+        ids = dict(zip(companies["domain"], zip(companies["zoominfo_company_id"], companies["li_company_url"])))
+        return {d: (*ids.get(d, (None, None)), leads[d]) for d in domains}
+
+    domains = deduped["domain"].tolist()
+    per_domain = memo.run_domains("enrichment", params, domains, compute)
+    companies = deduped.copy()
+    companies["zoominfo_company_id"] = [per_domain[d][0] for d in domains]
+    companies["li_company_url"] = [per_domain[d][1] for d in domains]
+    # categories of the rows present, as enrich_companies builds them
+    companies = companies.astype({c: object for c in companies.select_dtypes("category").columns})
+    leads_df = concat_leads([frame_from_rows(domains, {d: per_domain[d][2] for d in domains}, LEAD_COLUMNS)])
+    return as_companies(companies), leads_df
+
+
+def _scoring(params: Dict) -> bool:
+    """params["lead_scoring"] adds lead_score; params["top_k_personas"] also keeps the K best per company."""
+    return bool(params.get("lead_scoring") or params.get("top_k_personas"))
+
 
+def _export(
+    run_id: str,
+    companies: pd.DataFrame,
+    leads_df: pd.DataFrame,
+    companies_no_personas: pd.DataFrame,
+    params: Dict,
+) -> str:
+    """
+    5) Sales Navigator CSV + 6) final Excel (CSV fallback) and any extra formats in
+    params["export_formats"] ("parquet", "csv.gz"): built once into the export cache
+    under run_id, then written to the run's output directory (params["output_dir"],
+    default OUTPUT_DIR). Returns the main output path.
+    """
+    formats = ["xlsx", *[f for f in params.get("export_formats", []) if f != "xlsx"]]
+    bundle = build_exports(run_id, companies, leads_df, companies_no_personas, formats=formats)
     # --- Ensure output directory exists (Streamlit Cloud safe) ---
-    os.makedirs("data/outputs", exist_ok=True)
+    paths = bundle.write(_output_dir(params))
+    return paths.get("final.xlsx") or paths["final_companies.csv"]
 
-    # 5) Sales Navigator CSV
-    accounts_csv(companies_no_personas, "data/outputs/sn_accounts_upload.csv")
 
-    # 6) Final Excel with three sheets (prefer XlsxWriter; fallback to CSVs)
-    try:
-        with pd.ExcelWriter("data/outputs/final.xlsx", engine="xlsxwriter") as xl:
-            companies.to_excel(xl, sheet_name="Companies", index=False)
-            leads_df.to_excel(xl, sheet_name="Leads", index=False)
-            companies_no_personas.to_excel(xl, sheet_name="Needs_SalesNav", index=False)
-    except Exception as e:
-        # Fallback: write separate CSVs so the app still provides downloads
-        companies.to_csv("data/outputs/final_companies.csv", index=False)
-        leads_df.to_csv("data/outputs/final_leads.csv", index=False)
-        companies_no_personas.to_csv("data/outputs/final_needs_salesnav.csv", index=False)
-        print(f"[WARN] Failed to write XLSX with XlsxWriter: {e}. Wrote CSV fallbacks instead.")
+def _written(path: str, output_dir: str) -> bool:
+    """A checkpointed export is only reused if its file is still there, in this run's output directory."""
+    return os.path.exists(path) and os.path.abspath(os.path.dirname(path)) == os.path.abspath(output_dir)
+
+
+def run_pipeline(
+    params: Dict,
+    ui_decisions: Dict,
+    report: Optional[RunReport] = None,
+    memo: Optional[StageMemo] = None,
+    cache: Optional[EnrichmentCache] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Orchestrates the mock end-to-end pipeline:
+      Similarweb (mock) → Normalize & Dedupe → Salesforce check (mock)
+      → ZoomInfo personas (mock) → optional Sales Navigator personas (mock), merged
+        per person across sources (app/utils/lead_merge.py)
+      → Sales Navigator CSV + final Excel (with CSV fallback).
+    With params["checkpoint"] (or "checkpoint_dir") every stage is checkpointed under
+    the run ID + inputs hash; re-running the same inputs skips finished stages and only
+    enriches the domains still pending.
+    Stage timings, row counts and connector call stats are recorded in `report`
+    (a fresh RunReport if none is passed; params["profile"] = "cprofile"/"tracemalloc"
+    and params["emit_logs"] configure it).
+    params["processes"] > 1 runs dedupe (per country) and enrichment (per country and
+    vertical) in that many worker processes; with a fixed seed (params["seed"] or Mini
+    Mode) the result equals the single-process one.
+    params["lead_store"] (True or a SQLite path) keeps every company and lead in a local
+    store: suppressed domains are dropped right after dedupe (before any ZoomInfo call),
+    suppressed emails/profiles before export, and with params["skip_seen"] also whatever
+    an earlier run produced (keep_domains still go through). Stages loaded from a
+    checkpoint are filtered against the store as it is now. The run is ingested at the end.
+    A StageMemo shared across runs makes them incremental: search and dedupe are reused
+    when only ui_decisions change, and enrichment / Sales Navigator only run for domains
+    the memo has not seen (e.g. newly kept ones).
+    params["similarweb_api_url"], "zoominfo_api_url", "sales_navigator_api_url" and
+    "salesforce_api_url" switch a connector from its mock to the vendor's REST API, all
+    through the shared HTTP client (app/utils/http_client.py).
+    With a connector cache (app/utils/cache.py) this run's Similarweb and ZoomInfo calls
+    are answered from it when they can; other runs in the process are not affected.
+    params["lead_scoring"] scores every lead (lead_score; weights in
+    params["lead_score_weights"]), params["top_k_personas"] = K keeps the K best-scored
+    leads per company (app/utils/lead_scoring.py).
+    Files go to params["output_dir"] (default OUTPUT_DIR). Seeded runs never touch the
+    global random state (search: Random(seed), enrichment and Sales Navigator: one
+    Random per domain), so resumed, memoized and concurrent runs (app/batch_runner.py)
+    reproduce an uninterrupted one. Mini Mode keeps its original single random stream
+    (enrichment.MiniModeStream), replayed per domain; its enrichment and Sales
+    Navigator stages skip the per-domain memo, since a domain's draws depend on the
+    companies before it.
+    Returns:
+      companies (DataFrame), leads_df (DataFrame), companies_no_personas (DataFrame)
+      companies.attrs["run_id"] keys the run's cached downloads (export.get_exports),
+      companies.attrs["run_report"] holds report.to_dict().
+    """
+    if report is None:
+        report = RunReport(profile=params.get("profile"), emit_logs=bool(params.get("emit_logs")))
+    # the mocks, or the vendor APIs (params["<vendor>_api_url"]) through the shared HTTP client
+    sw_, zi_ = sw, zi.for_run(params)
+    if cache is not None:
+        sw_, zi_ = cache.connector(sw_), cache.connector(zi_)
+    sw_, sf_, zi_ = (report.connector(sw_, "similarweb"), report.connector(sf.for_run(params), "salesforce"),
+                     report.connector(zi_, "zoominfo"))
+
+    store = LeadStore.for_run(params)  # None unless params["lead_store"]; closed when the run ends or fails
+    with store or nullcontext(), report.running(), shard_pool(params.get("processes"), cache) as pool:
+        ck = CheckpointStore.for_run(params, ui_decisions)  # None unless params["checkpoint"]
+        skip_seen = bool(params.get("skip_seen"))
+        keep = ui_decisions.get("keep_domains") or ()
+        refiltered = False  # the store dropped rows a checkpointed stage had kept
+
+        # 1) Similarweb (mock search)
+        with report.stage("search") as st:
+            raw = stage(ck, "search", lambda: _memoized(memo, "search", params, ui_decisions,
+                                                        lambda: _search(params, sw_)))
+            st.rows_out = len(raw)
+
+        # 2) Normalize & Dedupe (+ Mini Mode cap and UI overrides)
+        with report.stage("normalize_dedupe", rows_in=len(raw)) as st:
+            deduped = stage(ck, "dedupe", lambda: _normalize_and_dedupe(raw, params, ui_decisions, pool, memo))
+            if store is not None:
+                # anti-join against the suppression list (+ earlier runs) before any paid call
+                deduped = store.filter_companies(deduped, skip_seen, keep=keep)
+            st.rows_out = len(deduped)
 
+        # 3) Salesforce check (+ optional bulk account creation)
+        with report.stage("salesforce", rows_in=len(deduped)) as st:
+            deduped = stage(ck, "salesforce", lambda: _salesforce_check(deduped, ui_decisions, sf_))
+            if store is not None and ck is not None:
+                # a checkpoint predates the store's current state (later runs, new suppressions): filter it again
+                filtered = store.filter_companies(deduped, skip_seen, keep=keep)
+                refiltered, deduped = len(filtered) < len(deduped), filtered
+            st.rows_out = len(deduped)
+            st.extra["sf_matched"] = int(deduped["sf_account_id"].notna().sum())
+
+        randoms = random_sources(params, deduped["domain"].tolist())
+        domain_memo = None if isinstance(randoms, MiniModeStream) else memo
+
+        # 4) ZoomInfo enrichment + personas (mock) — bounded thread pool, input order kept
+        with report.stage("enrichment", rows_in=len(deduped)) as st:
+            companies, leads_df = stage(ck, "enrichment", lambda: _enrich(deduped, params, ck, zi_, pool, report,
+                                                                          domain_memo, randoms))
+            if refiltered:
+                companies = companies[companies["domain"].isin(deduped["domain"])].reset_index(drop=True)
+                leads_df = leads_df[leads_df["company_domain"].isin(deduped["domain"])].reset_index(drop=True)
+            st.rows_out = len(leads_df)
+
+        # ZoomInfo leads merged per person; companies still needing Sales Navigator
+        # (no personas from ZoomInfo) via the per-domain lead counts
+        if store is not None:
+            leads_df = store.filter_leads(leads_df, skip_seen)
+        leads = LeadIndex().add(leads_df)
+        companies_no_personas = leads.without_leads(companies)
+
+        # 4b) OPTIONAL: Sales Navigator personas (emails must remain blank), merged into the ZoomInfo leads
+        with report.stage("sales_navigator", rows_in=len(companies)) as st:
+            leads_df = stage(ck, "sales_navigator", lambda: _sales_navigator_leads(companies, leads, params, report,
+                                                                                   domain_memo, randoms))
+            if refiltered:
+                leads_df = leads_df[leads_df["company_domain"].isin(deduped["domain"])].reset_index(drop=True)
+            if store is not None:
+                leads_df = store.filter_leads(leads_df, skip_seen)
+            st.rows_out = len(leads_df)
+
+        # 4c) OPTIONAL: lead scores (+ only the top-K personas per company)
+        if _scoring(params):
+            with report.stage("scoring", rows_in=len(leads_df)) as st:
+                leads_df = rank_leads(leads_df, params)
+                st.rows_out = len(leads_df)
+
+        # 5) + 6) Sales Navigator CSV and final Excel, built once per run (export cache)
+        run_id = f"{ck.run_id}-{ck.key}" if ck is not None else uuid.uuid4().hex
+        with report.stage("export", rows_in=len(companies) + len(leads_df) + len(companies_no_personas)):
+            output_dir = _output_dir(params)
+            if (ck is None or refiltered or not ck.done("export") or get_exports(run_id) is None
+                    or not _written(ck.load("export"), output_dir)):
+                export_path = _export(run_id, companies, leads_df, companies_no_personas, params)
+                if ck is not None:
+                    ck.save("export", export_path)
+            if store is not None:
+                store.ingest(companies, leads_df, run_id)
+
+    companies.attrs["run_id"] = run_id
+    companies.attrs["run_report"] = report.to_dict()
     return companies, leads_df, companies_no_personas
+
+
+def iter_pipeline_chunks(
+    params: Dict,
+    ui_decisions: Dict,
+    chunk_size: int = 1000,
+    raw_chunks: Optional[Iterable[pd.DataFrame]] = None,
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """
+    Streaming variant of run_pipeline: yields (companies, leads, companies_no_personas)
+    per chunk of Similarweb rows. Only the cross-chunk dedupe state (FuzzyDeduper and the
+    set of force-kept domains) lives for the whole run, so memory is bounded by chunk_size.
+    raw_chunks defaults to the Similarweb search, paged by chunk_size: the first chunk is
+    processed while the next page is fetched.
+    Differences to run_pipeline: domains in keep_domains are emitted where they occur
+    instead of after all deduped rows.
+    """
+    if raw_chunks is None:
+        raw_chunks = _search_pages(params, chunk_size)
+
+    deduper = FuzzyDeduper(DEDUPE_THRESHOLD)
+    keep = set(ui_decisions.get("keep_domains") or [])
+    forced = set()
+    cap = 5 if params.get("mini_mode") else None
+    emitted = 0
+
+    for raw_chunk in raw_chunks:
+        norm = normalize(raw_chunk).reset_index(drop=True)
+        kept = [deduper.add(d, c, n, b) for d, c, n, b in
+                zip(norm["domain"].tolist(), norm["country"].tolist(), norm["company_name"].tolist(),
+                    variant_keys(norm))]
+        deduped = norm[kept]
+        if cap is not None:
+            deduped = deduped.head(max(cap - emitted, 0))
+        emitted += len(deduped)
+
+        # Optional UI overrides: keep specific domains
+        if keep:
+            extra = norm[norm["domain"].isin(keep - forced) & ~norm["domain"].isin(deduped["domain"])]
+            extra = extra.drop_duplicates(subset=["domain"])
+            forced.update(extra["domain"])
+            forced.update(deduped["domain"][deduped["domain"].isin(keep)])
+            deduped = as_companies(pd.concat([deduped, extra]))
+        if deduped.empty:
+            continue
+
+        deduped = _salesforce_check(deduped.reset_index(drop=True), ui_decisions, sf.for_run(params))
+        companies, leads_df = enrich_companies(deduped, params, connector=zi.for_run(params))
+        leads = LeadIndex().add(leads_df)
+        companies_no_personas = leads.without_leads(companies)
+        leads_df = _sales_navigator_leads(companies, leads, params)
+        if _scoring(params):
+            leads_df = rank_leads(leads_df, params)  # a company's leads are all in its chunk
+        yield companies, leads_df, companies_no_personas
+
+
+def run_pipeline_streaming(
+    params: Dict,
+    ui_decisions: Dict,
+    chunk_size: int = 1000,
+    output_dir: Optional[str] = None,
+    fmt: str = "csv",
+    raw_chunks: Optional[Iterable[pd.DataFrame]] = None,
+) -> Dict:
+    """
+    Runs iter_pipeline_chunks and appends every chunk to disk as soon as it is done:
+      final_companies / final_leads / final_needs_salesnav (CSV or Parquet parts)
+      sn_accounts_upload.csv (+ _part2, ... past the Sales Navigator upload row limit)
+    A run that dies midway keeps everything written so far. No XLSX is built
+    (it needs the full frames); convert the parts afterwards if required.
+    output_dir defaults to params["output_dir"], else OUTPUT_DIR.
+    Returns a summary with output paths and row counts.
+    """
+    output_dir = output_dir or _output_dir(params)
+    writer = ChunkedWriter(output_dir, fmt=fmt)
+    sn_writer = AccountsCsvWriter(os.path.join(output_dir, "sn_accounts_upload.csv"))
+
+    chunks = 0
+    for companies, leads_df, companies_no_personas in iter_pipeline_chunks(
+        params, ui_decisions, chunk_size=chunk_size, raw_chunks=raw_chunks
+    ):
+        writer.append("final_companies", companies)
+        writer.append("final_leads", leads_df)
+        writer.append("final_needs_salesnav", companies_no_personas)
+        sn_writer.append(companies_no_personas)
+        chunks += 1
+
+    return {
+        "chunks": chunks,
+        "paths": {**writer.paths, "sn_accounts_upload": sn_writer.paths},
+        "rows": {**writer.rows, "sn_accounts_upload": sn_writer.rows},
+    }
@@ -0,0 +1,188 @@
+# app/batch_runner.py
+"""
+Headless batch runs: many territories (params / ui_decisions sets) from one job file,
+run_pipeline per job on a bounded pool of worker threads.
+
+Job file (JSON):
+  {
+    "defaults": {"params": {...}, "ui_decisions": {...}},     merged under every job
+    "jobs": [
+      {"name": "saas-dach", "params": {"verticals": ["SaaS"], "countries": ["DE", "AT", "CH"]}},
+      {"params": {"verticals": ["Fintech"], "countries": ["FR"]}, "ui_decisions": {"keep_domains": [...]}}
+    ]
+  }
+(a plain list of jobs works too). Missing params fall back to DEFAULT_PARAMS, missing
+names to the territory ("fintech-fr").
+
+Shared by all jobs of a batch:
+  - one StageMemo: enrichment and Sales Navigator results per canonical domain, so
+    overlapping territories look every domain up once (also while both are running)
+  - the connector clients (Salesforce account index, HTTP client) and, with --cache,
+    the connector cache (app/utils/cache.py), passed to every run_pipeline
+  - the ZoomInfo quota: params["zoominfo_rate_limit"] is one process-wide bucket
+    (ratelimit.shared_limiter), so N workers together make at most that many calls/s
+Checkpoints (params["checkpoint"]) are kept per job: run_id defaults to the job name.
+Each job writes to its own directory, <output root>/<name>/ (or params["output_dir"]),
+plus its run_report.json; the batch writes batch_summary.json with the aggregate
+throughput in companies/min.
+
+    python -m app.batch_runner jobs.json --workers 4 --output-root data/batch --cache
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agent_orchestrator_clean import run_pipeline
+from app.utils.cache import EnrichmentCache
+from app.utils.instrumentation import RunReport
+from app.utils.stage_graph import StageMemo
+
+OUTPUT_ROOT = "data/batch"
+DEFAULT_WORKERS = 4
+
+# What the Streamlit sidebar starts with
+DEFAULT_PARAMS = {
+    "verticals": ["SaaS"],
+    "countries": ["DE", "AT", "CH"],
+    "min_monthly_visits": 50000,
+    "titles_regex": "(Head|VP|Director) (Marketing|Sales|Growth|Demand Gen)",
+    "mini_mode": False,
+    "enable_zoominfo_email_enrichment": True,
+    "use_sales_navigator_mock": False,
+}
+
+
+@dataclass
+class BatchJob:
+    name: str
+    params: Dict
+    ui_decisions: Dict = field(default_factory=dict)
+
+
+def _territory_name(params: Dict) -> str:
+    name = "-".join([*params.get("verticals", []), *params.get("countries", [])]).lower()
+    return re.sub(r"[^a-z0-9]+", "-", name).strip("-") or "job"
+
+
+def load_jobs(path: str, output_root: str = OUTPUT_ROOT) -> List[BatchJob]:
+    """Jobs of a job file, defaults merged in; every job gets its own params["output_dir"]."""
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        spec = {"jobs": spec}
+    defaults = spec.get("defaults", {})
+
+    jobs: List[BatchJob] = []
+    names = set()
+    for entry in spec.get("jobs", []):
+        params = {**DEFAULT_PARAMS, **defaults.get("params", {}), **entry.get("params", {})}
+        ui_decisions = {**defaults.get("ui_decisions", {}), **entry.get("ui_decisions", {})}
+        base = entry.get("name") or _territory_name(params)
+        name, n = base, 1
+        while name in names:
+            n += 1
+            name = f"{base}-{n}"
+        names.add(name)
+        params.setdefault("output_dir", os.path.join(output_root, name))
+        params.setdefault("run_id", name)  # own checkpoint directory, even for identical inputs
+        jobs.append(BatchJob(name, params, ui_decisions))
+    return jobs
+
+
+def _run_job(job: BatchJob, memo: Optional[StageMemo], cache: Optional[EnrichmentCache] = None) -> Dict:
+    """One job; a failure is reported in its result instead of stopping the batch."""
+    report = RunReport(profile=job.params.get("profile"), emit_logs=bool(job.params.get("emit_logs")))
+    output_dir = job.params["output_dir"]
+    result = {"name": job.name, "output_dir": output_dir, "error": None}
+    t0 = time.perf_counter()
+    try:
+        companies, leads, needs = run_pipeline(job.params, job.ui_decisions, report=report, memo=memo, cache=cache)
+        result.update(companies=len(companies), leads=len(leads), needs_salesnav=len(needs))
+    except Exception as e:
+        print(f"[WARN] Batch job {job.name} failed: {e}")
+        result.update(companies=0, leads=0, needs_salesnav=0, error=str(e))
+    result["wall_s"] = round(time.perf_counter() - t0, 3)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "run_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report.to_dict(), f, indent=2, default=str)
+    return result
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    workers: int = DEFAULT_WORKERS,
+    memo: Optional[StageMemo] = None,
+    cache: Optional[EnrichmentCache] = None,
+) -> Dict:
+    """
+    Runs the jobs on `workers` threads sharing one StageMemo (a fresh one sized for the
+    batch if none is given) and the connector cache, if any. Returns the summary:
+    per-job results, totals, companies/min.
+    """
+    if memo is None:
+        memo = StageMemo(max_entries=max(16, 2 * len(jobs)), max_tables=max(8, len(jobs)))
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as pool:
+        results = []
+        for result in pool.map(lambda job: _run_job(job, memo, cache), jobs):
+            status = "failed" if result["error"] else "ok"
+            print(f"{result['name']:<24} {status:<6} {result['wall_s']:8.1f}s {result['companies']:>8,} companies "
+                  f"{result['leads']:>9,} leads -> {result['output_dir']}")
+            results.append(result)
+    wall_s = time.perf_counter() - t0
+
+    companies = sum(r["companies"] for r in results)
+    return {
+        "jobs": results,
+        "workers": workers,
+        "failed": sum(1 for r in results if r["error"]),
+        "wall_s": round(wall_s, 3),
+        "companies": companies,
+        "leads": sum(r["leads"] for r in results),
+        "companies_per_min": round(companies / wall_s * 60, 1) if wall_s else None,
+        "memo": dict(memo.stats),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Run many territories headless, outputs per job.")
+    ap.add_argument("job_file")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="jobs running at the same time")
+    ap.add_argument("--output-root", default=OUTPUT_ROOT, help="one sub-directory per job")
+    ap.add_argument("--cache", nargs="?", const=True, default=None, metavar="PATH",
+                    help="share the connector cache (default path, or this SQLite file)")
+    args = ap.parse_args(argv)
+
+    jobs = load_jobs(args.job_file, args.output_root)
+    if not jobs:
+        print(f"[WARN] No jobs in {args.job_file}")
+        return 1
+    cache = None
+    if args.cache:
+        cache = EnrichmentCache() if args.cache is True else EnrichmentCache(args.cache)
+    try:
+        summary = run_batch(jobs, args.workers, cache=cache)
+        if cache is not None:
+            summary["cache"] = dict(cache.stats)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    os.makedirs(args.output_root, exist_ok=True)
+    with open(os.path.join(args.output_root, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"{len(jobs)} jobs ({summary['failed']} failed) in {summary['wall_s']:.1f}s on {args.workers} workers: "
+          f"{summary['companies']:,} companies, {summary['companies_per_min']:,.0f} companies/min")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
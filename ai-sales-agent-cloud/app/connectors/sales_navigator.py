@@ -0,0 +1,117 @@
+# app/connectors/sales_navigator.py
+import random
+import sys
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from app.connectors.zoominfo import _person_slugs, _title_mask
+from app.utils.stable_hash import slug_suffix, stable_id
+
+# REST API (params["sales_navigator_api_url"]), through the shared HTTP client:
+#   POST {base_url}/salesnav/personas/bulk {"domains", "titles_regex"} -> {"results": [persona, ...]}
+PERSONAS_PATH = "/salesnav/personas/bulk"
+BULK_SIZE = 100  # account list entries per request
+
+SN_TITLES = [
+    "Marketing Manager", "Senior Marketing Manager", "Sales Manager",
+    "Account Executive", "BDR", "Head of Partnerships",
+    "Head of Marketing", "VP Marketing", "Director Growth",
+    "Head of Sales", "VP Sales", "Director Demand Gen"
+]
+SN_FIRST = ["Chris","Eva","Tom","Julia","Nico","Hannah","Lukas","Marie","Leo","Nina","Clara","Jonas"]
+SN_LAST  = ["Schneider","Keller","Hoffmann","Bauer","Brandt","Neumann","Kunz","Zimmer","Becker","Wagner","Fischer","Schmidt"]
+
+def _person_slug(first: str, last: str, domain: str) -> str:
+    # Create a deterministic, person-like slug so it visibly looks like a LinkedIn profile URL
+    return f"{first.lower()}-{last.lower()}-{slug_suffix(domain, first, last)}"
+
+PERSONA_COLUMNS = ["company_domain", "full_name", "title", "email", "li_profile", "source", "confidence"]
+
+def find_personas_from_account_list(
+    company_domains: List[str],
+    titles_regex: str,
+    seed: Optional[int] = None,
+    rngs: Optional[Sequence[random.Random]] = None,
+) -> pd.DataFrame:
+    """
+    Mock Sales Navigator:
+      - Generate 1..3 leads per company
+      - Filter by titles_regex (case-insensitive)
+      - Email stays blank; LinkedIn profile is a person-style URL (/in/slug/)
+    With a seed every domain draws from its own Random("<seed>|sn|<domain>"), so a
+    domain's leads don't depend on the batch it is in or on earlier draws; rngs: one
+    random source per domain instead (app/utils/enrichment.py); else the global random
+    module. The title regex is compiled once per regex; rows are built column-wise.
+    """
+    mask = _title_mask(titles_regex, tuple(SN_TITLES))
+    first_ix, last_ix, title_ix = range(len(SN_FIRST)), range(len(SN_LAST)), range(len(SN_TITLES))
+    counts = (1, 2, 3)
+    rng = random.Random() if seed is not None else random
+    choice = rng.choice
+
+    domains, firsts, lasts, titles = [], [], [], []
+    for i, domain in enumerate(company_domains):
+        if rngs is not None:
+            choice = rngs[i].choice
+        elif seed is not None:
+            rng.seed(f"{seed}|sn|{domain}")
+        # Generate a few leads to increase chance of regex matches
+        for _ in range(choice(counts)):
+            fn = choice(first_ix)
+            ln = choice(last_ix)
+            t = choice(title_ix)
+            if not mask[t]:
+                continue
+            domains.append(domain)
+            firsts.append(fn)
+            lasts.append(ln)
+            titles.append(t)
+
+    if not domains:
+        return pd.DataFrame(columns=PERSONA_COLUMNS)
+
+    domain = pd.Series(domains, dtype=object)
+    first = pd.Series(np.asarray(SN_FIRST, dtype=object)[firsts])
+    last = pd.Series(np.asarray(SN_LAST, dtype=object)[lasts])
+    return pd.DataFrame({
+        "company_domain": domain,
+        "full_name": first + " " + last,
+        "title": np.asarray(SN_TITLES, dtype=object)[titles],
+        "email": "",  # email stays empty for Sales Navigator (per requirement)
+        "li_profile": "https://www.linkedin.com/in/" + _person_slugs(first, last, domain) + "/",
+        "source": "sales_navigator",
+        "confidence": 0.6,
+    }, columns=PERSONA_COLUMNS)
+
+
+class SalesNavigatorApi:
+    """find_personas_from_account_list against the Sales Navigator REST API, through the shared HTTP client."""
+
+    def __init__(self, base_url: str, client=None):
+        from app.utils.http_client import shared_client
+        self.base_url = base_url.rstrip("/")
+        self.client = client or shared_client()
+
+    def find_personas_from_account_list(
+        self,
+        company_domains: List[str],
+        titles_regex: str,
+        seed: Optional[int] = None,
+        rngs: Optional[Sequence[random.Random]] = None,
+    ) -> pd.DataFrame:
+        domains = list(company_domains)
+        rows = []
+        for start in range(0, len(domains), BULK_SIZE):
+            payload = {"domains": domains[start:start + BULK_SIZE], "titles_regex": titles_regex}
+            # a search: safe to send again, so retried like a GET
+            page = self.client.post_json(self.base_url + PERSONAS_PATH, payload,
+                                         idempotency_key=stable_id("sn-personas-", repr(payload)))
+            rows.extend((page or {}).get("results") or [])
+        return pd.DataFrame(rows, columns=PERSONA_COLUMNS)
+
+
+def for_run(params: Dict):
+    """This module (the mock), or a SalesNavigatorApi if params["sales_navigator_api_url"] is set."""
+    url = params.get("sales_navigator_api_url")
+    return SalesNavigatorApi(url) if url else sys.modules[__name__]
@@ -1,52 +1,224 @@
-# app/connectors/sales_navigator.py
-import random
-import re
+# app/connectors/salesforce.py
+import itertools
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
 import pandas as pd
-from typing import List, Dict
 
-SN_TITLES = [
-    "Marketing Manager", "Senior Marketing Manager", "Sales Manager",
-    "Account Executive", "BDR", "Head of Partnerships",
-    "Head of Marketing", "VP Marketing", "Director Growth",
-    "Head of Sales", "VP Sales", "Director Demand Gen"
+from app.utils.dedupe import domain_keys
+
+# Bulk API 2.0 accepts up to 10k records per ingest batch
+BULK_BATCH_SIZE = 10_000
+QUERY_PAGE_SIZE = 2_000
+
+# REST API (params["salesforce_api_url"]), through the shared HTTP client:
+#   GET  {base_url}/salesforce/accounts?since=<ISO time>&cursor=  -> {"records": [account, ...], "next_cursor"}
+#   POST {base_url}/salesforce/accounts/bulk {"records": [...]}   -> {"ids": [...]} (one ingest job)
+ACCOUNTS_PATH = "/salesforce/accounts"
+BULK_PATH = "/salesforce/accounts/bulk"
+
+# Accounts the local org starts with, so the demo shows matches and variants
+DEMO_ACCOUNTS = [
+    ("Acmeapp GmbH", "https://www.acmeapp.de/"),
+    ("Cloudify", "cloudify.com"),
+    ("Shophero AG", "https://shophero.ch"),
+    ("Payflux", "https://eu.payflux.com/"),
+    ("Ledgr SAS", "ledgr.fr"),
 ]
-SN_FIRST = ["Chris","Eva","Tom","Julia","Nico","Hannah","Lukas","Marie","Leo","Nina","Clara","Jonas"]
-SN_LAST  = ["Schneider","Keller","Hoffmann","Bauer","Brandt","Neumann","Kunz","Zimmer","Becker","Wagner","Fischer","Schmidt"]
 
-def _person_slug(first: str, last: str, domain: str) -> str:
-    # Create a deterministic, person-like slug so it visibly looks like a LinkedIn profile URL
-    suffix = abs(hash(f"{domain}|{first}|{last}")) % 100000
-    return f"{first.lower()}-{last.lower()}-{suffix}"
 
-def find_personas_from_account_list(company_domains: List[str], titles_regex: str) -> pd.DataFrame:
+class LocalSalesforceOrg:
+    """
+    Offline stand-in for the Salesforce REST query + Bulk API ingest endpoints.
+    Accounts live in memory with an Id, Name, Website and SystemModstamp.
+    """
+
+    def __init__(self, accounts: Optional[List[tuple]] = None):
+        self._accounts: List[Dict] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.api_calls = 0
+        if accounts:
+            self.bulk_insert([{"Name": n, "Website": w} for n, w in accounts])
+
+    def query_accounts(self, since: Optional[datetime] = None) -> Iterator[List[Dict]]:
+        """SELECT Id, Name, Website FROM Account [WHERE SystemModstamp > :since], paged like queryMore."""
+        with self._lock:
+            rows = [a for a in self._accounts if since is None or a["SystemModstamp"] > since]
+        for start in range(0, len(rows), QUERY_PAGE_SIZE):
+            self.api_calls += 1
+            yield [dict(r) for r in rows[start:start + QUERY_PAGE_SIZE]]
+
+    def bulk_insert(self, records: List[Dict]) -> List[str]:
+        """One Bulk API ingest job; returns the new Ids in input order."""
+        if len(records) > BULK_BATCH_SIZE:
+            raise ValueError(f"Bulk batch too large: {len(records)} > {BULK_BATCH_SIZE}")
+        self.api_calls += 1
+        now = datetime.now(timezone.utc)
+        ids = []
+        with self._lock:
+            for r in records:
+                account_id = f"001LOC{next(self._ids):012d}"
+                self._accounts.append({"Id": account_id, "Name": r.get("Name"), "Website": r.get("Website"),
+                                       "SystemModstamp": now})
+                ids.append(account_id)
+        return ids
+
+
+class RestSalesforceOrg:
     """
-    Mock Sales Navigator:
-      - Generate 1..3 leads per company
-      - Filter by titles_regex (case-insensitive)
-      - Email stays blank; LinkedIn profile is a person-style URL (/in/slug/)
+    LocalSalesforceOrg's interface over the REST query + Bulk ingest endpoints, through
+    the shared HTTP client (app.utils.http_client: pooled connections, the host quota,
+    retries). Every ingest job carries its own idempotency key, so a retried insert
+    creates its accounts once.
     """
-    try:
-        pattern = re.compile(titles_regex or "", re.IGNORECASE)
-    except re.error:
-        pattern = re.compile(".*")  # match all if regex invalid
-
-    rows: List[Dict] = []
-    for domain in company_domains:
-        # Generate a few leads to increase chance of regex matches
-        for _ in range(random.choice([1, 2, 3])):
-            fn = random.choice(SN_FIRST)
-            ln = random.choice(SN_LAST)
-            title = random.choice(SN_TITLES)
-            if not pattern.search(title or ""):
-                continue
-            slug = _person_slug(fn, ln, domain)
-            rows.append({
-                "company_domain": domain,
-                "full_name": f"{fn} {ln}",
-                "title": title,
-                "email": "",  # per requirement: keep empty for Sales Navigator
-                "li_profile": f"https://www.linkedin.com/in/{slug}/",
-                "source": "sales_navigator",
-                "confidence": 0.6
-            })
-    return pd.DataFrame(rows)
+
+    def __init__(self, base_url: str, client=None):
+        from app.utils.http_client import shared_client
+        self.base_url = base_url.rstrip("/")
+        self.client = client or shared_client()
+        self.api_calls = 0
+
+    def query_accounts(self, since: Optional[datetime] = None) -> Iterator[List[Dict]]:
+        query = {"since": since.isoformat()} if since is not None else {}
+        cursor = None
+        while True:
+            self.api_calls += 1
+            page = self.client.get_json(self.base_url + ACCOUNTS_PATH, {**query, "cursor": cursor} if cursor else query)
+            page = page or {}
+            yield page.get("records") or []
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
+    def bulk_insert(self, records: List[Dict]) -> List[str]:
+        if len(records) > BULK_BATCH_SIZE:
+            raise ValueError(f"Bulk batch too large: {len(records)} > {BULK_BATCH_SIZE}")
+        self.api_calls += 1
+        job = self.client.post_json(self.base_url + BULK_PATH, {"records": records}, idempotency_key=uuid.uuid4().hex)
+        return list(job["ids"])
+
+
+class SalesforceClient:
+    """
+    Account matching against a local index of the org's account domains.
+
+    sync() pulls Account websites (incrementally after the first call) and indexes them
+    by host, registrable domain and brand (dedupe.domain_keys). match_accounts() then
+    resolves a whole column of domains with one join per key level:
+      exact host  →  same registrable domain (www./subdomains)  →  unique brand (TLD variant)
+    Ambiguous brands (two accounts sharing one) never match.
+    """
+
+    def __init__(self, org=None):
+        self.org = org if org is not None else LocalSalesforceOrg(DEMO_ACCOUNTS)
+        self._websites = pd.Series(dtype=object)   # account Id -> Website
+        self._synced_at: Optional[datetime] = None
+        self._index: Optional[Dict[str, pd.Series]] = None
+        self._lock = threading.Lock()
+
+    def sync(self):
+        """Fetch accounts changed since the last sync and rebuild the key index."""
+        started = datetime.now(timezone.utc)
+        pages = [pd.DataFrame(page) for page in self.org.query_accounts(self._synced_at) if page]
+        with self._lock:
+            if pages:
+                fresh = pd.concat(pages, ignore_index=True).set_index("Id")["Website"]
+                self._websites = pd.concat([self._websites[~self._websites.index.isin(fresh.index)], fresh])
+                self._index = None
+            self._synced_at = started
+
+    def _key_index(self) -> Dict[str, pd.Series]:
+        with self._lock:
+            if self._index is None:
+                sites = self._websites.dropna()
+                keys = domain_keys(sites)
+                keys["Id"] = sites.index
+                index = {}
+                for level in ("host", "registrable"):
+                    index[level] = keys.drop_duplicates(level).set_index(level)["Id"]
+                by_brand = keys.drop_duplicates(["brand", "Id"])
+                unique_brand = by_brand[~by_brand["brand"].duplicated(keep=False)]
+                index["brand"] = unique_brand.set_index("brand")["Id"]
+                self._index = index
+            return self._index
+
+    def match_accounts(self, domains: pd.Series) -> pd.Series:
+        """Account Id (or None) for every domain in the column, same index."""
+        if self._synced_at is None:
+            self.sync()
+        index = self._key_index()
+        keys = domain_keys(domains)
+        matched = keys["host"].map(index["host"]).astype(object)
+        for level in ("registrable", "brand"):
+            missing = matched.isna()
+            if missing.any():
+                matched[missing] = keys.loc[missing, level].map(index[level])
+        return matched.where(matched.notna(), None)
+
+    def create_accounts(self, accounts: pd.DataFrame) -> List[str]:
+        """Bulk-insert accounts (columns company_name, domain); returns Ids in row order."""
+        records = [
+            {"Name": name or domain, "Website": f"https://{domain}"}
+            for name, domain in zip(accounts["company_name"].tolist(), accounts["domain"].tolist())
+        ]
+        ids: List[str] = []
+        for start in range(0, len(records), BULK_BATCH_SIZE):
+            ids.extend(self.org.bulk_insert(records[start:start + BULK_BATCH_SIZE]))
+        if ids:
+            self.sync()
+        return ids
+
+    def find_account_by_domain(self, domain: str) -> Optional[str]:
+        return self.match_accounts(pd.Series([domain])).iloc[0]
+
+    def create_account(self, company_name: str, domain: str) -> str:
+        return self.create_accounts(pd.DataFrame({"company_name": [company_name], "domain": [domain]}))[0]
+
+
+_default_client: Optional[SalesforceClient] = None
+_api_clients: Dict[str, SalesforceClient] = {}
+_default_lock = threading.Lock()
+
+
+def get_client() -> SalesforceClient:
+    """Process-wide client (local stand-in org until real credentials are wired in); shared by concurrent runs."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = SalesforceClient()
+        return _default_client
+
+
+def api_client(base_url: str) -> SalesforceClient:
+    """Process-wide client on the org behind base_url (RestSalesforceOrg), one per URL."""
+    with _default_lock:
+        client = _api_clients.get(base_url)
+        if client is None:
+            client = _api_clients[base_url] = SalesforceClient(RestSalesforceOrg(base_url))
+        return client
+
+
+def for_run(params: Dict):
+    """This module (the local org), or the api_client of params["salesforce_api_url"] if set."""
+    url = params.get("salesforce_api_url")
+    return api_client(url) if url else sys.modules[__name__]
+
+
+def match_accounts(domains: pd.Series) -> pd.Series:
+    return get_client().match_accounts(domains)
+
+
+def create_accounts(accounts: pd.DataFrame) -> List[str]:
+    return get_client().create_accounts(accounts)
+
+
+def find_account_by_domain(domain: str) -> Optional[str]:
+    return get_client().find_account_by_domain(domain)
+
+
+def create_account(company_name: str, domain: str) -> str:
+    return get_client().create_account(company_name, domain)
@@ -1,7 +1,11 @@
 # app/connectors/similarweb.py
+import asyncio
 import random
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from app.utils.prefetch import prefetched
 
 VERTICAL_SAMPLES = {
     'SaaS': ['acmeapp','cloudify','datapulse','flowhq','marketoid'],
@@ -11,20 +15,122 @@ VERTICAL_SAMPLES = {
 
 COUNTRY_DOMAINS = {'DE':'.de','AT':'.at','CH':'.ch','FR':'.fr','US':'.com'}
 
-def search_companies(verticals: List[str], countries: List[str], min_visits: int) -> pd.DataFrame:
+SEARCH_COLUMNS = ['domain', 'company_name', 'country', 'hq_country', 'vertical', 'sw_visits', 'company_url']
+
+# Paged search API: GET {base_url}/similarweb/search?verticals=&countries=&min_visits=&limit=&cursor=
+# -> {"results": [row, ...], "next_cursor": str | null}; the filters are applied server-side.
+SEARCH_PATH = '/similarweb/search'
+PAGE_SIZE = 1000
+
+def search_pages(
+    verticals: List[str],
+    countries: List[str],
+    min_visits: int,
+    page_size: int = PAGE_SIZE,
+    prefetch: int = 1,
+    base_url: Optional[str] = None,
+    client=None,
+    size: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Search results page by page, with `prefetch` pages fetched ahead in the background
+    while the caller works on the current one. base_url: page through the search API
+    (filters pushed down to the request, app.utils.http_client transport); otherwise
+    pages of the mock / generated answer of search_companies (a generated territory is
+    generated page by page, never whole).
+    """
+    if base_url:
+        pages = _api_pages(base_url, verticals, countries, min_visits, page_size, client)
+    elif size:
+        from app.utils.synthetic import synthetic_search_pages
+        pages = synthetic_search_pages(verticals, countries, min_visits, size, page_size, seed)
+    else:
+        df = _local_search(verticals, countries, min_visits, size, seed)
+        pages = (df.iloc[i:i + page_size] for i in range(0, len(df), page_size))
+    return prefetched(pages, prefetch)
+
+async def asearch_pages(*args, **kwargs) -> AsyncIterator[pd.DataFrame]:
+    """search_pages as an async iterator (pages are fetched off the event loop)."""
+    pages = search_pages(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            page = await loop.run_in_executor(None, next, pages, None)
+            if page is None:
+                return
+            yield page
+    finally:
+        pages.close()
+
+def _api_pages(
+    base_url: str, verticals: List[str], countries: List[str], min_visits: int, page_size: int, client=None
+) -> Iterator[pd.DataFrame]:
+    from app.utils.http_client import shared_client
+    client = client or shared_client()
+    url = base_url.rstrip('/') + SEARCH_PATH
+    query = {
+        'verticals': ','.join(verticals),
+        'countries': ','.join(countries),
+        'min_visits': min_visits,
+        'limit': page_size,
+    }
+    cursor = None
+    while True:
+        page = client.get_json(url, {**query, 'cursor': cursor} if cursor else query) or {}
+        rows = page.get('results') or []
+        if rows:
+            yield pd.DataFrame(rows, columns=SEARCH_COLUMNS)
+        cursor = page.get('next_cursor')
+        if not cursor:
+            return
+
+def search_companies(
+    verticals: List[str],
+    countries: List[str],
+    min_visits: int,
+    size: Optional[int] = None,
+    seed: Optional[int] = None,
+    base_url: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    All search results as one frame (search_pages, concatenated). Without base_url a
+    mock search over the sample names; size: answer from a generated territory of that
+    many companies instead (app/utils/synthetic.py, deterministic per seed).
+    A seeded mock draws from its own Random(seed) (else the global random module), so
+    concurrent seeded runs don't interleave their draws.
+    """
+    if not base_url:
+        return _local_search(verticals, countries, min_visits, size, seed)
+    pages = list(search_pages(verticals, countries, min_visits, base_url=base_url))
+    return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(columns=SEARCH_COLUMNS)
+
+def _local_search(
+    verticals: List[str],
+    countries: List[str],
+    min_visits: int,
+    size: Optional[int] = None,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> pd.DataFrame:
+    if size:
+        from app.utils.synthetic import synthetic_search
+        return synthetic_search(verticals, countries, min_visits, size, seed)
+    # rng: continue a given random stream (Mini Mode replays the search draws, app/utils/enrichment.py)
+    rng = rng or (random.Random(seed) if seed is not None else random)
     rows: List[Dict] = []
     for v in verticals:
         names = VERTICAL_SAMPLES.get(v, VERTICAL_SAMPLES['SaaS'])
         for name in names:
             for c in countries:
                 tld = COUNTRY_DOMAINS.get(c, '.com')
-                visits = random.randint(min_visits, max(min_visits + 50_000, min_visits * 3))
+                visits = rng.randint(min_visits, max(min_visits + 50_000, min_visits * 3))
 
                 # Mock HQ logic:
                 # - 70%: HQ in the same country as the result row
                 # - 30%: HQ in a random of the selected countries (or fallback to the same)
                 if countries:
-                    hq = c if random.random() < 0.7 else random.choice(countries)
+                    hq = c if rng.random() < 0.7 else rng.choice(countries)
                 else:
                     hq = c
 
@@ -43,7 +149,8 @@ def search_companies(verticals: List[str], countries: List[str], min_visits: int
 
     # Add a few domain variants (for dedupe demo)
     if not df.empty:
-        extra = df.sample(min(3, len(df))).copy()
+        state = np.random.RandomState(seed) if seed is not None else None  # None: numpy's global state
+        extra = df.sample(min(3, len(df)), random_state=state).copy()
         extra['domain'] = extra['domain'].str.replace('.com', '.io', regex=False)
         # keep same metadata for the variant rows
         df = pd.concat([df, extra], ignore_index=True)
@@ -1,8 +1,21 @@
 # app/connectors/zoominfo.py
 import random
 import re
+import sys
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from app.utils.stable_hash import slug_suffix, slug_suffixes, stable_hash, stable_hashes, stable_id
+
+# REST API (params["zoominfo_api_url"]), through the shared HTTP client:
+#   GET  {base_url}/zoominfo/company?domain=      -> company {"id", "linkedin_url"}, 404 if none
+#   POST {base_url}/zoominfo/personas/bulk {"domains", "titles_regex", "enable_email_enrichment"}
+#                                                 -> {"results": [persona, ...]}
+COMPANY_PATH = "/zoominfo/company"
+PERSONAS_PATH = "/zoominfo/personas/bulk"
 
 TITLES = [
     "VP Marketing", "Head of Marketing", "Director Demand Gen",
@@ -26,7 +39,7 @@ def _email_for(first: str, last: str, domain: str) -> str:
     """
     f = _clean(first).lower().replace(" ", "")
     l = _clean(last).lower().replace(" ", "")
-    idx = abs(hash(f"{domain}|{f}|{l}")) % 5
+    idx = stable_hash(domain, f, l) % 5
 
     if idx == 0:
         local = f"{f}.{l}"
@@ -44,63 +57,164 @@ def _email_for(first: str, last: str, domain: str) -> str:
 
 def _person_slug(first: str, last: str, domain: str) -> str:
     """Create a deterministic person-like slug for a LinkedIn profile URL."""
-    suffix = abs(hash(f"{domain}|{first}|{last}")) % 100000
-    return f"{first.lower()}-{last.lower()}-{suffix}"
+    return f"{first.lower()}-{last.lower()}-{slug_suffix(domain, first, last)}"
 
-def enrich_company(domain: str) -> Optional[Dict]:
-    """Mock: 80% of domains have a ZoomInfo company with a company LinkedIn URL."""
-    if random.random() < 0.8:
+def enrich_company(domain: str, rng: Optional[random.Random] = None) -> Optional[Dict]:
+    """
+    Mock: 80% of domains have a ZoomInfo company with a company LinkedIn URL.
+    rng: random source (default: the global random module).
+    """
+    if (rng or random).random() < 0.8:
         company = domain.split(".")[0]
         return {
-            "id": f"ZC_{abs(hash(domain)) % 10000}",
+            "id": stable_id("ZC_", domain),
             "linkedin_url": f"https://www.linkedin.com/company/{company}/",
         }
     return None
 
+FIRST_NAMES = ["Jane", "John", "Max", "Mia", "Alex", "Lena", "Sara", "Paul"]
+LAST_NAMES = ["Muster", "Doe", "Klein", "Weber", "Fischer", "Schmidt", "Wagner", "Becker"]
+
+PERSONA_COLUMNS = ["company_domain", "full_name", "title", "email", "li_profile", "source", "confidence"]
+
+@lru_cache(maxsize=128)
+def _title_mask(titles_regex: str, titles: Tuple[str, ...] = tuple(TITLES)) -> Tuple[bool, ...]:
+    """Which of `titles` match titles_regex (compiled once per regex and vocabulary, not per call)."""
+    try:
+        pattern = re.compile(titles_regex or "", re.IGNORECASE)
+    except re.error:
+        pattern = re.compile(".*")  # match-all on invalid regex
+    return tuple(bool(pattern.search(t or "")) for t in titles)
+
+def _emails_for(first: pd.Series, last: pd.Series, domain: pd.Series) -> pd.Series:
+    """_email_for over whole columns (pandas string ops; same patterns, pattern choice hashed per row)."""
+    f = first.str.replace(r"[^a-zA-Z\- ]", "", regex=True).str.lower().str.replace(" ", "", regex=False)
+    l = last.str.replace(r"[^a-zA-Z\- ]", "", regex=True).str.lower().str.replace(" ", "", regex=False)
+    idx = stable_hashes(domain, f, l) % 5
+    patterns = [f + "." + l, f.str[:1] + "." + l, f + "." + l.str[:1], f, f + "_" + l]
+    local = pd.Series(np.choose(idx.astype(np.intp), [p.to_numpy(dtype=object) for p in patterns]), index=f.index)
+    local = local.str.strip(".-_")
+    local = local.where(local != "", f)  # guard against empty local part
+    return local + "@" + domain
+
+def _person_slugs(first: pd.Series, last: pd.Series, domain: pd.Series) -> pd.Series:
+    """_person_slug over whole columns."""
+    suffix = slug_suffixes(domain, first, last).set_axis(first.index)
+    return first.str.lower() + "-" + last.str.lower() + "-" + suffix
+
+def find_personas_batch(
+    company_domains: List[str],
+    titles_regex: str,
+    enable_email_enrichment: bool = True,
+    rng: Optional[random.Random] = None,
+    rngs: Optional[Sequence[random.Random]] = None,
+) -> pd.DataFrame:
+    """
+    Mock ZoomInfo personas for many companies at once, as one columnar frame.
+    Random draws happen in the same order as calling find_personas per domain, so a
+    seeded run yields identical rows. The title regex is matched once against the title
+    vocabulary; names, titles, emails and profile URLs are built column-wise.
+    rng: random source (default: the global random module); rngs: one random source
+    per domain instead (seeded runs, see app/utils/enrichment.py).
+    """
+    mask = _title_mask(titles_regex)
+    # draw indices (same random stream as choice() on the lists), resolve them later
+    first_ix, last_ix, title_ix = range(len(FIRST_NAMES)), range(len(LAST_NAMES)), range(len(TITLES))
+    counts = (0, 1, 2, 3)
+
+    domains, firsts, lasts, titles, confidence = [], [], [], [], []
+    for i, domain in enumerate(company_domains):
+        source = rngs[i] if rngs is not None else (rng or random)
+        choice, uniform = source.choice, source.uniform
+        for _ in range(choice(counts)):
+            fn = choice(first_ix)
+            ln = choice(last_ix)
+            t = choice(title_ix)
+            if not mask[t]:  # respect titles regex
+                continue
+            domains.append(domain)
+            firsts.append(fn)
+            lasts.append(ln)
+            titles.append(t)
+            confidence.append(round(uniform(0.6, 0.95), 2))
+
+    if not domains:
+        return pd.DataFrame(columns=PERSONA_COLUMNS)
+
+    domain = pd.Series(domains, dtype=object)
+    first = pd.Series(np.asarray(FIRST_NAMES, dtype=object)[firsts])
+    last = pd.Series(np.asarray(LAST_NAMES, dtype=object)[lasts])
+    return pd.DataFrame({
+        "company_domain": domain,
+        "full_name": first + " " + last,
+        "title": np.asarray(TITLES, dtype=object)[titles],
+        "email": _emails_for(first, last, domain) if enable_email_enrichment else "",
+        "li_profile": "https://www.linkedin.com/in/" + _person_slugs(first, last, domain) + "/",
+        "source": "zoominfo",
+        "confidence": confidence,
+    }, columns=PERSONA_COLUMNS)
+
 def find_personas(
     zoominfo_company_id: str,
     titles_regex: str,
     country: Optional[str],
     company_domain: str,
     enable_email_enrichment: bool = True,
+    rng: Optional[random.Random] = None,
 ) -> pd.DataFrame:
     """
     Mock ZoomInfo: return 0..3 personas.
     - Email is populated if enable_email_enrichment=True, else left blank.
     - li_profile uses a person-style LinkedIn URL (/in/<slug>/).
+    Thin wrapper around find_personas_batch for a single company.
     """
-    # compile regex safely
-    try:
-        pattern = re.compile(titles_regex or "", re.IGNORECASE)
-    except re.error:
-        pattern = re.compile(".*")  # match-all on invalid regex
+    return find_personas_batch([company_domain], titles_regex, enable_email_enrichment, rng=rng)
 
-    n = random.choice([0, 1, 2, 3])
-    rows: List[Dict] = []
 
-    first_names = ["Jane", "John", "Max", "Mia", "Alex", "Lena", "Sara", "Paul"]
-    last_names = ["Muster", "Doe", "Klein", "Weber", "Fischer", "Schmidt", "Wagner", "Becker"]
+class ZoomInfoApi:
+    """
+    enrich_company / find_personas_batch against the ZoomInfo REST API, through the
+    shared HTTP client (app.utils.http_client: pooled connections, the host quota,
+    retries). Persona lookups go out in bulk requests of the host's bulk_size domains.
+    Random sources are accepted for drop-in use and ignored.
+    """
 
-    for _ in range(n):
-        fn = random.choice(first_names)
-        ln = random.choice(last_names)
-        title = random.choice(TITLES)
+    def __init__(self, base_url: str, client=None):
+        from app.utils.http_client import shared_client
+        self.base_url = base_url.rstrip("/")
+        self.client = client or shared_client()
 
-        # respect titles regex
-        if not pattern.search(title or ""):
-            continue
+    def enrich_company(self, domain: str, rng: Optional[random.Random] = None) -> Optional[Dict]:
+        from app.utils.http_client import HttpError
+        try:
+            return self.client.get_json(self.base_url + COMPANY_PATH, {"domain": domain})
+        except HttpError as e:
+            if e.status == 404:
+                return None
+            raise
 
-        email = _email_for(fn, ln, company_domain) if enable_email_enrichment else ""
-        slug = _person_slug(fn, ln, company_domain)
+    def find_personas_batch(
+        self,
+        company_domains: List[str],
+        titles_regex: str,
+        enable_email_enrichment: bool = True,
+        rng: Optional[random.Random] = None,
+        rngs: Optional[Sequence[random.Random]] = None,
+    ) -> pd.DataFrame:
+        domains = list(company_domains)
+        size = self.client.quota_for(urlsplit(self.base_url).hostname or "").bulk_size
+        rows = []
+        for start in range(0, len(domains), size):
+            payload = {"domains": domains[start:start + size], "titles_regex": titles_regex,
+                       "enable_email_enrichment": enable_email_enrichment}
+            # a search: safe to send again, so retried like a GET
+            page = self.client.post_json(self.base_url + PERSONAS_PATH, payload,
+                                         idempotency_key=stable_id("zi-personas-", repr(payload)))
+            rows.extend((page or {}).get("results") or [])
+        return pd.DataFrame(rows, columns=PERSONA_COLUMNS)
 
-        rows.append({
-            "company_domain": company_domain,
-            "full_name": f"{fn} {ln}",
-            "title": title,
-            "email": email,
-            "li_profile": f"https://www.linkedin.com/in/{slug}/",
-            "source": "zoominfo",
-            "confidence": round(random.uniform(0.6, 0.95), 2),
-        })
 
-    return pd.DataFrame(rows)
+def for_run(params: Dict):
+    """This module (the mock), or a ZoomInfoApi if params["zoominfo_api_url"] is set."""
+    url = params.get("zoominfo_api_url")
+    return ZoomInfoApi(url) if url else sys.modules[__name__]
@@ -1,17 +1,19 @@
 from dataclasses import dataclass
 from typing import Optional
-@dataclass
+@dataclass(slots=True)
 class Company:
     domain:str
     company_name:Optional[str]=None
     country:Optional[str]=None
+    hq_country:Optional[str]=None
     vertical:Optional[str]=None
     sw_visits:Optional[int]=None
+    company_url:Optional[str]=None
     sf_account_id:Optional[str]=None
     zoominfo_company_id:Optional[str]=None
     li_company_url:Optional[str]=None
     status:str='pending'
-@dataclass
+@dataclass(slots=True)
 class Lead:
     company_domain:str
     full_name:str
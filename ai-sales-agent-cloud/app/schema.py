@@ -0,0 +1,102 @@
+# app/schema.py
+from dataclasses import MISSING, fields
+from typing import Dict, Iterable, Iterator, List, Optional, Type
+import pandas as pd
+
+from app.models import Company, Lead
+
+# Storage dtype per model field; fields not listed stay object (free-form strings)
+_FIELD_DTYPES = {
+    Company: {
+        "country": "category",
+        "hq_country": "category",
+        "vertical": "category",
+        "sw_visits": "Int64",
+        "status": "category",
+    },
+    Lead: {
+        "company_domain": "category",  # repeated once per persona
+        "title": "category",
+        "source": "category",
+        "confidence": "float32",
+    },
+}
+
+COMPANY_DTYPES: Dict[str, str] = {f.name: _FIELD_DTYPES[Company].get(f.name, "object") for f in fields(Company)}
+LEAD_DTYPES: Dict[str, str] = {f.name: _FIELD_DTYPES[Lead].get(f.name, "object") for f in fields(Lead)}
+
+LEAD_COLUMNS: List[str] = list(LEAD_DTYPES)
+
+
+def apply_dtypes(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """Cast the columns of df that have a compact dtype in `dtypes`; other columns are left alone."""
+    casts = {
+        col: dtype for col, dtype in dtypes.items()
+        if dtype != "object" and col in df.columns and str(df[col].dtype) != dtype
+    }
+    return df.astype(casts) if casts else df
+
+
+def as_companies(df: pd.DataFrame) -> pd.DataFrame:
+    """Companies frame in canonical dtypes (call at every connector boundary and after concat)."""
+    return apply_dtypes(df, COMPANY_DTYPES)
+
+
+def as_leads(df: pd.DataFrame) -> pd.DataFrame:
+    """Leads frame in canonical dtypes; an empty result still gets the lead columns."""
+    if df.empty and not len(df.columns):
+        df = pd.DataFrame(columns=LEAD_COLUMNS)
+    return apply_dtypes(df, LEAD_DTYPES)
+
+
+def concat_leads(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """as_leads(concat(frames)), skipping empty frames so they cannot change the result dtypes."""
+    frames = [f for f in frames if not f.empty]
+    return as_leads(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=LEAD_COLUMNS))
+
+
+def _field_default(f):
+    if f.default is not MISSING:
+        return f.default
+    if f.default_factory is not MISSING:
+        return f.default_factory()
+    return None
+
+
+def iter_records(df: pd.DataFrame, model: Type) -> Iterator:
+    """
+    Rows of df as slotted model instances (for row-wise code paths). Columns that are
+    not model fields are ignored, missing ones take the field default; NA becomes None.
+    """
+    columns = []
+    for f in fields(model):
+        if f.name in df.columns:
+            s = df[f.name]
+            columns.append(s.astype(object).where(s.notna(), None).tolist())
+        else:
+            columns.append([_field_default(f)] * len(df))
+    for values in zip(*columns):
+        yield model(*values)
+
+
+def records_frame(records: Iterable, model: Type, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Typed frame from model instances; `columns` picks and orders a subset of the fields."""
+    names = [f.name for f in fields(model)]
+    frame = pd.DataFrame([[getattr(r, n) for n in names] for r in records], columns=names)
+    if columns is not None:
+        frame = frame[columns]
+    return apply_dtypes(frame, COMPANY_DTYPES if model is Company else LEAD_DTYPES)
+
+
+def memory_report(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Deep memory usage per frame: rows, total bytes and bytes per row."""
+    rows = []
+    for name, df in frames.items():
+        total = int(df.memory_usage(deep=True, index=True).sum())
+        rows.append({
+            "frame": name,
+            "rows": len(df),
+            "bytes": total,
+            "bytes_per_row": round(total / len(df), 1) if len(df) else None,
+        })
+    return pd.DataFrame(rows, columns=["frame", "rows", "bytes", "bytes_per_row"])
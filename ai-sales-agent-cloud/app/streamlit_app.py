@@ -1,29 +1,117 @@
 # app/streamlit_app.py
-import sys, os, io
+import sys, os, time
+from typing import Dict
 # Ensure imports work on Streamlit Cloud (add repo root to PYTHONPATH)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
-import pandas as pd
 
-# 👉 Use the clean orchestrator module
-from app.agent_orchestrator_clean import run_pipeline
-from app.utils.sales_navigator_csv import accounts_csv
+# pandas, the connectors and the orchestrator are imported on first use (inside the
+# functions below / the background job), so the page paints before they load.
 
+# Finished runs kept for reuse: identical inputs within the TTL skip the pipeline
+RESULT_CACHE_ENTRIES = 16
+RESULT_CACHE_TTL = 3600  # seconds
 
-def make_excel_bytes(companies: pd.DataFrame, leads: pd.DataFrame, needs_sn: pd.DataFrame):
-    """Try to generate an XLSX in memory. Return bytes or None on failure."""
-    try:
-        bio = io.BytesIO()
-        with pd.ExcelWriter(bio, engine="xlsxwriter") as xl:
-            companies.to_excel(xl, sheet_name="Companies", index=False)
-            leads.to_excel(xl, sheet_name="Leads", index=False)
-            needs_sn.to_excel(xl, sheet_name="Needs_SalesNav", index=False)
-        bio.seek(0)
-        return bio.getvalue()
-    except Exception as e:
-        print(f"[WARN] Could not build in-memory XLSX: {e}")
-        return None
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+@st.cache_resource
+def connector_cache():
+    """One on-disk connector cache per Streamlit server process."""
+    from app.utils.cache import EnrichmentCache
+    return EnrichmentCache()
+
+
+@st.cache_resource
+def stage_memo():
+    """Stage outputs shared by all runs, so editing the human-in-the-loop decisions only recomputes what changed."""
+    from app.utils.stage_graph import StageMemo
+    return StageMemo()
+
+
+@st.cache_resource
+def job_registry():
+    """Runs by normalized inputs key, shared by all sessions; later identical requests get the same job."""
+    from app.utils.jobs import JobRegistry
+    return JobRegistry(max_entries=RESULT_CACHE_ENTRIES, ttl=RESULT_CACHE_TTL)
+
+
+def pipeline_job(key: str, params: Dict, ui: Dict, profile: str, reuse_stages: bool = True, use_cache: bool = False):
+    """
+    The background run for key: the registered one, else a new run (stage outputs from
+    stage_memo(); connector calls from connector_cache() if use_cache, for this run only).
+    """
+    def start():
+        from app.utils.instrumentation import RunReport
+        from app.utils.jobs import PipelineJob
+        report = RunReport(profile=None if profile == 'off' else profile)
+        return PipelineJob(params, ui, report, memo=stage_memo() if reuse_stages else None,
+                           cache=connector_cache() if use_cache else None).start()
+    return job_registry().get_or_start(key, start)
+
+
+@st.cache_resource(max_entries=RESULT_CACHE_ENTRIES, ttl=RESULT_CACHE_TTL, show_spinner=False)
+def result_views(run_id: str, _companies, _leads, _needs):
+    """Indexed views of one run's result frames; the frames stay on the server."""
+    from app.utils.result_view import company_view, lead_view
+    return {
+        'companies': company_view(_companies),
+        'leads': lead_view(_leads, _companies),
+        'needs': company_view(_needs),
+    }
+
+
+@st.fragment
+def result_table(name: str, view):
+    """One page of a result view; filter, sort and page changes rerun only this table."""
+    from app.utils.result_view import to_arrow
+    filter_cols = st.columns(len(view.choices) + len(view.text) + 3)
+    filters = {}
+    for col, column in zip(filter_cols, view.choices):
+        filters[column] = col.multiselect(column.replace('_', ' ').capitalize(), view.options(column),
+                                          key=f'{name}_{column}')
+    for col, column in zip(filter_cols[len(view.choices):], view.text):
+        filters[column] = col.text_input(f'{column.capitalize()} contains', key=f'{name}_{column}')
+    sort_col, order_col, size_col = filter_cols[-3:]
+    sort_by = sort_col.selectbox('Sort by', ['(none)', *view.columns], key=f'{name}_sort')
+    descending = order_col.checkbox('Descending', key=f'{name}_desc')
+    page_size = size_col.selectbox('Rows per page', PAGE_SIZES, index=1, key=f'{name}_size')
+
+    rows = view.select(filters, None if sort_by == '(none)' else sort_by, not descending)
+    pages = max(1, -(-len(rows) // page_size))
+    if st.session_state.get(f'{name}_page', 1) > pages:  # a narrower filter left fewer pages
+        st.session_state[f'{name}_page'] = pages
+    page = st.number_input('Page', min_value=1, max_value=pages, value=1, key=f'{name}_page')
+    shown = view.page(rows, page - 1, page_size)
+    st.dataframe(to_arrow(shown), use_container_width=True)
+    first = (page - 1) * page_size
+    st.caption(f'Rows {first + 1 if len(shown) else 0:,}–{first + len(shown):,} of {len(rows):,} '
+               f'matching ({len(view):,} total)')
+
+
+@st.fragment(run_every=0.5)
+def job_progress():
+    """Polls the running job without rerunning the page; one full rerun once it is done."""
+    job = st.session_state.job
+    fraction, label = job.progress()
+    st.progress(fraction, text=f'Running pipeline: {label}')
+    if job.done:
+        st.rerun()
+
+
+@st.fragment
+def downloads(companies, leads, needs):
+    """Download buttons; a click reruns only this fragment, not the tables above."""
+    # Artifacts are built once per run and cached; reruns only serve the bytes
+    from app.utils.export import build_exports, get_exports
+    run_id = companies.attrs.get('run_id', 'session')
+    bundle = get_exports(run_id) or build_exports(run_id, companies, leads, needs)
+    if bundle.get('final.xlsx') is None:
+        st.info("Could not build Excel workbook in this environment. Offering CSV downloads instead.")
+    # sn_accounts_upload*.csv come from the same columnar builder as the on-disk files
+    for file_name, data in bundle.artifacts.items():
+        st.download_button(f'📥 {file_name}', data=data, file_name=file_name, mime=bundle.mime(file_name))
 
 
 st.set_page_config(page_title='AI Sales Agent (Cloud)', layout='wide')
@@ -43,18 +131,35 @@ with st.sidebar:
     st.subheader('Lead Enrichment Options')
     enrich_emails_zoominfo = st.checkbox('Enrich emails from ZoomInfo', value=True)
     include_sn_leads = st.checkbox('Include Sales Navigator mock leads', value=False)
+    score_leads = st.checkbox('Score leads', value=False,
+                              help='Ranks leads by title seniority, title match, source, email and confidence.')
+    top_k = st.number_input('Top personas per account (0 = all)', min_value=0, value=0, step=1,
+                            disabled=not score_leads)
+    use_cache = st.checkbox('Cache ZoomInfo/Similarweb lookups', value=False,
+                            help='Re-runs only pay for domains not enriched within the TTL.')
+    use_checkpoints = st.checkbox('Checkpoint & resume runs', value=False,
+                                  help='Re-running the same inputs skips finished stages.')
+    use_store = st.checkbox('Remember results (local lead store)', value=False,
+                            help='Keeps every company and lead; suppressed domains are never enriched.')
+    skip_seen = st.checkbox('Skip accounts & leads from earlier runs', value=False, disabled=not use_store)
+    profile_mode = st.selectbox('Profile run', ['off', 'cprofile', 'tracemalloc'], index=0,
+                                help='Adds a profiler report to the run diagnostics.')
 
     st.markdown('---')
     run = st.button('Run pipeline')
+    if st.button('Clear cached results', help='Identical inputs are otherwise answered from the last run.'):
+        # only this session's runs: other sessions keep theirs (and the shared stage memo)
+        for key in st.session_state.get('run_keys', ()):
+            job_registry().evict(key)
+        st.session_state.run_keys = set()
+        st.session_state.fresh = True
 
 st.markdown('---')
 st.markdown('### 🔍 Similarweb → Normalize & Dedupe')
 
-# Session state containers
-if 'companies' not in st.session_state:
-    st.session_state.companies = pd.DataFrame()
-    st.session_state.leads = pd.DataFrame()
-    st.session_state.needs_sn = pd.DataFrame()
+# Session state: the current run (a PipelineJob, possibly still running)
+if 'job' not in st.session_state:
+    st.session_state.job = None
 
 st.markdown('### ⚙️ Human-in-the-Loop')
 with st.expander('Dedupe/Overrides'):
@@ -78,83 +183,68 @@ if run:
         # toggles:
         'enable_zoominfo_email_enrichment': bool(enrich_emails_zoominfo),
         'use_sales_navigator_mock': bool(include_sn_leads),
+        'lead_scoring': bool(score_leads),
+        'top_k_personas': int(top_k) if score_leads and top_k else None,
+        'checkpoint': bool(use_checkpoints),
+        'lead_store': bool(use_store),
+        'skip_seen': bool(use_store and skip_seen),
     }
-    with st.spinner('Running pipeline...'):
-        companies, leads, needs = run_pipeline(params, ui)
-    st.session_state.companies = companies
-    st.session_state.leads = leads
-    st.session_state.needs_sn = needs
-    st.success('Pipeline completed.')
-
-if not st.session_state.companies.empty:
+    from app.utils.jobs import run_key
+    key = run_key(params, ui) + f'|profile={profile_mode}'
+    requested = time.time()
+    st.session_state.job = pipeline_job(key, params, ui, profile_mode,
+                                        reuse_stages=not st.session_state.pop('fresh', False), use_cache=use_cache)
+    st.session_state.job_key = key
+    st.session_state.setdefault('run_keys', set()).add(key)
+    st.session_state.reused = st.session_state.job.started < requested
+    st.session_state.announce = True
+
+job = st.session_state.job
+if job is not None and not job.done:
+    job_progress()
+elif job is not None and job.error is not None:
+    job_registry().evict(st.session_state.job_key, job)  # don't keep serving a failed run
+    st.error(f'Pipeline failed: {job.error}')
+elif job is not None:
+    if st.session_state.pop('announce', False):
+        if st.session_state.reused:
+            st.success('Pipeline completed (reused the result of an identical run).')
+        else:
+            st.success(f'Pipeline completed in {job.finished - job.started:.1f}s.')
+    if use_cache:
+        stats = connector_cache().stats
+        st.caption('Connector cache: ' + ', '.join(f'{k}={v}' for k, v in sorted(stats.items())))
+
+    report = job.report
+    with st.expander('⏱️ Run diagnostics'):
+        memo_stats = stage_memo().stats
+        if memo_stats:
+            st.caption('Stage memo: ' + ', '.join(f'{k}={v}' for k, v in sorted(memo_stats.items())))
+        st.dataframe(report.stages_frame(), use_container_width=True)
+        st.dataframe(report.connectors_frame(), use_container_width=True)
+        if report.profile_text:
+            st.code(report.profile_text)
+        st.download_button('📥 metrics.prom', data=report.to_prometheus().encode('utf-8'),
+                           file_name='metrics.prom', mime='text/plain')
+
+result = job.result if job is not None and job.done and job.error is None else None
+if result is not None and not result[0].empty:
+    companies, leads, needs = result
+    # Tables page server-side: only the rows on screen are sent to the browser
+    views = result_views(companies.attrs.get('run_id', 'session'), companies, leads, needs)
     st.subheader('🏢 Companies')
-    st.dataframe(st.session_state.companies, use_container_width=True)
+    result_table('companies', views['companies'])
 
     st.subheader('👥 Leads')
-    # Show only the most relevant columns in the Leads table
-    preferred_cols = ["company_domain", "full_name", "title", "email", "li_profile", "source"]
-    existing_cols = [c for c in preferred_cols if c in st.session_state.leads.columns]
-    if existing_cols:
-        leads_view = st.session_state.leads[existing_cols].copy()
-        st.dataframe(leads_view, use_container_width=True)
-    else:
-        # Fallback: show whatever we have
-        st.dataframe(st.session_state.leads, use_container_width=True)
+    # Shows the most relevant lead columns (see app/utils/result_view.py LEAD_VIEW_COLUMNS)
+    result_table('leads', views['leads'])
 
     st.caption("Legend: ZoomInfo leads may include emails (if enabled). Sales Navigator leads have blank email but include a LinkedIn profile URL.")
 
     st.subheader('📋 Accounts needing Sales Navigator')
-    st.dataframe(st.session_state.needs_sn, use_container_width=True)
+    result_table('needs', views['needs'])
 
     # ====== Download buttons (robust) ======
     st.markdown('---')
     st.subheader('📥 Downloads')
-
-    # Try in-memory XLSX first (works even if the file on disk is absent)
-    xlsx_bytes = make_excel_bytes(
-        st.session_state.companies, st.session_state.leads, st.session_state.needs_sn
-    )
-    if xlsx_bytes:
-        st.download_button('📥 Download final.xlsx', data=xlsx_bytes, file_name='final.xlsx')
-    else:
-        # CSV fallbacks
-        st.info("Could not build Excel workbook in this environment. Offering CSV downloads instead.")
-        st.download_button(
-            '📥 final_companies.csv',
-            data=st.session_state.companies.to_csv(index=False).encode('utf-8'),
-            file_name='final_companies.csv',
-            mime='text/csv'
-        )
-        st.download_button(
-            '📥 final_leads.csv',
-            data=st.session_state.leads.to_csv(index=False).encode('utf-8'),
-            file_name='final_leads.csv',
-            mime='text/csv'
-        )
-        st.download_button(
-            '📥 final_needs_salesnav.csv',
-            data=st.session_state.needs_sn.to_csv(index=False).encode('utf-8'),
-            file_name='final_needs_salesnav.csv',
-            mime='text/csv'
-        )
-
-    # Sales Navigator CSV (prefer on-disk if exists; else generate on the fly)
-    sn_path = 'data/outputs/sn_accounts_upload.csv'
-    if os.path.exists(sn_path):
-        with open(sn_path, 'rb') as f:
-            st.download_button('📥 sn_accounts_upload.csv', data=f.read(), file_name='sn_accounts_upload.csv')
-    else:
-        # Build from in-memory DataFrame
-        sn_csv = st.session_state.needs_sn.copy()
-        out = pd.DataFrame({
-            'Company Name': sn_csv.get('company_name', sn_csv.get('domain', pd.Series([], dtype=str))).fillna(sn_csv.get('domain')),
-            'Company Website': sn_csv.get('company_url', 'https://') + sn_csv.get('domain', pd.Series([], dtype=str)),
-            'Company LinkedIn URL': sn_csv.get('li_company_url', pd.Series(['']*len(sn_csv))),
-            'Country': sn_csv.get('hq_country', sn_csv.get('country', pd.Series(['']*len(sn_csv)))),
-        })
-        st.download_button(
-            '📥 sn_accounts_upload.csv',
-            data=out.to_csv(index=False).encode('utf-8'),
-            file_name='sn_accounts_upload.csv',
-            mime='text/csv'
-        )
+    downloads(companies, leads, needs)
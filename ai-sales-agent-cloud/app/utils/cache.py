@@ -0,0 +1,304 @@
+# app/utils/cache.py
+import functools
+import importlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import pandas as pd
+
+from app.utils.dedupe import canonical_domain
+
+DEFAULT_PATH = "data/cache/connectors.sqlite"
+
+# Seconds a cached answer stays valid, per connector
+DEFAULT_TTLS = {
+    "similarweb": 24 * 3600,
+    "zoominfo": 7 * 24 * 3600,
+}
+
+# (module, connector name, functions, argument names holding a domain)
+CACHEABLE = [
+    ("app.connectors.similarweb", "similarweb", {"search_companies": ()}),
+    ("app.connectors.zoominfo", "zoominfo", {
+        "enrich_company": ("domain",), "find_personas": ("company_domain",), "find_personas_batch": ("company_domains",),
+    }),
+]
+
+# Whether the last cached call on a thread was answered without calling the connector
+_served = threading.local()
+
+# Batch functions (a list of domains in, one frame out) are cached per domain:
+# function -> (result column naming the domain, arguments aligned with the domain list)
+BATCHED = {"find_personas_batch": ("company_domain", ("rngs",))}
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+class EnrichmentCache:
+    """
+    Two-tier cache for connector lookups keyed on (connector, function, normalized args).
+
+    - memory: in-process LRU of pickled results (bounded by max_memory_items)
+    - disk: SQLite table, bounded by max_disk_items (least recently used rows go first)
+    Entries older than the connector's TTL count as misses. Results are stored pickled,
+    so callers always get a private copy of cached DataFrames.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        max_memory_items: int = 10_000,
+        max_disk_items: int = 500_000,
+    ):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.stats = Counter()
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+        if path:
+            parent = os.path.dirname(path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            # WAL + busy timeout: shard worker processes share the file (see app/utils/sharding.py)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, connector TEXT, created REAL, accessed REAL, value BLOB)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(connector: str, fn: str, args: Iterable) -> str:
+        return repr((connector, fn, _normalize(tuple(args))))
+
+    def get(self, connector: str, key: str):
+        """Return (hit, value)."""
+        ttl = self.ttls.get(connector)
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None and (ttl is None or now - item[0] < ttl):
+                self._memory.move_to_end(key)
+                self.stats[f"{connector}.memory_hit"] += 1
+                return True, pickle.loads(item[1])
+            if self._db is not None:
+                row = self._db.execute("SELECT created, value FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and (ttl is None or now - row[0] < ttl):
+                    self._db.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+                    self._db.commit()  # don't hold the write lock between calls
+                    self._remember(key, row[0], row[1])
+                    self.stats[f"{connector}.disk_hit"] += 1
+                    return True, pickle.loads(row[1])
+            self.stats[f"{connector}.miss"] += 1
+            return False, None
+
+    def set(self, connector: str, key: str, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, blob)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, connector, created, accessed, value) VALUES (?, ?, ?, ?, ?)",
+                    (key, connector, now, now, blob),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key: str, created: float, blob: bytes):
+        self._memory[key] = (created, blob)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def _evict_disk(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()
+        excess = count - self.max_disk_items
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)", (excess,)
+            )
+            self.stats["disk_evictions"] += excess
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def wrap(self, connector: str, fn: Callable, domain_args: Tuple[str, ...] = ()) -> Callable:
+        """Return a drop-in replacement for fn that answers from the cache when it can."""
+        if fn.__name__ in BATCHED:
+            return self.wrap_batch(connector, fn, domain_args[0], *BATCHED[fn.__name__])
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def cached(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = dict(bound.arguments)
+            values.pop("rng", None)  # a random source, not part of the question
+            for name in domain_args:
+                if isinstance(values.get(name), str):
+                    values[name] = canonical_domain(values[name])
+            key = self.make_key(connector, fn.__name__, values.items())
+            hit, value = self.get(connector, key)
+            _served.hit = hit
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            self.set(connector, key, value)
+            return value
+
+        cached.__wrapped_by_cache__ = fn
+        return cached
+
+    def wrap_batch(
+        self, connector: str, fn: Callable, domains_arg: str, domain_column: str, aligned: Tuple[str, ...] = ()
+    ) -> Callable:
+        """
+        wrap() for a batch function: every domain of the list is cached on its own, and
+        only the domains not cached are requested, in one call. `aligned` arguments are
+        lists with one entry per domain (subset along with the domains).
+        """
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def cached(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            call = dict(bound.arguments)
+            domains = list(call[domains_arg])
+            values = {k: v for k, v in call.items() if k != "rng" and k not in aligned}
+            keys = [
+                self.make_key(connector, fn.__name__, {**values, domains_arg: canonical_domain(d)}.items())
+                for d in domains
+            ]
+            parts = {}
+            for i, key in enumerate(keys):
+                hit, value = self.get(connector, key)
+                if hit:
+                    parts[i] = value
+            missing = [i for i in range(len(domains)) if i not in parts]
+            _served.hit = bool(domains) and not missing
+            if missing or not domains:
+                call[domains_arg] = [domains[i] for i in missing]
+                for name in aligned:
+                    if call.get(name) is not None:
+                        call[name] = [call[name][i] for i in missing]
+                frame = fn(**call)
+                rows = frame.groupby(frame[domain_column].astype(object), sort=False).indices if len(frame) else {}
+                for i in missing:
+                    parts[i] = frame.iloc[rows.get(domains[i], [])].reset_index(drop=True)
+                    self.set(connector, keys[i], parts[i])
+                if not domains:
+                    return frame
+            frames = [parts[i] for i in range(len(domains)) if not parts[i].empty]
+            return pd.concat(frames, ignore_index=True) if frames else parts[0]
+
+        cached.__wrapped_by_cache__ = fn
+        return cached
+
+    def connector(self, module):
+        """
+        A connector module (one of CACHEABLE, or an API client class defined in one, e.g.
+        zoominfo.ZoomInfoApi) with its cacheable functions answered from this cache, for
+        one caller (run_pipeline(cache=...)); the module itself is left alone. Other
+        modules are returned as they are.
+        """
+        name = module.__name__ if inspect.ismodule(module) else type(module).__module__
+        for module_name, connector, functions in CACHEABLE:
+            if name == module_name:
+                return _CachedConnector(module, connector, functions, self)
+        return module
+
+
+class _CachedConnector:
+    """Proxy for a connector module: its CACHEABLE functions answer from one cache, the rest pass through."""
+
+    def __init__(self, module, connector: str, functions: Dict[str, Tuple[str, ...]], cache: EnrichmentCache):
+        self._module = module
+        self._cached = {}
+        for fn_name, domain_args in functions.items():
+            fn = getattr(module, fn_name, None)
+            if fn is None:  # an API client may offer only some of the module's functions
+                continue
+            fn = getattr(fn, "__wrapped_by_cache__", fn)  # never two caches on one call
+            self._cached[fn_name] = cache.wrap(connector, fn, domain_args)
+
+    def __getattr__(self, attr):
+        cached = self._cached.get(attr)
+        return cached if cached is not None else getattr(self._module, attr)
+
+
+_installed: Dict[Tuple[str, str], Callable] = {}
+_active: Optional[EnrichmentCache] = None
+
+
+def install_cache(cache: Optional[EnrichmentCache] = None) -> EnrichmentCache:
+    """
+    Opt-in: swap the cacheable connector functions for cached wrappers in place, so
+    every caller going through the module is served from the cache. Process-wide: for
+    one run among concurrent ones pass the cache instead (run_pipeline(cache=...)).
+    """
+    global _active
+    cache = cache or EnrichmentCache()
+    uninstall_cache()
+    _active = cache
+    for module_name, connector, functions in CACHEABLE:
+        module = importlib.import_module(module_name)
+        for fn_name, domain_args in functions.items():
+            original = getattr(module, fn_name)
+            _installed[(module_name, fn_name)] = original
+            setattr(module, fn_name, cache.wrap(connector, original, domain_args))
+    return cache
+
+
+def uninstall_cache():
+    """Restore the original connector functions."""
+    global _active
+    _active = None
+    for (module_name, fn_name), original in _installed.items():
+        setattr(importlib.import_module(module_name), fn_name, original)
+    _installed.clear()
+
+
+def answered_from_cache() -> bool:
+    """Whether the last cached connector call on this thread was answered from the cache alone."""
+    return getattr(_served, "hit", False)
+
+
+def active_cache() -> Optional[EnrichmentCache]:
+    """The cache currently installed by install_cache (None if none is)."""
+    return _active
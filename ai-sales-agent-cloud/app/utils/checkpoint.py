@@ -0,0 +1,116 @@
+# app/utils/checkpoint.py
+import hashlib
+import json
+import os
+import time
+from dataclasses import fields
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.models import Company
+
+DEFAULT_ROOT = "data/checkpoints"
+
+# params that change how a run executes, not what it produces
+RUNTIME_PARAMS = {
+    "checkpoint", "checkpoint_dir", "run_id", "enrichment_concurrency", "zoominfo_rate_limit",
+    "checkpoint_every", "profile", "emit_logs", "processes", "output_dir", "persona_batch_size",
+}
+
+COMPANY_FIELDS = [f.name for f in fields(Company)]
+
+
+def inputs_hash(params: Dict, ui_decisions: Dict) -> str:
+    """Stable hash of the inputs that determine a run's results."""
+    relevant = {k: v for k, v in params.items() if k not in RUNTIME_PARAMS}
+    blob = json.dumps({"params": relevant, "ui": ui_decisions}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    Local, file-based stage checkpoints for one run:
+      <root>/<run_id>-<inputs hash>/
+        manifest.json          finished stages + timestamps
+        <stage>.pkl            stage output
+        <stage>/part-00000.pkl incremental parts of a long stage (enrichment)
+        progress.pkl           one Company record per domain, status pending/enriched
+    Writes go to a temp file first and are renamed into place, so a crash never
+    leaves a half-written checkpoint behind.
+    """
+
+    def __init__(self, params: Dict, ui_decisions: Dict, root: Optional[str] = None, run_id: Optional[str] = None):
+        self.key = inputs_hash(params, ui_decisions)
+        self.run_id = run_id or "run"
+        self.path = os.path.join(root or DEFAULT_ROOT, f"{self.run_id}-{self.key}")
+        os.makedirs(self.path, exist_ok=True)
+        self._manifest_path = os.path.join(self.path, "manifest.json")
+        self.manifest = {"inputs_hash": self.key, "stages": {}}
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    @classmethod
+    def for_run(cls, params: Dict, ui_decisions: Dict) -> Optional["CheckpointStore"]:
+        """Store for this run if params["checkpoint"] (or "checkpoint_dir") is set, else None."""
+        if not (params.get("checkpoint") or params.get("checkpoint_dir")):
+            return None
+        return cls(params, ui_decisions, root=params.get("checkpoint_dir"), run_id=params.get("run_id"))
+
+    def _write_pickle(self, path: str, value):
+        tmp = f"{path}.tmp"
+        pd.to_pickle(value, tmp)
+        os.replace(tmp, path)
+
+    def _save_manifest(self):
+        tmp = f"{self._manifest_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self._manifest_path)
+
+    def done(self, stage: str) -> bool:
+        return stage in self.manifest["stages"]
+
+    def load(self, stage: str):
+        return pd.read_pickle(os.path.join(self.path, f"{stage}.pkl"))
+
+    def save(self, stage: str, value):
+        self._write_pickle(os.path.join(self.path, f"{stage}.pkl"), value)
+        self.manifest["stages"][stage] = time.time()
+        self._save_manifest()
+
+    def load_parts(self, stage: str) -> List:
+        folder = os.path.join(self.path, stage)
+        if not os.path.isdir(folder):
+            return []
+        names = sorted(n for n in os.listdir(folder) if n.startswith("part-") and n.endswith(".pkl"))
+        return [pd.read_pickle(os.path.join(folder, n)) for n in names]
+
+    def save_part(self, stage: str, value):
+        folder = os.path.join(self.path, stage)
+        os.makedirs(folder, exist_ok=True)
+        n = sum(1 for name in os.listdir(folder) if name.endswith(".pkl"))
+        self._write_pickle(os.path.join(folder, f"part-{n:05d}.pkl"), value)
+
+    def progress(self, companies: pd.DataFrame) -> pd.DataFrame:
+        """Company records (models.Company fields) for every domain, with status."""
+        path = os.path.join(self.path, "progress.pkl")
+        if os.path.exists(path):
+            return pd.read_pickle(path)
+        progress = companies.reindex(columns=COMPANY_FIELDS).astype(object)
+        progress["status"] = "pending"
+        return progress
+
+    def save_progress(self, progress: pd.DataFrame):
+        self._write_pickle(os.path.join(self.path, "progress.pkl"), progress)
+
+
+def stage(store: Optional[CheckpointStore], name: str, compute):
+    """Return the checkpointed output of a finished stage, or compute and checkpoint it."""
+    if store is not None and store.done(name):
+        return store.load(name)
+    value = compute()
+    if store is not None:
+        store.save(name, value)
+    return value
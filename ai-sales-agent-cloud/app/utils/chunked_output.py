@@ -0,0 +1,52 @@
+# app/utils/chunked_output.py
+import os
+from typing import Dict
+import pandas as pd
+
+
+class ChunkedWriter:
+    """
+    Appends DataFrame chunks to per-table outputs as they are produced.
+      fmt="csv":     one <name>.csv per table, header written with the first chunk
+      fmt="parquet": <name>/part-00000.parquet, part-00001.parquet, ... (needs pyarrow)
+    Existing outputs of the same names are replaced when the writer starts.
+    """
+
+    def __init__(self, output_dir: str, fmt: str = "csv"):
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                print("[WARN] pyarrow not installed; streaming outputs fall back to CSV.")
+                fmt = "csv"
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.paths: Dict[str, str] = {}
+        self.rows: Dict[str, int] = {}
+        self._parts: Dict[str, int] = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _start(self, name: str) -> str:
+        if self.fmt == "csv":
+            path = os.path.join(self.output_dir, f"{name}.csv")
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            path = os.path.join(self.output_dir, name)
+            os.makedirs(path, exist_ok=True)
+            for f in os.listdir(path):
+                if f.startswith("part-") and f.endswith(".parquet"):
+                    os.remove(os.path.join(path, f))
+        self.paths[name] = path
+        self.rows[name] = 0
+        self._parts[name] = 0
+        return path
+
+    def append(self, name: str, df: pd.DataFrame):
+        path = self.paths.get(name) or self._start(name)
+        if self.fmt == "csv":
+            df.to_csv(path, mode="a", header=self._parts[name] == 0, index=False)
+        else:
+            df.to_parquet(os.path.join(path, f"part-{self._parts[name]:05d}.parquet"), index=False)
+        self._parts[name] += 1
+        self.rows[name] += len(df)
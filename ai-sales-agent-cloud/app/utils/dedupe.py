@@ -1,48 +1,276 @@
 # app/utils/dedupe.py
+from collections import defaultdict
 from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+import math
+import os
+import re
 import pandas as pd
 
+# q-gram lengths kept in the blocking index (see FuzzyDeduper)
+_QGRAM_SIZES = (2, 3, 4)
+
+# Snapshot of the Public Suffix List (https://publicsuffix.org), ICANN and PRIVATE sections:
+# hosting suffixes like myshopify.com or github.io count, so shop-a.myshopify.com and
+# shop-b.myshopify.com are two registrable domains (and brands), not one
+PUBLIC_SUFFIX_LIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public_suffix_list.dat')
+
+def load_public_suffixes(path: str = PUBLIC_SUFFIX_LIST) -> Tuple[Set[str], Set[str], Set[str]]:
+    """(suffix rules, wildcard rules without their '*.', exception rules without their '!') of a PSL file."""
+    rules, wildcards, exceptions = set(), set(), set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            rule = line.strip().lower()
+            if not rule or rule.startswith('//'):
+                continue
+            target = rules
+            if rule.startswith('!'):
+                target, rule = exceptions, rule[1:]
+            elif rule.startswith('*.'):
+                target, rule = wildcards, rule[2:]
+            target.add(rule)
+            if not rule.isascii():  # hosts arrive in punycode
+                try:
+                    target.add(rule.encode('idna').decode('ascii'))
+                except UnicodeError:
+                    pass
+    return rules, wildcards, exceptions
+
+PUBLIC_SUFFIXES, _WILDCARD_SUFFIXES, _EXCEPTION_SUFFIXES = load_public_suffixes()
+
 def canonical_domain(domain: str) -> str:
     domain = (domain or '').lower().strip()
     if domain.startswith('http'):
         domain = domain.split('://', 1)[1]
     return domain.strip('/')
 
+# Host of a domain or URL (lower-cased input): optional scheme and slashes, optional
+# 'www.'/'www2.', then everything up to a path, port, query or fragment
+_HOST = re.compile(r'^\s*(?:[a-z][a-z0-9+.\-]*://)?/*(?:www\d*\.)?([^/:?#\s]*)')
+
+def canonical_host(domain: str) -> str:
+    """Host of a domain/URL: no scheme, path, port, query or leading 'www.' (domain_keys()['host'])."""
+    return _HOST.match((domain or '').lower()).group(1).rstrip('.')
+
+def host_keys(domain: str) -> Tuple[str, str, str]:
+    """(host, registrable domain, brand) of one domain/URL, see domain_keys."""
+    host = canonical_host(domain)
+    # candidate suffixes from the longest down; the first PSL hit is the longest match
+    prev, start = -1, 0
+    while True:
+        dot = host.find('.', start)
+        candidate = host[start:]
+        if candidate in _EXCEPTION_SUFFIXES:  # '!rule': the suffix is one label shorter
+            return host, candidate, host[start:dot]
+        if dot < 0 or candidate in PUBLIC_SUFFIXES or host[dot + 1:] in _WILDCARD_SUFFIXES:
+            break  # dot < 0: no rule matched, the last label is the suffix ('*')
+        prev, start = start, dot + 1
+    if prev < 0:  # the host is a public suffix itself (or a single label)
+        return host, host, host[:dot] if dot >= 0 else host
+    return host, host[prev:], host[prev:start - 1]
+
 def simple_company_name_from_domain(domain: str) -> str:
     base = canonical_domain(domain).split('.')[0]
     return base.capitalize()
 
+def domain_keys(domains: pd.Series) -> pd.DataFrame:
+    """
+    Match keys for a column of domains/URLs (same index as the input):
+      host:        the domain without scheme, path, port and leading 'www.'
+      registrable: host minus subdomains: one label more than its public suffix
+                   (PUBLIC_SUFFIXES, incl. co.uk and hosting suffixes like github.io)
+      brand:       registrable minus its suffix, e.g. 'acmeapp' for acmeapp.com / acmeapp.io
+    One compiled-regex pass per distinct value (pandas str ops on object columns loop
+    per element too, once per op; see benchmarks/bench_normalize.py).
+    """
+    uniq = pd.unique(domains.dropna().astype(str))
+    host, registrable, brand = [], [], []
+    for value in uniq:
+        # unpacked right away: a million live tuples would keep triggering GC passes
+        h, r, b = host_keys(value)
+        host.append(h)
+        registrable.append(r)
+        brand.append(b)
+    keys = pd.DataFrame({'host': host, 'registrable': registrable, 'brand': brand}, index=uniq, dtype=object)
+    return keys.reindex(domains.values).set_axis(domains.index)
+
 def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Canonical hosts in 'domain'; company_name from the brand where all names are missing."""
     df = df.copy()
-    df['domain'] = df['domain'].apply(canonical_domain)
+    keys = domain_keys(df['domain'])
+    df['domain'] = keys['host'].fillna('')
     if 'company_name' not in df.columns or df['company_name'].isna().all():
-        df['company_name'] = df['domain'].apply(simple_company_name_from_domain)
+        df['company_name'] = keys['brand'].fillna('').str.capitalize()
     return df
 
+def variant_keys(df: pd.DataFrame) -> List:
+    """Brand of each row's domain (None if missing): rows of one country sharing it are variants of one company."""
+    brand = domain_keys(df['domain'])['brand']
+    return brand.astype(object).where(brand.notna() & (brand != ''), None).tolist()
+
 def _sim(a: str, b: str) -> float:
     # SequenceMatcher returns [0..1]
     return SequenceMatcher(None, (a or ''), (b or '')).ratio()
 
+
+class _Partition:
+    """Kept company names of one country, indexed for candidate lookup."""
+
+    __slots__ = ('names', 'by_length', 'grams')
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        self.by_length: Dict[int, List[str]] = defaultdict(list)
+        self.grams: Dict[int, Dict[str, List[str]]] = {q: defaultdict(list) for q in _QGRAM_SIZES}
+
+    def add(self, name: str):
+        if name in self.names:
+            return
+        self.names.add(name)
+        self.by_length[len(name)].append(name)
+        for q, index in self.grams.items():
+            for g in {name[k:k + q] for k in range(len(name) - q + 1)}:
+                index[g].append(name)
+
+
+class FuzzyDeduper:
+    """
+    Incremental, first-seen-wins near-duplicate filter on company_name per country.
+
+    A row is kept when its domain is new and no previously *kept* row of the same
+    country has a difflib ratio >= threshold — exactly what the old pairwise loop did,
+    but candidates come from a blocking index instead of every earlier row:
+
+      - ratio = 2*M / (len(a)+len(b)) bounds the partner length, and therefore the
+        number D of insert/delete edits that can separate two matching names;
+      - pick D+1 disjoint q-gram windows of the new name (the ones with the shortest
+        posting lists): at least one survives intact in any match, so only kept names
+        sharing a window are candidates;
+      - candidates then go through the cheap quick_ratio bounds before the exact ratio.
+
+    The filter is lossless (same output as the O(n²) loop) and keeps its state between
+    calls, so chunks of one territory can be fed in one after another.
+
+    Before any name comparison, domain variants are grouped by exact key: a row whose
+    brand (domain_keys, e.g. acmeapp for acmeapp.com / www.acmeapp.io) was already seen
+    in its country is dropped, whatever its name. Only the first row of each
+    (country, brand) reaches the fuzzy stage.
+    """
+
+    def __init__(self, threshold: float = 0.92):
+        self.threshold = threshold
+        self.seen_domains: Set[str] = set()
+        self.seen_brands: Set[tuple] = set()
+        self.variants_dropped = 0
+        self._partitions: Dict[object, _Partition] = {}
+
+    def _partition(self, country) -> _Partition:
+        # NaN != NaN in the old loop, so rows without a (float) country never matched
+        if isinstance(country, float) and math.isnan(country):
+            return _Partition()
+        part = self._partitions.get(country)
+        if part is None:
+            part = self._partitions[country] = _Partition()
+        return part
+
+    def _length_window(self, n: int):
+        t = self.threshold
+        lo = math.ceil(n * t / (2 - t) - 1e-9)
+        hi = math.floor(n * (2 - t) / t + 1e-9)
+        return max(lo, 0), hi
+
+    @staticmethod
+    def _cheapest_windows(index: Dict[str, List[str]], name: str, q: int, count: int):
+        """Pick `count` disjoint q-gram windows of name with the shortest posting lists."""
+        n = len(name)
+        cost = [len(index.get(name[p:p + q], ())) for p in range(n - q + 1)]
+        if count == 1:
+            p = cost.index(min(cost))
+            return [name[p:p + q]]
+        inf = float('inf')
+        # best[k][p]: cheapest k windows using positions >= p
+        best = [[0] * (n + 2)] + [[inf] * (n + 2) for _ in range(count)]
+        for k in range(1, count + 1):
+            prev, cur = best[k - 1], best[k]
+            for p in range(n - q, -1, -1):
+                take = cost[p] + prev[p + q]
+                cur[p] = take if take < cur[p + 1] else cur[p + 1]
+        picked, p = [], 0
+        for k in range(count, 0, -1):
+            while best[k][p] != cost[p] + best[k - 1][p + q]:
+                p += 1
+            picked.append(name[p:p + q])
+            p += q
+        return picked
+
+    def _candidates(self, part: _Partition, name: str):
+        n = len(name)
+        lo, hi = self._length_window(n)
+        max_edits = math.floor((1 - self.threshold) * (n + hi) + 1e-9)
+        q = max((s for s in _QGRAM_SIZES if (max_edits + 1) * s <= n), default=0)
+        if not q:
+            # too short to block on: scan the kept names in the length window
+            for length in range(lo, hi + 1):
+                yield from part.by_length.get(length, ())
+            return
+        index = part.grams[q]
+        windows = self._cheapest_windows(index, name, q, max_edits + 1)
+        seen: Set[str] = set()
+        for gram in windows:
+            for other in index.get(gram, ()):
+                if other not in seen and lo <= len(other) <= hi:
+                    seen.add(other)
+                    yield other
+
+    def _is_duplicate(self, part: _Partition, name: str) -> bool:
+        t = self.threshold
+        if t > 1:
+            return False
+        if t <= 0:
+            return bool(part.names)
+        if name in part.names:
+            return True
+        matcher = SequenceMatcher(None, '', name)
+        for other in self._candidates(part, name):
+            # kept row first, as in _sim(name_i, name_j)
+            matcher.set_seq1(other)
+            if (matcher.real_quick_ratio() >= t and matcher.quick_ratio() >= t
+                    and matcher.ratio() >= t):
+                return True
+        return False
+
+    def add(self, domain: str, country, company_name, brand: Optional[str] = None) -> bool:
+        """Offer one row (brand: its variant key, see variant_keys); returns True if it is kept."""
+        if domain in self.seen_domains:
+            return False
+        self.seen_domains.add(domain)
+        if brand is not None:
+            if (country, brand) in self.seen_brands:
+                self.variants_dropped += 1
+                return False
+            self.seen_brands.add((country, brand))
+        name = company_name if isinstance(company_name, str) else ''
+        part = self._partition(country)
+        if self._is_duplicate(part, name):
+            return False
+        part.add(name)
+        return True
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return the rows of df that survive, in their original order."""
+        if df.empty:
+            return df.reset_index(drop=True)
+        names = df['company_name'] if 'company_name' in df.columns else pd.Series('', index=df.index)
+        mask = [
+            self.add(d, c, n, b)
+            for d, c, n, b in zip(df['domain'].tolist(), df['country'].tolist(), names.tolist(), variant_keys(df))
+        ]
+        return df[mask].reset_index(drop=True)
+
+
 def fuzzy_dedupe(df: pd.DataFrame, threshold: float = 0.92) -> pd.DataFrame:
     """
     Drops near-duplicates by company_name within the same country.
-    Uses difflib ratio (stdlib) instead of rapidfuzz.
+    Uses difflib ratio (stdlib) instead of rapidfuzz, on blocked candidates only.
     """
-    df = df.drop_duplicates(subset=['domain']).reset_index(drop=True)
-    keep_idx = []
-    seen = set()
-    for i, row in df.iterrows():
-        if i in seen:
-            continue
-        keep_idx.append(i)
-        name_i = row.get('company_name', '') or ''
-        for j in range(i + 1, len(df)):
-            if j in seen:
-                continue
-            # only compare inside the same country
-            if row.get('country') != df.at[j, 'country']:
-                continue
-            name_j = df.at[j, 'company_name'] or ''
-            if _sim(name_i, name_j) >= threshold:
-                seen.add(j)
-    return df.loc[keep_idx].reset_index(drop=True)
+    return FuzzyDeduper(threshold).filter(df)
@@ -0,0 +1,173 @@
+# app/utils/enrichment.py
+import random
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+from app.connectors import zoominfo as zi
+from app.models import Company
+from app.schema import as_companies, concat_leads, iter_records, records_frame
+from app.utils.ratelimit import RateLimiter, shared_limiter
+
+DEFAULT_CONCURRENCY = 8
+
+# Domains per find_personas_batch call (override: params["persona_batch_size"])
+PERSONA_BATCH_SIZE = 500
+
+MINI_MODE_SEED = 42
+
+
+def run_seed(params: Dict) -> Optional[int]:
+    """params["seed"], else the Mini Mode seed; None means an unseeded run."""
+    if params.get("seed") is not None:
+        return params["seed"]
+    return MINI_MODE_SEED if params.get("mini_mode") else None
+
+
+class DomainRandom:
+    """
+    Random sources of a seeded run: one Random per connector and domain, derived from
+    (seed, domain) alone, so a domain's draws don't depend on the thread, process or
+    batch that handles it.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def zoominfo(self, domain: str) -> random.Random:
+        """enrich_company, then find_personas_batch for the domain."""
+        return random.Random(f"{self.seed}|{domain}")
+
+    def sales_navigator(self, domain: str) -> random.Random:
+        return random.Random(f"{self.seed}|sn|{domain}")
+
+
+class MiniModeStream(DomainRandom):
+    """
+    Mini Mode's random stream as the serial pipeline always drew it: one Random(seed)
+    used by the mock search, then by enrich_company + find_personas per company in row
+    order, then by Sales Navigator over all companies. The stream is replayed up front
+    against the mock connectors (draws only; Mini Mode has a handful of companies) and
+    every domain gets a Random positioned where the serial run reaches it, so resumed,
+    checkpointed and sharded Mini Mode runs draw the same values.
+    Domains outside `domains` fall back to DomainRandom.
+    """
+
+    def __init__(self, params: Dict, domains: List[str]):
+        super().__init__(run_seed(params))
+        from app.connectors import sales_navigator as sn
+        from app.connectors import similarweb as sw
+
+        rng = random.Random(self.seed)
+        if not (params.get("synthetic_rows") or params.get("similarweb_api_url")):
+            sw._local_search(params["verticals"], params["countries"], params["min_monthly_visits"], rng=rng)
+        regex = params.get("titles_regex", "")
+        self._zoominfo, self._sales_navigator = {}, {}
+        for domain in domains:
+            self._zoominfo[domain] = rng.getstate()
+            if zi.enrich_company(domain, rng=rng):
+                zi.find_personas_batch([domain], regex, enable_email_enrichment=False, rngs=[rng])
+        if params.get("use_sales_navigator_mock"):
+            for domain in domains:
+                self._sales_navigator[domain] = rng.getstate()
+                sn.find_personas_from_account_list([domain], regex, rngs=[rng])
+
+    @staticmethod
+    def _positioned(state) -> random.Random:
+        rng = random.Random()
+        rng.setstate(state)
+        return rng
+
+    def zoominfo(self, domain: str) -> random.Random:
+        state = self._zoominfo.get(domain)
+        return super().zoominfo(domain) if state is None else self._positioned(state)
+
+    def sales_navigator(self, domain: str) -> random.Random:
+        state = self._sales_navigator.get(domain)
+        return super().sales_navigator(domain) if state is None else self._positioned(state)
+
+
+def random_sources(params: Dict, domains: Optional[List[str]] = None) -> Optional[DomainRandom]:
+    """
+    Random sources of a run: None if unseeded; for a Mini Mode run over `domains` (in
+    row order) its MiniModeStream; else DomainRandom(seed).
+    """
+    seed = run_seed(params)
+    if seed is None:
+        return None
+    if params.get("mini_mode") and domains is not None:
+        return MiniModeStream(params, list(domains))
+    return DomainRandom(seed)
+
+
+def _lookup(row: Company, connector, limiter: RateLimiter, rng: Optional[random.Random]) -> Company:
+    """ZoomInfo company lookup for one deduped row."""
+    limiter.acquire()
+    z = connector.enrich_company(row.domain, **({"rng": rng} if rng is not None else {}))
+    return replace(row, zoominfo_company_id=z.get("id") if z else None, li_company_url=z.get("linkedin_url") if z else None)
+
+
+def enrich_companies(
+    deduped: pd.DataFrame,
+    params: Dict,
+    connector=zi,
+    max_workers: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+    randoms: Optional[DomainRandom] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    enrich_company per domain on a bounded thread pool, then the personas of every
+    matched company with one find_personas_batch call per params["persona_batch_size"]
+    domains (one columnar frame per chunk, not one small frame per company).
+
+    - max_workers: concurrent calls in flight (params["enrichment_concurrency"]);
+      seeded runs (params["seed"], Mini Mode) give every domain its own rng
+      (randoms, default random_sources(params)), so they stay reproducible at any
+      concurrency.
+    - rate_limit: connector calls per second shared by all workers
+      (params["zoominfo_rate_limit"]), None = unlimited; a persona batch is one call.
+      The bucket is process-wide (ratelimit.shared_limiter), so concurrent runs share
+      the quota too, at the lowest rate any of them asked for.
+    Rows travel as slotted Company records; columns of `deduped` that are not Company
+    fields are carried over positionally. Results keep the order of `deduped`.
+    Returns:
+      companies (DataFrame), leads_df (DataFrame)
+    """
+    if max_workers is None:
+        max_workers = params.get("enrichment_concurrency", DEFAULT_CONCURRENCY)
+    if rate_limit is None:
+        rate_limit = params.get("zoominfo_rate_limit")
+    limiter = shared_limiter("zoominfo", rate_limit)
+    batch_size = max(1, int(params.get("persona_batch_size") or PERSONA_BATCH_SIZE))
+
+    rows: List[Company] = list(iter_records(deduped, Company))
+    if randoms is None:
+        randoms = random_sources(params)
+    rngs = [randoms.zoominfo(r.domain) if randoms is not None else None for r in rows]
+
+    def personas(positions: List[int]) -> pd.DataFrame:
+        limiter.acquire()
+        return connector.find_personas_batch(
+            [rows[i].domain for i in positions],
+            params.get("titles_regex", ""),
+            enable_email_enrichment=params.get("enable_zoominfo_email_enrichment", True),
+            **({"rngs": [rngs[i] for i in positions]} if randoms is not None else {}),
+        )
+
+    serial = max_workers <= 1 or len(rows) <= 1
+    with nullcontext() if serial else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich") as pool:
+        run = map if serial else pool.map
+        enriched = list(run(lambda i: _lookup(rows[i], connector, limiter, rngs[i]), range(len(rows))))
+        matched = [i for i, c in enumerate(enriched) if c.zoominfo_company_id]
+        chunks = [matched[i:i + batch_size] for i in range(0, len(matched), batch_size)]
+        leads_frames = list(run(personas, chunks))
+
+    columns = [*deduped.columns, *(c for c in ("zoominfo_company_id", "li_company_url") if c not in deduped.columns)]
+    companies = records_frame(enriched, Company)
+    for col in deduped.columns.difference(companies.columns):
+        companies[col] = deduped[col].to_numpy()
+    companies = as_companies(companies[columns])
+    leads_df = concat_leads(leads_frames)
+    return companies, leads_df
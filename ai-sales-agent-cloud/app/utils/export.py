@@ -0,0 +1,204 @@
+# app/utils/export.py
+import gzip
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from app.utils.sales_navigator_csv import accounts_csv_bytes
+
+SHEETS = (("Companies", "companies"), ("Leads", "leads"), ("Needs_SalesNav", "needs_salesnav"))
+
+# Sheets with more rows than this are written in xlsxwriter's constant_memory mode
+CONSTANT_MEMORY_ROWS = 10_000
+
+# Excel's sheet size (header row included)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Names of the files the last ExportBundle.write put into a directory (other files are never touched)
+MANIFEST = ".export_manifest.json"
+_write_lock = threading.Lock()
+
+# Finished bundles kept in-process, newest last
+MAX_CACHED_RUNS = 8
+
+MIME = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/octet-stream",
+    "csv.gz": "application/gzip",
+    "csv": "text/csv",
+}
+
+
+class ExportBundle:
+    """All download artifacts of one run: file name -> bytes (built once)."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.artifacts: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def add(self, file_name: str, data: bytes):
+        self.artifacts[file_name] = data
+
+    def get(self, file_name: str) -> Optional[bytes]:
+        return self.artifacts.get(file_name)
+
+    @staticmethod
+    def mime(file_name: str) -> str:
+        for ext, mime in MIME.items():
+            if file_name.endswith(ext):
+                return mime
+        return "application/octet-stream"
+
+    def write(self, output_dir: str) -> Dict[str, str]:
+        """
+        Write every artifact to output_dir; returns file name -> path. Files that the
+        previous bundle written there produced and this one does not (e.g. final.xlsx
+        after a CSV fallback) are removed; the directory's MANIFEST lists them. Files of
+        anything else (streaming outputs, run reports, other tools) are left alone.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = os.path.join(output_dir, MANIFEST)
+        with _write_lock:
+            try:
+                with open(manifest, "r", encoding="utf-8") as f:
+                    previous = json.load(f).get("files", [])
+            except (OSError, ValueError):
+                previous = []
+            for name in previous:
+                path = os.path.join(output_dir, os.path.basename(name))
+                if name not in self.artifacts and os.path.isfile(path):
+                    os.remove(path)
+            paths = {}
+            for name, data in self.artifacts.items():
+                path = os.path.join(output_dir, name)
+                with open(path, "wb") as f:
+                    f.write(data)
+                paths[name] = path
+            with open(f"{manifest}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"run_id": self.run_id, "files": list(self.artifacts)}, f)
+            os.replace(f"{manifest}.tmp", manifest)
+        return paths
+
+
+def _cells(df: pd.DataFrame) -> Iterable[Tuple]:
+    """Rows as tuples with NaN/None as None (xlsxwriter skips them, like pandas na_rep='')."""
+    # float32 columns (e.g. confidence) would otherwise show as 0.800000011920929
+    narrow = {c: df[c].astype("float64").round(6) for c in df.columns[df.dtypes == "float32"]}
+    if narrow:
+        df = df.assign(**narrow)
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def xlsx_bytes(frames: Dict[str, pd.DataFrame], constant_memory: Optional[bool] = None) -> bytes:
+    """
+    Workbook with one sheet per frame, written row by row with xlsxwriter directly
+    (no pandas Styler/ExcelFormatter pass). Large workbooks switch to constant_memory,
+    which flushes each row as it is written; URLs then stay plain strings, since
+    Excel caps hyperlinks at 65,530 per sheet anyway.
+    Raises ValueError if a sheet exceeds EXCEL_MAX_ROWS (xlsxwriter would drop the
+    rest silently), so callers fall back to CSV.
+    """
+    import xlsxwriter
+
+    for sheet_name, df in frames.items():
+        if len(df) + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(f"Sheet {sheet_name} has {len(df):,} rows; Excel allows {EXCEL_MAX_ROWS - 1:,} plus header")
+
+    rows = max((len(df) for df in frames.values()), default=0)
+    if constant_memory is None:
+        constant_memory = rows > CONSTANT_MEMORY_ROWS
+    bio = io.BytesIO()
+    wb = xlsxwriter.Workbook(bio, {
+        "in_memory": not constant_memory,
+        "constant_memory": constant_memory,
+        "strings_to_urls": not constant_memory,
+        "nan_inf_to_errors": True,
+    })
+    header = wb.add_format({"bold": True, "border": 1})
+    for sheet_name, df in frames.items():
+        ws = wb.add_worksheet(sheet_name)
+        ws.write_row(0, 0, [str(c) for c in df.columns], header)
+        for r, values in enumerate(_cells(df), start=1):
+            ws.write_row(r, 0, values)
+    wb.close()
+    return bio.getvalue()
+
+
+def _parquet_bytes(df: pd.DataFrame) -> bytes:
+    bio = io.BytesIO()
+    df.to_parquet(bio, index=False)
+    return bio.getvalue()
+
+
+def _csv_bytes(df: pd.DataFrame, compress: bool = False) -> bytes:
+    data = df.to_csv(index=False).encode("utf-8")
+    return gzip.compress(data, compresslevel=5) if compress else data
+
+
+def build_exports(
+    run_id: str,
+    companies: pd.DataFrame,
+    leads: pd.DataFrame,
+    needs_sn: pd.DataFrame,
+    formats: Iterable[str] = ("xlsx",),
+    constant_memory: Optional[bool] = None,
+) -> ExportBundle:
+    """
+    Build every requested artifact once and cache the bundle under run_id.
+      xlsx    → final.xlsx (falls back to final_<table>.csv if xlsxwriter fails)
+      parquet → final_<table>.parquet (needs pyarrow)
+      csv.gz  → final_<table>.csv.gz
+    sn_accounts_upload.csv is always included (split into _part2, ... past the upload row limit).
+    """
+    bundle = ExportBundle(run_id)
+    tables = {key: df for (_, key), df in zip(SHEETS, (companies, leads, needs_sn))}
+    for fmt in formats:
+        if fmt == "xlsx":
+            try:
+                frames = {sheet: tables[key] for sheet, key in SHEETS}
+                bundle.add("final.xlsx", xlsx_bytes(frames, constant_memory=constant_memory))
+            except Exception as e:
+                # Fallback: separate CSVs so the app still provides downloads
+                print(f"[WARN] Failed to write XLSX with XlsxWriter: {e}. Wrote CSV fallbacks instead.")
+                for key, df in tables.items():
+                    bundle.add(f"final_{key}.csv", _csv_bytes(df))
+        elif fmt == "parquet":
+            try:
+                for key, df in tables.items():
+                    bundle.add(f"final_{key}.parquet", _parquet_bytes(df))
+            except ImportError as e:
+                print(f"[WARN] Parquet export unavailable: {e}")
+        elif fmt == "csv.gz":
+            for key, df in tables.items():
+                bundle.add(f"final_{key}.csv.gz", _csv_bytes(df, compress=True))
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+    for file_name, data in accounts_csv_bytes(needs_sn).items():
+        bundle.add(file_name, data)
+    _remember(bundle)
+    return bundle
+
+
+_bundles: "OrderedDict[str, ExportBundle]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _remember(bundle: ExportBundle):
+    with _lock:
+        _bundles[bundle.run_id] = bundle
+        _bundles.move_to_end(bundle.run_id)
+        while len(_bundles) > MAX_CACHED_RUNS:
+            _bundles.popitem(last=False)
+
+
+def get_exports(run_id: Optional[str]) -> Optional[ExportBundle]:
+    """Cached bundle of a run (None if unknown or evicted)."""
+    if not run_id:
+        return None
+    with _lock:
+        return _bundles.get(run_id)
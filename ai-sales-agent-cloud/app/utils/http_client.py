@@ -0,0 +1,387 @@
+# app/utils/http_client.py
+"""
+Shared HTTP transport for the vendor connectors (stdlib only):
+  - keep-alive connection pool per host, bounded by the host's max_connections
+  - per-host token bucket (RateLimiter) following the vendor quota (VENDOR_QUOTAS)
+  - retries with full-jitter exponential backoff on 429 / 5xx / connection errors,
+    never sooner than a Retry-After header asks; only for idempotent requests (GET,
+    PUT, DELETE, ... or a POST with an idempotency key), else just 429s
+  - coalescing: identical GETs in flight share one request
+  - stale keep-alive connections (closed by the server while idle) are dropped before
+    reuse, and a request whose send fails on a reused connection goes out once more on
+    a fresh one (nothing reached the server, so this holds for POSTs too)
+  - BulkBatcher: single lookups from many threads grouped into bulk calls
+One client (shared_client()) serves every connector, so quotas and pooled
+connections are per process, not per call site.
+"""
+import http.client
+import json
+import random
+import select
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from app.utils.ratelimit import RateLimiter
+
+
+@dataclass(frozen=True)
+class HostQuota:
+    rate: Optional[float] = None  # requests per second (None = unlimited)
+    burst: Optional[int] = None  # token bucket size (default: one second of rate)
+    max_connections: int = 10
+    bulk_size: int = 1  # records per request on the vendor's bulk endpoints
+
+
+# Per-host quotas from the vendor contracts; a leading "." matches any subdomain.
+# Override with HttpClient(quotas={...}).
+VENDOR_QUOTAS: Dict[str, HostQuota] = {
+    "api.similarweb.com": HostQuota(rate=10, burst=10, max_connections=4),
+    "api.zoominfo.com": HostQuota(rate=25, burst=25, max_connections=8, bulk_size=25),
+    ".my.salesforce.com": HostQuota(rate=20, burst=20, max_connections=10, bulk_size=200),
+}
+DEFAULT_QUOTA = HostQuota()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Safe to send twice (RFC 9110). Other methods are only retried with an idempotency key
+# or after a 429, where the server turned the request away without acting on it.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: Optional[int], message: str, body: bytes = b""):
+        super().__init__(f"HTTP {status}: {message}" if status else message)
+        self.status = status
+        self.body = body
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    attempts: int = 1
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+def _dropped(conn: http.client.HTTPConnection) -> bool:
+    """Whether an idle keep-alive connection was closed by the server (an idle socket with anything to read is at EOF)."""
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class _HostPool:
+    """Idle keep-alive connections to one (scheme, host, port), at most max_connections in use."""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], quota: HostQuota, timeout: float):
+        self.scheme, self.host, self.port = scheme, host, port
+        self.timeout = timeout
+        self.limiter = RateLimiter(quota.rate, quota.burst)
+        self._slots = threading.BoundedSemaphore(quota.max_connections)
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self, count: Callable[[str], None]) -> Tuple[http.client.HTTPConnection, bool]:
+        """(connection, reused): an idle one the server has not closed, else a new one."""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                count("connections_opened")
+                return self._connect(), False
+            if not _dropped(conn):
+                count("connections_reused")
+                return conn, True
+            conn.close()
+            count("connections_dropped")
+
+    def send(self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str], count: Callable[[str], None]):
+        """One round trip on a pooled connection; returns (status, headers, body). count(stat) records connections."""
+        self._slots.acquire()
+        conn, reusable = None, False
+        try:
+            conn, reused = self._checkout(count)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+            except (OSError, http.client.HTTPException):
+                if not reused:
+                    raise
+                # the server closed the reused connection before the request got out: once more, fresh
+                conn.close()
+                count("stale_reconnects")
+                conn = self._connect()
+                count("connections_opened")
+                conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            reusable = not resp.will_close
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+        finally:
+            if conn is not None:
+                if reusable:
+                    with self._lock:
+                        self._idle.append(conn)
+                else:
+                    conn.close()
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+class HttpClient:
+    """
+    Pooled, rate-limited JSON/HTTP client. Thread-safe: connectors call it from the
+    enrichment thread pool. stats counts requests, retries, coalesced calls and
+    connections (updated under a lock); latencies holds the last seconds per call
+    (retries included).
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, HostQuota]] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.1,
+        backoff_cap: float = 5.0,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.quotas = {**VENDOR_QUOTAS, **(quotas or {})}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.headers = {"Accept": "application/json", "User-Agent": "ai-sales-agent", **(headers or {})}
+        self.stats = Counter()
+        self.latencies: deque = deque(maxlen=100_000)
+        self._pools: Dict[Tuple[str, str, Optional[int]], _HostPool] = {}
+        self._inflight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    def quota_for(self, host: str) -> HostQuota:
+        if host in self.quotas:
+            return self.quotas[host]
+        for pattern, quota in self.quotas.items():
+            if pattern.startswith(".") and host.endswith(pattern):
+                return quota
+        return DEFAULT_QUOTA
+
+    def _pool(self, scheme: str, host: str, port: Optional[int]) -> _HostPool:
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(scheme, host, port, self.quota_for(host), self.timeout)
+            return pool
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        coalesce: Optional[bool] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Response:
+        """
+        Send a request (with retries); raises HttpError for non-retryable errors and once
+        retries are exhausted. Only idempotent requests are retried on 5xx and connection
+        errors: IDEMPOTENT_METHODS, or any method given an idempotency_key (sent as the
+        Idempotency-Key header, the same on every attempt, so the vendor applies the
+        request once). coalesce (default: GET only) lets identical concurrent requests
+        share one round trip.
+        """
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params, doseq=True)}"
+        body = None if json_body is None else json.dumps(json_body).encode("utf-8")
+        if idempotency_key is not None:
+            headers = {**(headers or {}), "Idempotency-Key": idempotency_key}
+        if coalesce is None:
+            coalesce = method == "GET"
+        if not coalesce:
+            return self._timed(method, url, body, headers)
+
+        key = (method, url, body)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            self._count("coalesced")
+            return future.result()
+        try:
+            future.set_result(self._timed(method, url, body, headers))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return future.result()
+
+    def get_json(self, url: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        return self.request("GET", url, params=params, **kwargs).json()
+
+    def post_json(self, url: str, payload: Any, **kwargs) -> Any:
+        return self.request("POST", url, json_body=payload, **kwargs).json()
+
+    def _timed(self, method: str, url: str, body: Optional[bytes], headers: Optional[Dict[str, str]]) -> Response:
+        t0 = time.perf_counter()
+        try:
+            return self._send(method, url, body, headers)
+        finally:
+            self.latencies.append(time.perf_counter() - t0)
+
+    def _send(self, method: str, url: str, body: Optional[bytes], headers: Optional[Dict[str, str]]) -> Response:
+        parts = urlsplit(url)
+        pool = self._pool(parts.scheme or "http", parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        merged = {**self.headers, **(headers or {})}
+        if body is not None:
+            merged.setdefault("Content-Type", "application/json")
+        # a POST that timed out or got a 5xx may have been applied: sending it again could duplicate it
+        idempotent = method.upper() in IDEMPOTENT_METHODS or any(k.lower() == "idempotency-key" for k in merged)
+
+        for attempt in range(self.max_retries + 1):
+            pool.limiter.acquire()
+            self._count("requests")
+            try:
+                status, resp_headers, data = pool.send(method, path, body, merged, self._count)
+            except (OSError, http.client.HTTPException) as e:
+                self._count("connection_errors")
+                if attempt == self.max_retries or not idempotent:
+                    raise HttpError(None, f"{method} {url} failed: {e}") from e
+                resp_headers = {}
+            else:
+                if status not in RETRY_STATUSES:
+                    if status >= 400:
+                        raise HttpError(status, f"{method} {url}", data)
+                    return Response(status, resp_headers, data, attempts=attempt + 1)
+                self._count(f"status_{status}")
+                if not idempotent and status != 429:
+                    raise HttpError(status, f"{method} {url}: not retried (not idempotent)", data)
+                if attempt == self.max_retries:
+                    raise HttpError(status, f"{method} {url}: retries exhausted", data)
+            self._count("retries")
+            time.sleep(self._backoff(attempt, resp_headers.get("retry-after")))
+        raise AssertionError("unreachable")
+
+    def latency_percentiles(self, quantiles=(0.5, 0.95, 0.99)) -> Dict[str, float]:
+        """Call latency (seconds) at the given quantiles over the recorded calls."""
+        values = sorted(self.latencies)
+        if not values:
+            return {}
+        return {f"p{round(q * 100)}": values[min(len(values) - 1, int(q * len(values)))] for q in quantiles}
+
+    def close(self):
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+
+
+class BulkBatcher:
+    """
+    Turns single-key lookups from many threads into bulk requests: send(keys) is called
+    with up to max_batch distinct keys and returns {key: value}. A batch goes out when
+    it is full or max_wait seconds after its first key; duplicate keys in one batch
+    share the lookup.
+    """
+
+    def __init__(self, send: Callable[[List[Hashable]], Dict[Hashable, Any]], max_batch: int, max_wait: float = 0.01):
+        self.send = send
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.stats = Counter()
+        self._pending: Dict[Hashable, Future] = {}
+        self._generation = 0
+        self._cond = threading.Condition()
+
+    def _take(self) -> Dict[Hashable, Future]:
+        batch, self._pending = self._pending, {}
+        self._generation += 1
+        self._cond.notify_all()
+        return batch
+
+    def _dispatch(self, batch: Dict[Hashable, Future]):
+        with self._cond:
+            self.stats["batches"] += 1
+            self.stats["keys"] += len(batch)
+        try:
+            results = self.send(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for key, future in batch.items():
+            future.set_result(results.get(key))
+
+    def call(self, key: Hashable) -> Any:
+        batch = None
+        with self._cond:
+            future = self._pending.get(key)
+            leader = False
+            if future is not None:
+                self.stats["coalesced"] += 1
+            else:
+                future = self._pending[key] = Future()
+                if len(self._pending) >= self.max_batch:
+                    batch = self._take()
+                elif len(self._pending) == 1:
+                    leader, generation = True, self._generation
+            if leader:
+                # first key of a batch: wait for it to fill (or for someone else to send it)
+                self._cond.wait_for(lambda: self._generation != generation, timeout=self.max_wait)
+                if self._generation == generation:
+                    batch = self._take()
+        if batch:
+            self._dispatch(batch)
+        return future.result()
+
+
+_shared: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def shared_client() -> HttpClient:
+    """The process-wide client all connectors share (created on first use)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpClient()
+        return _shared
@@ -0,0 +1,231 @@
+# app/utils/http_stub.py
+"""
+Local stand-in for the vendor APIs, to exercise HttpClient without the network:
+HTTP/1.1 with keep-alive, a fixed per-request latency, random 5xx at error_rate and
+429 + Retry-After once requests exceed the server-side quota (token bucket).
+
+Endpoints (JSON):
+  GET  /zoominfo/company?domain=acme.de      one company lookup
+  POST /zoominfo/company/bulk {"domains": []} bulk lookup, {"results": {domain: company}}
+  GET  /similarweb/search?verticals=SaaS,Fintech&countries=DE&min_visits=50000&limit=1000&cursor=
+                                             one page of a generated territory of search_rows
+                                             companies, filtered server-side; {"results", "next_cursor"}
+  POST /zoominfo/personas/bulk {"domains", "titles_regex", "enable_email_enrichment"}
+  POST /salesnav/personas/bulk {"domains", "titles_regex"}
+                                             the connector mocks' personas (seeded per domain);
+                                             {"results": [persona, ...]}
+  GET  /salesforce/accounts?since=&cursor=   accounts of a LocalSalesforceOrg, paged; {"records", "next_cursor"}
+  POST /salesforce/accounts/bulk {"records": []}
+                                             one ingest job, {"ids": []}; a repeated Idempotency-Key
+                                             gets the first job's answer
+  GET  /echo?...                             the query string back
+
+    with StubServer(latency=0.005, error_rate=0.02, quota=200) as stub:
+        HttpClient().get_json(f"{stub.url}/zoominfo/company", {"domain": "acme.de"})
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from app.utils.ratelimit import RateLimiter
+from app.utils.stable_hash import stable_id
+
+
+def _company(domain: str) -> Dict:
+    return {
+        "domain": domain,
+        "id": stable_id("ZC_", domain),
+        "linkedin_url": f"https://www.linkedin.com/company/{domain.split('.')[0]}/",
+    }
+
+
+class StubServer:
+    """Threaded stub server on 127.0.0.1 (port 0 = any free port); stats counts what it saw."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        quota: Optional[float] = None,
+        burst: Optional[int] = None,
+        port: int = 0,
+        seed: Optional[int] = None,
+        search_rows: int = 0,
+        idle_timeout: Optional[float] = None,
+    ):
+        """idle_timeout: seconds after which an idle keep-alive connection is closed server-side."""
+        self.latency = latency
+        self.idle_timeout = idle_timeout
+        self._salesforce = None
+        self._ingested: Dict[str, Dict] = {}
+        self.seed = seed
+        self.search_rows = search_rows
+        self._territory = None
+        self.error_rate = error_rate
+        self.limiter = RateLimiter(quota, burst)
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _fails(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def _search(self, query: Dict[str, str]) -> Dict:
+        """One page of the filtered territory; the cursor is the offset into the filtered rows."""
+        with self._lock:
+            if self._territory is None:
+                from app.utils.synthetic import SyntheticGenerator
+                self._territory = SyntheticGenerator(self.seed or 0).companies(
+                    self.search_rows, min_visits=10_000, variant_rate=0
+                )
+        df = self._territory
+        mask = df["sw_visits"] >= int(query.get("min_visits") or 0)
+        for column, key in (("vertical", "verticals"), ("country", "countries")):
+            if query.get(key):
+                mask &= df[column].isin(query[key].split(","))
+        offset = int(query.get("cursor") or 0)
+        limit = int(query.get("limit") or 1000)
+        matches = df[mask]
+        page = matches.iloc[offset:offset + limit]
+        with self._lock:
+            self.stats["search_rows_served"] += len(page)
+        end = offset + len(page)
+        return {"results": page.to_dict("records"), "next_cursor": str(end) if end < len(matches) else None}
+
+    def _personas(self, path: str, payload: Dict) -> Dict:
+        domains = payload.get("domains") or []
+        regex = payload.get("titles_regex") or ""
+        seed = self.seed or 0
+        if path.startswith("/zoominfo/"):
+            from app.connectors import zoominfo as zi
+            rngs = [random.Random(f"{seed}|{d}") for d in domains]
+            frame = zi.find_personas_batch(domains, regex, payload.get("enable_email_enrichment", True), rngs=rngs)
+        else:
+            from app.connectors import sales_navigator as sn
+            frame = sn.find_personas_from_account_list(domains, regex, seed=seed)
+        return {"results": frame.to_dict("records")}
+
+    def _org(self):
+        with self._lock:
+            if self._salesforce is None:
+                from app.connectors.salesforce import DEMO_ACCOUNTS, LocalSalesforceOrg
+                self._salesforce = LocalSalesforceOrg(DEMO_ACCOUNTS)
+            return self._salesforce
+
+    def _accounts(self, query: Dict[str, str]) -> Dict:
+        """One page of accounts changed since query["since"]; the cursor is the page number."""
+        since = datetime.fromisoformat(query["since"]) if query.get("since") else None
+        pages = list(self._org().query_accounts(since)) or [[]]
+        n = int(query.get("cursor") or 0)
+        records = [{k: v for k, v in r.items() if k != "SystemModstamp"} for r in pages[n]]
+        return {"records": records, "next_cursor": str(n + 1) if n + 1 < len(pages) else None}
+
+    def _ingest(self, payload: Dict, key: Optional[str]) -> Dict:
+        with self._lock:
+            if key and key in self._ingested:
+                return self._ingested[key]
+        job = {"ids": self._org().bulk_insert(payload.get("records") or [])}
+        if key:
+            with self._lock:
+                self._ingested[key] = job
+        return job
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            timeout = stub.idle_timeout  # close idle keep-alive connections after this long
+            disable_nagle_algorithm = True  # headers and body are separate writes
+
+            def setup(self):
+                super().setup()
+                stub._count("connections")
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _serve(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                stub._count("requests")
+                if not stub.limiter.try_acquire():
+                    stub._count("throttled")
+                    return self._reply(429, {"error": "rate limit"}, {"Retry-After": "0.05"})
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub._fails():
+                    stub._count("errors")
+                    return self._reply(503, {"error": "injected"})
+
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                if method == "GET" and parts.path == "/zoominfo/company":
+                    return self._reply(200, _company(query.get("domain", "")))
+                if method == "POST" and parts.path == "/zoominfo/company/bulk":
+                    domains = json.loads(raw or b"{}").get("domains", [])
+                    stub._count("bulk_records")
+                    return self._reply(200, {"results": {d: _company(d) for d in domains}})
+                if method == "GET" and parts.path == "/similarweb/search":
+                    return self._reply(200, stub._search(query))
+                if method == "POST" and parts.path in ("/zoominfo/personas/bulk", "/salesnav/personas/bulk"):
+                    return self._reply(200, stub._personas(parts.path, json.loads(raw or b"{}")))
+                if method == "GET" and parts.path == "/salesforce/accounts":
+                    return self._reply(200, stub._accounts(query))
+                if method == "POST" and parts.path == "/salesforce/accounts/bulk":
+                    return self._reply(200, stub._ingest(json.loads(raw or b"{}"), self.headers.get("Idempotency-Key")))
+                if parts.path == "/echo":
+                    return self._reply(200, query)
+                return self._reply(404, {"error": "not found"})
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="http-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
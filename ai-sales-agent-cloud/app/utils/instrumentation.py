@@ -0,0 +1,345 @@
+# app/utils/instrumentation.py
+import bisect
+import functools
+import io
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.utils.cache import answered_from_cache
+
+logger = logging.getLogger("app.pipeline")
+
+# Upper bounds (ms) of the connector latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+STAGE_COLUMNS = ["stage", "wall_s", "cpu_s", "cpu_shared", "rows_in", "rows_out"]
+
+# Runs inside RunReport.running() in this process: CPU time and profilers are
+# process-wide, so they can only be attributed to a run that had the process to itself
+_runs_lock = threading.Lock()
+_runs = {"active": 0, "started": 0}
+
+
+class _ConnectorStats:
+    """Connector calls (latency histogram) and, apart from them, calls a connector cache answered."""
+
+    __slots__ = ("calls", "errors", "total_s", "max_s", "buckets", "cache_hits")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.cache_hits = 0
+
+    def observe(self, seconds: float, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+
+
+class _StageHandle:
+    """
+    Yielded by RunReport.stage(); set rows_out (rows the stage hands on) once the stage
+    result is known. Other figures of the stage go into extra, e.g. {"sf_matched": 12}.
+    """
+
+    def __init__(self, rows_in: Optional[int]):
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.extra: Dict[str, int] = {}
+
+
+class _TimedConnector:
+    """
+    Proxy for a connector module: every public function call is timed into the report;
+    calls a connector cache (app/utils/cache.py) answered alone count as cache hits instead.
+    """
+
+    def __init__(self, module, name: str, report: "RunReport"):
+        self._module = module
+        self._name = name
+        self._report = report
+
+    def __getattr__(self, attr):
+        fn = getattr(self._module, attr)  # looked up per call, so installed caches still apply
+        if attr.startswith("_") or not callable(fn):
+            return fn
+        cached = hasattr(fn, "__wrapped_by_cache__")
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                if not failed and cached and answered_from_cache():
+                    self._report.observe_cache_hit(f"{self._name}.{attr}")
+                else:
+                    self._report.observe_call(f"{self._name}.{attr}", time.perf_counter() - t0, failed)
+
+        return timed
+
+
+class RunReport:
+    """
+    Structured diagnostics for one pipeline run:
+      - per stage: wall time, CPU time, rows in/out and the stage's extra figures
+      - per connector function: calls, errors, total/max latency, latency histogram, and
+        cache hits (calls the connector cache answered; not in calls or latencies)
+      - optional profile: "cprofile" (top functions by cumulative time, over the calling
+        thread and the threads started during the run) or "tracemalloc" (peak traced
+        memory + top allocation sites)
+    CPU time is the whole process's (worker threads included), and tracemalloc traces
+    the whole process: with concurrent runs (PipelineJobs of several sessions, the
+    batch runner) they include the other runs. Stages that overlapped another run are
+    flagged cpu_shared, and profiling is skipped when another run is active at the start.
+    emit_logs=True also logs one JSON line per finished stage on the "app.pipeline" logger.
+    """
+
+    def __init__(self, profile: Optional[str] = None, emit_logs: bool = False):
+        if profile not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"Unknown profile mode: {profile}")
+        self.profile = profile
+        self.emit_logs = emit_logs
+        self.stages: List[Dict] = []
+        self.connectors: Dict[str, _ConnectorStats] = {}
+        self.profile_text: Optional[str] = None
+        self.active: Optional[Dict] = None  # stage currently running (for progress displays)
+        self.started = time.time()
+        self._running = False
+        self._lock = threading.Lock()
+
+    def _concurrency(self) -> Tuple[int, int]:
+        """(other runs active in this process, runs started in this process so far)."""
+        with _runs_lock:
+            return _runs["active"] - self._running, _runs["started"]
+
+    # --- recording -------------------------------------------------------
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        handle = _StageHandle(rows_in)
+        self.active = {"stage": name, "rows_in": rows_in}
+        others0, started0 = self._concurrency()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield handle
+        finally:
+            others1, started1 = self._concurrency()
+            record = {
+                "stage": name,
+                "wall_s": round(time.perf_counter() - wall0, 6),
+                "cpu_s": round(time.process_time() - cpu0, 6),
+                # another run was active at some point: cpu_s includes its work too
+                "cpu_shared": bool(others0 or others1 or started1 != started0),
+                "rows_in": handle.rows_in,
+                "rows_out": handle.rows_out,
+                **handle.extra,
+            }
+            with self._lock:
+                self.stages.append(record)
+                self.active = None
+            if self.emit_logs:
+                logger.info(json.dumps({"event": "stage_done", **record}))
+
+    def _stats(self, name: str) -> _ConnectorStats:
+        stats = self.connectors.get(name)
+        if stats is None:
+            stats = self.connectors[name] = _ConnectorStats()
+        return stats
+
+    def observe_call(self, name: str, seconds: float, failed: bool = False):
+        with self._lock:
+            self._stats(name).observe(seconds, failed)
+
+    def observe_cache_hit(self, name: str):
+        """A call answered by the connector cache: counted, but kept out of calls and latencies."""
+        with self._lock:
+            self._stats(name).cache_hits += 1
+
+    def connector(self, module, name: str):
+        """Wrap a connector module so its calls are counted and timed."""
+        return _TimedConnector(module, name, self)
+
+    def merge_connectors(self, connectors: Dict[str, _ConnectorStats]):
+        """Fold connector stats recorded elsewhere (e.g. in a worker process) into this report."""
+        with self._lock:
+            for name, other in connectors.items():
+                stats = self._stats(name)
+                stats.cache_hits += other.cache_hits
+                stats.calls += other.calls
+                stats.errors += other.errors
+                stats.total_s += other.total_s
+                stats.max_s = max(stats.max_s, other.max_s)
+                stats.buckets = [a + b for a, b in zip(stats.buckets, other.buckets)]
+
+    @contextmanager
+    def running(self):
+        """The whole run: counted as active in this process (see cpu_shared) and profiled if configured."""
+        with _runs_lock:
+            _runs["active"] += 1
+            _runs["started"] += 1
+        self._running = True
+        try:
+            with self.profiling():
+                yield
+        finally:
+            self._running = False
+            with _runs_lock:
+                _runs["active"] -= 1
+
+    @contextmanager
+    def profiling(self, top: int = 25):
+        """
+        Run the block under the configured profiler (no-op without one). Skipped, with a
+        note in profile_text, while another run is active in the process (the profile
+        would mix both) or tracemalloc is already tracing.
+        """
+        others, _ = self._concurrency()
+        skip = None
+        if self.profile and others:
+            skip = f"{others} other run(s) active in this process"
+        elif self.profile == "tracemalloc":
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                skip = "tracemalloc is already tracing this process"
+        if skip:
+            self.profile_text = f"{self.profile} profile skipped: {skip}"
+            yield
+        elif self.profile == "cprofile":
+            import cProfile
+            import pstats
+
+            # one profiler per thread (cProfile only sees its own): this one, and every
+            # thread started during the run (enrichment workers, search prefetch)
+            threads = []
+
+            def profile_thread(*_):
+                thread_prof = cProfile.Profile()
+                with self._lock:
+                    threads.append(thread_prof)
+                thread_prof.enable()  # replaces this hook for the rest of the thread
+
+            _, started = self._concurrency()
+            prof = cProfile.Profile()
+            threading.setprofile(profile_thread)
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+                threading.setprofile(None)
+                out = io.StringIO()
+                stats = pstats.Stats(prof, stream=out)
+                with self._lock:
+                    for thread_prof in threads:
+                        stats.add(thread_prof)
+                out.write(f"calling thread + {len(threads)} worker thread(s) started during the run\n")
+                if self._concurrency()[1] != started:
+                    out.write("(other runs started in this process meanwhile; their threads are included)\n")
+                stats.sort_stats("cumulative").print_stats(top)
+                self.profile_text = out.getvalue()
+        elif self.profile == "tracemalloc":
+            import tracemalloc
+
+            _, started = self._concurrency()
+            tracemalloc.start()
+            try:
+                yield
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                lines = [f"peak traced memory: {peak / 2**20:.1f} MiB"]
+                if self._concurrency()[1] != started:
+                    lines.append("(other runs started in this process meanwhile; their allocations are included)")
+                lines += [str(s) for s in snapshot.statistics("lineno")[:top]]
+                self.profile_text = "\n".join(lines)
+        else:
+            yield
+
+    # --- output ----------------------------------------------------------
+    def _extra_columns(self) -> List[str]:
+        seen = dict.fromkeys(k for s in self.stages for k in s if k not in STAGE_COLUMNS)
+        return list(seen)
+
+    def stages_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.stages, columns=[*STAGE_COLUMNS, *self._extra_columns()])
+
+    def connectors_frame(self) -> pd.DataFrame:
+        rows = [
+            {
+                "call": name,
+                "calls": s.calls,
+                "cache_hits": s.cache_hits,
+                "errors": s.errors,
+                "total_s": round(s.total_s, 6),
+                "mean_ms": round(s.total_s / s.calls * 1000, 3) if s.calls else None,
+                "max_ms": round(s.max_s * 1000, 3),
+            }
+            for name, s in sorted(self.connectors.items())
+        ]
+        return pd.DataFrame(rows, columns=["call", "calls", "cache_hits", "errors", "total_s", "mean_ms", "max_ms"])
+
+    def to_dict(self) -> Dict:
+        return {
+            "started": self.started,
+            "total_wall_s": round(sum(s["wall_s"] for s in self.stages), 6),
+            "stages": list(self.stages),
+            "connectors": {
+                name: {
+                    "calls": s.calls,
+                    "cache_hits": s.cache_hits,
+                    "errors": s.errors,
+                    "total_s": s.total_s,
+                    "max_s": s.max_s,
+                    "histogram_ms": dict(zip([*map(str, LATENCY_BUCKETS_MS), "+Inf"], s.buckets)),
+                }
+                for name, s in sorted(self.connectors.items())
+            },
+            "profile": self.profile_text,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition of the stage timers and connector histograms."""
+        lines = [
+            "# TYPE pipeline_stage_wall_seconds gauge",
+            *[f'pipeline_stage_wall_seconds{{stage="{s["stage"]}"}} {s["wall_s"]}' for s in self.stages],
+            "# TYPE pipeline_stage_cpu_seconds gauge",
+            *[f'pipeline_stage_cpu_seconds{{stage="{s["stage"]}"}} {s["cpu_s"]}' for s in self.stages],
+            "# TYPE pipeline_stage_rows_out gauge",
+            *[f'pipeline_stage_rows_out{{stage="{s["stage"]}"}} {s["rows_out"]}'
+              for s in self.stages if s["rows_out"] is not None],
+        ]
+        for key in self._extra_columns():
+            lines.append(f"# TYPE pipeline_stage_{key} gauge")
+            lines += [f'pipeline_stage_{key}{{stage="{s["stage"]}"}} {s[key]}' for s in self.stages if key in s]
+        lines += [
+            "# TYPE connector_call_latency_seconds histogram",
+        ]
+        for name, s in sorted(self.connectors.items()):
+            cumulative = 0
+            for bound, count in zip([*LATENCY_BUCKETS_MS, None], s.buckets):
+                cumulative += count
+                le = "+Inf" if bound is None else str(bound / 1000)
+                lines.append(f'connector_call_latency_seconds_bucket{{call="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'connector_call_latency_seconds_sum{{call="{name}"}} {s.total_s}')
+            lines.append(f'connector_call_latency_seconds_count{{call="{name}"}} {s.calls}')
+        lines.append("# TYPE connector_cache_hits_total counter")
+        lines += [f'connector_cache_hits_total{{call="{name}"}} {s.cache_hits}' for name, s in sorted(self.connectors.items())]
+        lines.append("# TYPE connector_call_errors_total counter")
+        lines += [f'connector_call_errors_total{{call="{name}"}} {s.errors}' for name, s in sorted(self.connectors.items())]
+        return "\n".join(lines) + "\n"
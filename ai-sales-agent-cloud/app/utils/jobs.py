@@ -0,0 +1,135 @@
+# app/utils/jobs.py
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.utils.cache import EnrichmentCache
+from app.utils.instrumentation import RunReport
+from app.utils.stage_graph import StageMemo
+
+# Stage names recorded by run_pipeline, in order (drives the progress bar; scoring is optional)
+PIPELINE_STAGES = ("search", "normalize_dedupe", "salesforce", "enrichment", "sales_navigator", "scoring", "export")
+
+# Inputs the pipeline only uses as sets (membership tests): their order doesn't change the run.
+# Every other list (countries, verticals, ...) keeps its order, it decides the output.
+UNORDERED_INPUTS = frozenset({"keep_domains", "create_sf_accounts"})
+
+
+def run_key(params: Dict, ui_decisions: Dict) -> str:
+    """Canonical JSON of a run's inputs: key order, whitespace and the order of UNORDERED_INPUTS don't matter."""
+    def norm(value, unordered: bool = False):
+        if isinstance(value, dict):
+            return {k: norm(v, k in UNORDERED_INPUTS) for k, v in value.items()}
+        if isinstance(value, set) or (unordered and isinstance(value, (list, tuple))):
+            return sorted((norm(v) for v in value), key=repr)
+        if isinstance(value, (list, tuple)):
+            return [norm(v) for v in value]
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
+    return json.dumps({"params": norm(params), "ui": norm(ui_decisions)}, sort_keys=True, default=str)
+
+
+class PipelineJob:
+    """
+    run_pipeline on a daemon thread. The page polls progress() while it runs and reads
+    result (companies, leads, needs) or error once done; report fills in stage by stage.
+    A shared StageMemo (app/utils/stage_graph.py) lets the run reuse earlier stage outputs;
+    a connector cache (app/utils/cache.py) serves this run's connector calls.
+    """
+
+    def __init__(
+        self,
+        params: Dict,
+        ui_decisions: Dict,
+        report: Optional[RunReport] = None,
+        memo: Optional[StageMemo] = None,
+        cache: Optional[EnrichmentCache] = None,
+    ):
+        self.params = params
+        self.ui_decisions = ui_decisions
+        self.report = report or RunReport()
+        self.memo = memo
+        self.cache = cache
+        self.result: Optional[Tuple] = None
+        self.error: Optional[BaseException] = None
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="pipeline-job", daemon=True)
+
+    def start(self) -> "PipelineJob":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        from app.agent_orchestrator_clean import run_pipeline
+
+        try:
+            self.result = run_pipeline(
+                self.params, self.ui_decisions, report=self.report, memo=self.memo, cache=self.cache
+            )
+        except BaseException as e:  # surfaced in the page, never lost in the thread
+            self.error = e
+        finally:
+            self.finished = time.time()
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return self.done
+
+    def progress(self) -> Tuple[float, str]:
+        """(fraction of stages finished, label of the running stage)."""
+        finished = len(self.report.stages)
+        if self.done:
+            return 1.0, "done" if self.error is None else "failed"
+        active = self.report.active
+        label = f"{active['stage']}…" if active else "starting…"
+        if active and active["stage"] == "enrichment" and active["rows_in"]:
+            stats = self.report.connectors.get("zoominfo.enrich_company")
+            enriched = stats.calls + stats.cache_hits if stats else 0
+            label = f"enrichment… {enriched}/{active['rows_in']} companies"
+        return min(finished / len(PIPELINE_STAGES), 1.0), label
+
+
+class JobRegistry:
+    """
+    PipelineJobs by run_key, shared by every session of the server: at most max_entries
+    (least recently used dropped first), each kept ttl seconds from its start. Unlike
+    clearing a whole cached function, evict() drops one run and leaves the others alone.
+    """
+
+    def __init__(self, max_entries: int = 16, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._jobs: "OrderedDict[str, PipelineJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_start(self, key: str, start: Callable[[], PipelineJob]) -> PipelineJob:
+        """The job for key, or start() (called once per key, also for concurrent callers)."""
+        with self._lock:
+            now = time.time()
+            for stale in [k for k, job in self._jobs.items() if now - job.started > self.ttl]:
+                del self._jobs[stale]
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._jobs[key] = start()
+                while len(self._jobs) > self.max_entries:
+                    self._jobs.popitem(last=False)
+            self._jobs.move_to_end(key)
+            return job
+
+    def evict(self, key: str, job: Optional[PipelineJob] = None):
+        """Forget key's run (only if it is still `job`, so a retry started meanwhile survives)."""
+        with self._lock:
+            if key in self._jobs and (job is None or self._jobs[key] is job):
+                del self._jobs[key]
+
+    def __len__(self) -> int:
+        return len(self._jobs)
@@ -0,0 +1,159 @@
+# app/utils/lead_merge.py
+"""
+Cross-source lead merge: ZoomInfo and Sales Navigator return the same person with
+different `source`. LeadIndex keeps one record per person, found through hash indexes on
+  - normalized email
+  - normalized LinkedIn profile URL
+  - (company_domain, normalized full_name)
+and collapses duplicates with source-priority rules:
+  - email:      the ZoomInfo one (else the first non-empty)
+  - li_profile: the Sales Navigator one (else the first non-empty)
+  - confidence: the max over all merged leads
+  - source / title: of the highest-priority source / first seen
+Per-domain lead counts are kept up to date on every add, so "does this company still
+need Sales Navigator" is a dict lookup instead of an isin scan over all leads.
+"""
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+from app.schema import LEAD_COLUMNS, as_leads
+
+# Lower wins: source of a merged lead, and whose email it keeps
+SOURCE_PRIORITY = {"zoominfo": 0, "sales_navigator": 1}
+# Whose LinkedIn profile URL a merged lead keeps (lower wins)
+PROFILE_PRIORITY = {"sales_navigator": 0, "zoominfo": 1}
+_UNRANKED = len(SOURCE_PRIORITY)
+
+# Record layout (lists, mutated in place on merge)
+DOMAIN, NAME, TITLE, EMAIL, PROFILE, SOURCE, CONFIDENCE = range(7)
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_profile(url: str) -> str:
+    """linkedin.com/in/<slug> without scheme, (country) subdomain, query or trailing slash."""
+    url = url.strip().lower().split("?", 1)[0].rstrip("/")
+    start = url.find("linkedin.com/")
+    return url[start:] if start > 0 else url
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _text(s: pd.Series) -> List[str]:
+    return s.astype(object).where(s.notna(), "").astype(str).tolist()
+
+
+def _normalized(fn, values: List[str]) -> List[str]:
+    """[fn(v) for v in values], calling fn once per distinct value."""
+    mapping = {v: fn(v) for v in dict.fromkeys(values)}
+    return [mapping[v] for v in values]
+
+
+class LeadIndex:
+    """Merged leads in first-seen order, indexed by email, profile URL and (domain, name)."""
+
+    def __init__(self):
+        self._records: List[list] = []
+        self._by_email: Dict[str, int] = {}
+        self._by_profile: Dict[str, int] = {}
+        self._by_name: Dict[Tuple[str, str], int] = {}
+        self._counts: Dict[str, int] = {}
+        self.duplicates = 0  # leads merged into an existing record
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, leads: pd.DataFrame) -> "LeadIndex":
+        """Merge a leads frame into the index (any source; order within the frame is kept)."""
+        if leads is None or leads.empty:
+            return self
+        leads = as_leads(leads)
+        names, emails, profiles = _text(leads["full_name"]), _text(leads["email"]), _text(leads["li_profile"])
+        columns = [
+            _text(leads["company_domain"]),
+            names,
+            leads["title"].astype(object).tolist(),
+            emails,
+            profiles,
+            _text(leads["source"]),
+            leads["confidence"].astype("float64").tolist(),
+            _normalized(normalize_email, emails),
+            _normalized(normalize_profile, profiles),
+            _normalized(normalize_name, names),
+        ]
+        by_email, by_profile, by_name = self._by_email, self._by_profile, self._by_name
+        records, counts, merge = self._records, self._counts, self._merge
+        duplicates = 0
+        for domain, name, title, email, profile, source, conf, e_key, p_key, n_key in zip(*columns):
+            name_key = (domain, n_key)
+            # first index hit wins (email, then profile, then name)
+            i = by_email.get(e_key) if e_key else None
+            if i is None and p_key:
+                i = by_profile.get(p_key)
+            if i is None and n_key:
+                i = by_name.get(name_key)
+
+            if i is None:
+                i = len(records)
+                records.append([domain, name, title, email, profile, source, conf])
+                counts[domain] = counts.get(domain, 0) + 1
+            else:
+                merge(records[i], title, email, profile, source, conf)
+                duplicates += 1
+
+            if e_key:
+                by_email.setdefault(e_key, i)
+            if p_key:
+                by_profile.setdefault(p_key, i)
+            if n_key:
+                by_name.setdefault(name_key, i)
+        self.duplicates += duplicates
+        return self
+
+    @staticmethod
+    def _merge(record: list, title, email: str, profile: str, source: str, conf: float):
+        old = record[SOURCE]
+        rank, old_rank = SOURCE_PRIORITY.get(source, _UNRANKED), SOURCE_PRIORITY.get(old, _UNRANKED)
+        if email and (not record[EMAIL] or rank < old_rank):
+            record[EMAIL] = email
+        if profile and (not record[PROFILE]
+                        or PROFILE_PRIORITY.get(source, _UNRANKED) < PROFILE_PRIORITY.get(old, _UNRANKED)):
+            record[PROFILE] = profile
+        if conf == conf and not conf <= record[CONFIDENCE]:  # max, NaN-safe
+            record[CONFIDENCE] = conf
+        if not record[TITLE] or record[TITLE] != record[TITLE]:
+            record[TITLE] = title
+        if rank < old_rank:
+            record[SOURCE] = source
+
+    def count(self, domain: str) -> int:
+        """Merged leads for one company domain."""
+        return self._counts.get(domain, 0)
+
+    def has_leads(self, domain: str) -> bool:
+        return domain in self._counts
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def without_leads(self, companies: pd.DataFrame) -> pd.DataFrame:
+        """Rows of companies whose domain has no lead yet (they still need Sales Navigator)."""
+        has = self._counts.__contains__
+        return companies[[not has(d) for d in companies["domain"].tolist()]]
+
+    def frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The merged leads as a typed frame, in first-seen order."""
+        frame = pd.DataFrame(self._records, columns=LEAD_COLUMNS)
+        return as_leads(frame if columns is None else frame[columns])
+
+
+def merge_leads(*frames: pd.DataFrame) -> pd.DataFrame:
+    """One merged leads frame from any number of (per-source) leads frames."""
+    index = LeadIndex()
+    for frame in frames:
+        index.add(frame)
+    return index.frame()
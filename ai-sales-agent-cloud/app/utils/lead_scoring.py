@@ -0,0 +1,132 @@
+# app/utils/lead_scoring.py
+"""
+Lead scoring and top-K personas per account.
+
+score = weighted sum of features in [0, 1]:
+  seniority    title level from SENIORITY (first matching pattern wins)
+  title_match  the title matches params["titles_regex"]
+  source       SOURCE_SCORES of the lead's source
+  email        the lead has an email
+  confidence   the connector's confidence
+Title features are computed once per distinct title and gathered over the title codes,
+so scoring 1M leads is one pass of array arithmetic. top_k_per_company keeps the K
+best leads of every company_domain with a grouped argpartition: only companies with
+more than K leads are looked at, and no scores are sorted.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# (pattern, seniority) in order of precedence; titles matching none get DEFAULT_SENIORITY
+SENIORITY = [
+    (r"\b(chief|c[emorf]o|founder|owner|president)\b", 1.0),
+    (r"\b(vp|svp|evp|vice president)\b", 0.85),
+    (r"\bhead\b", 0.75),
+    (r"\bdirector\b", 0.65),
+    (r"\b(senior|sr\.?|lead|principal)\b", 0.45),
+    (r"\bmanager\b", 0.35),
+]
+DEFAULT_SENIORITY = 0.2
+
+SOURCE_SCORES = {"zoominfo": 1.0, "sales_navigator": 0.8}
+DEFAULT_SOURCE_SCORE = 0.5
+
+# Override per run with params["lead_score_weights"] (missing keys keep these)
+DEFAULT_WEIGHTS = {"seniority": 0.4, "title_match": 0.2, "source": 0.1, "email": 0.15, "confidence": 0.15}
+
+
+@lru_cache(maxsize=1024)
+def _title_features(title: str, titles_regex: str) -> Tuple[float, float]:
+    """(seniority, title_match) of one title."""
+    text = (title or "").lower()
+    seniority = next((s for pattern, s in SENIORITY if re.search(pattern, text)), DEFAULT_SENIORITY)
+    try:
+        match = bool(re.search(titles_regex or "", title or "", re.IGNORECASE))
+    except re.error:
+        match = True  # invalid regex matches all, as in the connectors
+    return seniority, float(match)
+
+
+def _codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """(codes, distinct values) of a column; missing values get code -1."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, uniques = pd.factorize(values)
+    return codes, pd.Index(uniques)
+
+
+def _gather(codes: np.ndarray, table: np.ndarray, missing: float = 0.0) -> np.ndarray:
+    """table[codes] with code -1 mapped to `missing`."""
+    return np.append(table, missing).astype(np.float32)[codes]
+
+
+def score_leads(leads: pd.DataFrame, titles_regex: str = "", weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Lead score per row of `leads` (float32); one vectorized pass, title work per distinct title."""
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    if leads.empty:
+        return np.zeros(0, dtype=np.float32)
+
+    codes, titles = _codes(leads["title"])
+    features = np.array([_title_features(str(t), titles_regex) for t in titles], dtype=np.float32).reshape(-1, 2)
+    score = w["seniority"] * _gather(codes, features[:, 0], DEFAULT_SENIORITY)
+    score += w["title_match"] * _gather(codes, features[:, 1])
+
+    codes, sources = _codes(leads["source"])
+    source = np.array([SOURCE_SCORES.get(s, DEFAULT_SOURCE_SCORE) for s in sources], dtype=np.float32)
+    score += w["source"] * _gather(codes, source, DEFAULT_SOURCE_SCORE)
+
+    email = leads["email"]
+    has_email = email.notna().to_numpy() & (email.astype(object).fillna("").to_numpy() != "")
+    score += w["email"] * has_email
+    score += w["confidence"] * leads["confidence"].fillna(0).to_numpy(dtype=np.float32)
+    return score.astype(np.float32)
+
+
+def _desc_keys(scores: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """uint64 keys ordering rows by score (descending), then position: float32 bits made order-preserving."""
+    bits = (np.asarray(scores, dtype=np.float32) + np.float32(0)).view(np.uint32)  # + 0: -0.0 ties with 0.0
+    ascending = np.where(bits & np.uint32(0x80000000), ~bits, bits | np.uint32(0x80000000))
+    return ((~ascending).astype(np.uint64) << np.uint64(32)) | positions.astype(np.uint64)
+
+
+def top_k_per_company(leads: pd.DataFrame, scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Row positions of the k best-scored leads of every company_domain, in input order
+    (ties: the earlier row). Companies with at most k leads are kept whole. The rows of
+    larger companies are grouped by company (a stable sort of the company codes only,
+    near linear since connectors emit a company's leads together) and every company's
+    best k are selected with argpartition, over all companies with the same number of
+    leads at once; scores are never sorted.
+    """
+    groups = _codes(leads["company_domain"])[0].astype(np.int64)
+    groups = np.where(groups < 0, groups.max(initial=0) + 1, groups)  # missing domain: one group
+    sizes = np.bincount(groups)
+    keep = sizes[groups] <= k
+    big = np.flatnonzero(~keep)
+    if len(big):
+        big = big[np.argsort(groups[big], kind="stable")]  # rows of a company together, in input order
+        keys = _desc_keys(scores[big], big)
+        size = sizes[groups[big]]
+        for s in np.unique(size):
+            # companies with s leads: one row of s candidates each; the k smallest keys win
+            rows = size == s
+            block, block_keys = big[rows].reshape(-1, s), keys[rows].reshape(-1, s)
+            best = np.argpartition(block_keys, k - 1, axis=1)[:, :k]
+            keep[np.take_along_axis(block, best, axis=1).ravel()] = True
+    return np.flatnonzero(keep)
+
+
+def rank_leads(leads: pd.DataFrame, params: Dict) -> pd.DataFrame:
+    """
+    leads with a lead_score column; with params["top_k_personas"] only the best K per
+    company. Weights: params["lead_score_weights"].
+    """
+    scores = score_leads(leads, params.get("titles_regex", ""), params.get("lead_score_weights"))
+    ranked = leads.assign(lead_score=scores)
+    k = params.get("top_k_personas")
+    if k:
+        ranked = ranked.iloc[top_k_per_company(ranked, scores, int(k))].reset_index(drop=True)
+    return ranked
@@ -0,0 +1,275 @@
+# app/utils/lead_store.py
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from app.utils.dedupe import canonical_host
+from app.utils.lead_merge import normalize_email, normalize_name, normalize_profile
+
+DEFAULT_PATH = "data/store/leads.sqlite"
+
+# Bound parameters per IN (...) lookup (SQLite's historical limit is 999)
+LOOKUP_CHUNK = 900
+
+# What a suppression entry can name; leads are matched on their normalized email / profile URL
+SUPPRESSION_KINDS = ("domain", "email", "li_profile")
+
+# PRAGMA user_version of the current layout (1: leads keyed on domain + name)
+SCHEMA_VERSION = 1
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS companies ("
+    " domain TEXT PRIMARY KEY, company_name TEXT, country TEXT, vertical TEXT,"
+    " zoominfo_company_id TEXT, sf_account_id TEXT,"
+    " first_run TEXT, last_run TEXT, first_seen REAL, last_seen REAL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS leads ("
+    " lead_key TEXT PRIMARY KEY, company_domain TEXT, full_name TEXT, title TEXT, email TEXT,"
+    " li_profile TEXT, source TEXT, confidence REAL, email_key TEXT, profile_key TEXT,"
+    " first_run TEXT, last_run TEXT, first_seen REAL, last_seen REAL) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS leads_email ON leads(email_key)",
+    "CREATE INDEX IF NOT EXISTS leads_profile ON leads(profile_key)",
+    "CREATE INDEX IF NOT EXISTS leads_domain ON leads(company_domain)",
+    "CREATE TABLE IF NOT EXISTS suppression ("
+    " kind TEXT, value TEXT, reason TEXT, added REAL, PRIMARY KEY (kind, value)) WITHOUT ROWID",
+]
+
+
+def _column(df: pd.DataFrame, name: str) -> List:
+    if name not in df.columns:
+        return [None] * len(df)
+    s = df[name]
+    return s.astype(object).where(s.notna(), None).tolist()
+
+
+def _keys(fn, values: List) -> List[str]:
+    mapping = {v: fn(v or "") for v in dict.fromkeys(values)}
+    return [mapping[v] for v in values]
+
+
+def company_keys(companies: pd.DataFrame) -> pd.Series:
+    """Canonical host per company row (no scheme, path, port or 'www.'): the store's domain key."""
+    return pd.Series(_keys(canonical_host, _column(companies, "domain")), index=companies.index, dtype=object)
+
+
+def lead_key(domain: str, name_key: str, fallback: str = "") -> str:
+    """A lead's store key: canonical domain + normalized name (email / profile key if it has no name)."""
+    return f"{domain}|{name_key}" if name_key or not fallback else fallback
+
+
+def lead_keys(domains: List[str], names: List, email_keys: List[str], profile_keys: List[str]) -> List[str]:
+    """lead_key per row (domains canonical, emails / profiles normalized)."""
+    name_keys = _keys(normalize_name, names)
+    return [lead_key(d, n, e or p) for d, n, e, p in zip(domains, name_keys, email_keys, profile_keys)]
+
+
+class LeadStore:
+    """
+    Embedded SQLite store of every company and lead a run produced, plus a suppression list:
+      companies    one row per canonical domain (first/last run that produced it)
+      leads        one row per person: keyed on (canonical domain, normalized name), so a
+                   person found by several sources (with and without an email) is one
+                   row; email and LinkedIn profile are indexed attributes
+      suppression  (kind, value) pairs that must never be enriched or exported again
+    Lookups are bulk anti-joins (chunked IN queries against the primary key/indexes),
+    so filtering a run's frames costs one query per LOOKUP_CHUNK values.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._lock = threading.RLock()
+        # WAL + busy timeout, like the connector cache: concurrent runs share the file
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._rekey_leads()
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.commit()
+
+    def _rekey_leads(self):
+        """Move leads stored under an email / profile key (stores written before name keys) to their name key."""
+        rows = self._db.execute(
+            "SELECT lead_key, company_domain, full_name FROM leads WHERE instr(lead_key, '|') = 0"
+        ).fetchall()
+        for old, domain, name in rows:
+            new = lead_key(domain, normalize_name(name or ""), old)
+            if new == old:
+                continue
+            if self._db.execute("SELECT 1 FROM leads WHERE lead_key = ?", (new,)).fetchone():
+                self._db.execute("DELETE FROM leads WHERE lead_key = ?", (old,))  # same person twice: keep one
+            else:
+                self._db.execute("UPDATE leads SET lead_key = ? WHERE lead_key = ?", (new, old))
+
+    @classmethod
+    def for_run(cls, params: Dict) -> Optional["LeadStore"]:
+        """Store for this run if params["lead_store"] is set (True = DEFAULT_PATH, or a path), else None."""
+        path = params.get("lead_store")
+        if not path:
+            return None
+        return cls(DEFAULT_PATH if path is True else str(path))
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def __enter__(self) -> "LeadStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- lookups -----------------------------------------------------------
+
+    def _existing(self, sql: str, values: Iterable[str], prefix: tuple = ()) -> Set[str]:
+        """Which of `values` the query `sql` (with one IN (...) placeholder group) returns."""
+        values = [v for v in dict.fromkeys(values) if v]
+        found = set()
+        with self._lock:
+            for start in range(0, len(values), LOOKUP_CHUNK):
+                chunk = values[start:start + LOOKUP_CHUNK]
+                query = sql.format(",".join("?" * len(chunk)))
+                found.update(v for (v,) in self._db.execute(query, (*prefix, *chunk)))
+        return found
+
+    def seen_domains(self, domains: Iterable[str]) -> Set[str]:
+        """Canonical domains a previous run already produced."""
+        return self._existing("SELECT domain FROM companies WHERE domain IN ({})", domains)
+
+    def seen_leads(self, keys: Iterable[str]) -> Set[str]:
+        """lead_keys already stored."""
+        return self._existing("SELECT lead_key FROM leads WHERE lead_key IN ({})", keys)
+
+    def seen_emails(self, email_keys: Iterable[str]) -> Set[str]:
+        return self._existing("SELECT email_key FROM leads WHERE email_key IN ({})", email_keys)
+
+    def seen_profiles(self, profile_keys: Iterable[str]) -> Set[str]:
+        return self._existing("SELECT profile_key FROM leads WHERE profile_key IN ({})", profile_keys)
+
+    def suppressed(self, kind: str, values: Iterable[str]) -> Set[str]:
+        """Values (already normalized) on the suppression list for `kind`."""
+        return self._existing("SELECT value FROM suppression WHERE kind = ? AND value IN ({})", values, (kind,))
+
+    # --- filters (run before paid calls / before export) --------------------
+
+    def filter_companies(
+        self, companies: pd.DataFrame, skip_seen: bool = False, keep: Iterable[str] = ()
+    ) -> pd.DataFrame:
+        """
+        companies without suppressed domains and, with skip_seen, without domains an
+        earlier run produced (domains in `keep` are exempt from skip_seen, not from
+        suppression).
+        """
+        if companies.empty:
+            return companies
+        keys = company_keys(companies)
+        key_list = keys.tolist()
+        drop = self.suppressed("domain", key_list)
+        if skip_seen:
+            exempt = set(company_keys(pd.DataFrame({"domain": list(keep)}))) if keep else set()
+            drop |= self.seen_domains(key_list) - exempt
+        if not drop:
+            return companies
+        return companies[~keys.isin(drop).to_numpy()].reset_index(drop=True)
+
+    def filter_leads(self, leads: pd.DataFrame, skip_seen: bool = False) -> pd.DataFrame:
+        """leads without suppressed domains/emails/profiles and, with skip_seen, without people already stored."""
+        if leads.empty:
+            return leads
+        emails = _keys(normalize_email, _column(leads, "email"))
+        profiles = _keys(normalize_profile, _column(leads, "li_profile"))
+        domains = company_keys(leads.rename(columns={"company_domain": "domain"}))
+
+        drop = domains.isin(self.suppressed("domain", domains.tolist())).to_numpy()
+        bad_emails = self.suppressed("email", emails)
+        bad_profiles = self.suppressed("li_profile", profiles)
+        if skip_seen:
+            keys = pd.Series(lead_keys(domains.tolist(), _column(leads, "full_name"), emails, profiles))
+            drop |= keys.isin(self.seen_leads(keys.tolist())).to_numpy()
+            bad_emails |= self.seen_emails(emails)
+            bad_profiles |= self.seen_profiles(profiles)
+        if bad_emails or bad_profiles:
+            drop |= pd.Series(emails).isin(bad_emails).to_numpy() | pd.Series(profiles).isin(bad_profiles).to_numpy()
+        if not drop.any():
+            return leads
+        return leads[~drop].reset_index(drop=True)
+
+    # --- writes --------------------------------------------------------------
+
+    def suppress(self, kind: str, values: Iterable[str], reason: str = "") -> int:
+        """Add values to the suppression list (normalized like the lookups). Returns the number given."""
+        if kind not in SUPPRESSION_KINDS:
+            raise ValueError(f"Unknown suppression kind: {kind} (expected one of {SUPPRESSION_KINDS})")
+        values = list(values)
+        if kind == "domain":
+            keys = company_keys(pd.DataFrame({"domain": values})).tolist()
+        else:
+            keys = _keys(normalize_email if kind == "email" else normalize_profile, values)
+        now = time.time()
+        rows = [(kind, k, reason, now) for k in dict.fromkeys(keys) if k]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO suppression VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+        return len(rows)
+
+    def ingest(self, companies: pd.DataFrame, leads: pd.DataFrame, run_id: str = "") -> Dict[str, int]:
+        """Upsert a run's companies and leads in one transaction; existing rows get last_run/last_seen."""
+        now = time.time()
+        company_rows = list(zip(
+            company_keys(companies).tolist() if not companies.empty else [],
+            _column(companies, "company_name"), _column(companies, "country"), _column(companies, "vertical"),
+            _column(companies, "zoominfo_company_id"), _column(companies, "sf_account_id"),
+        ))
+        company_rows = [(*r, run_id, run_id, now, now) for r in company_rows if r[0]]
+
+        lead_rows = []
+        if not leads.empty:
+            domains = company_keys(leads.rename(columns={"company_domain": "domain"})).tolist()
+            names = _column(leads, "full_name")
+            emails, profiles = _column(leads, "email"), _column(leads, "li_profile")
+            email_keys, profile_keys = _keys(normalize_email, emails), _keys(normalize_profile, profiles)
+            keys = lead_keys(domains, names, email_keys, profile_keys)
+            for k, d, n, t, e, p, s, c, ek, pk in zip(
+                keys, domains, names, _column(leads, "title"), emails, profiles, _column(leads, "source"),
+                _column(leads, "confidence"), email_keys, profile_keys,
+            ):
+                lead_rows.append((k, d, n, t, e, p, s, c, ek, pk, run_id, run_id, now, now))
+
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO companies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(domain) DO UPDATE SET last_run = excluded.last_run, last_seen = excluded.last_seen,"
+                " zoominfo_company_id = coalesce(excluded.zoominfo_company_id, zoominfo_company_id),"
+                " sf_account_id = coalesce(excluded.sf_account_id, sf_account_id)",
+                company_rows,
+            )
+            self._db.executemany(
+                "INSERT INTO leads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(lead_key) DO UPDATE SET last_run = excluded.last_run, last_seen = excluded.last_seen,"
+                " email = CASE WHEN coalesce(email, '') = '' THEN excluded.email ELSE email END,"
+                " email_key = CASE WHEN coalesce(email, '') = '' THEN excluded.email_key ELSE email_key END,"
+                " li_profile = CASE WHEN coalesce(li_profile, '') = '' THEN excluded.li_profile ELSE li_profile END,"
+                " profile_key = CASE WHEN coalesce(profile_key, '') = '' THEN excluded.profile_key ELSE profile_key END,"
+                " confidence = max(confidence, excluded.confidence)",
+                lead_rows,
+            )
+            self._db.commit()
+        return {"companies": len(company_rows), "leads": len(lead_rows)}
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("companies", "leads", "suppression")
+            }
@@ -0,0 +1,63 @@
+# app/utils/prefetch.py
+"""
+Read-ahead for paged sources: a background thread pulls the next page(s) from an
+iterator while the consumer is still working on the current one, so fetch latency
+overlaps with downstream work (normalize, dedupe, enrichment of the page before).
+"""
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetched(items: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    The items of `items`, with up to `depth` of them fetched ahead in a background
+    thread (depth 0: plain iteration). Errors from the source are raised at the item
+    where they happened; closing the iterator early stops the reader thread.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failed(e))
+
+    reader = threading.Thread(target=read, name="prefetch", daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        stop.set()  # the reader exits after the fetch it is in
@@ -0,0 +1,83 @@
+# app/utils/ratelimit.py
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `rate` acquisitions per second on average,
+    with bursts of up to `burst` calls. rate=None disables limiting.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate or 1)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last call (call with the lock held)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _take(self) -> float:
+        """Take a token if one is available (call with the lock held); returns the wait for the next one."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def lower(self, rate: float):
+        """Slow the bucket down to `rate` (and its burst to match); tokens already earned are kept up to it."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.capacity = min(self.capacity, float(max(1, int(rate))))
+            self._tokens = min(self._tokens, self.capacity)
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """Non-blocking acquire: False if the bucket is empty right now."""
+        if not self.rate:
+            return True
+        with self._lock:
+            return not self._take()
+
+
+_shared: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(name: str, rate: Optional[float]) -> RateLimiter:
+    """
+    Process-wide limiter for one vendor quota: every run in the process that names the
+    same provider draws from one bucket, so concurrent runs (batch jobs, app sessions)
+    together stay within the rate. A run asking for another rate than the bucket has
+    gets the bucket at the lower of the two (the quota is the provider's, not the run's).
+    rate=None: a no-op limiter.
+    """
+    if not rate:
+        return RateLimiter(None)
+    with _shared_lock:
+        limiter = _shared.get(name)
+        if limiter is None:
+            limiter = _shared[name] = RateLimiter(rate)
+        elif rate < limiter.rate:
+            print(f"[WARN] {name} rate limit lowered from {limiter.rate}/s to {rate}/s for every run in this process")
+            limiter.lower(rate)
+        elif rate > limiter.rate:
+            print(f"[WARN] {name} rate limit {rate}/s ignored: the shared bucket allows {limiter.rate}/s")
+        return limiter
@@ -0,0 +1,150 @@
+# app/utils/result_view.py
+"""
+Server-side paging, filtering and sorting of result frames for the Streamlit tables.
+
+A ResultView is built once per result frame. Filter columns are factorized up front
+(codes + distinct values); a filter is evaluated on the distinct values (a few
+hundred titles, not 100k rows) and turned into a lookup table, so a row mask costs
+one gather over the codes. Sort orders are computed once per column and direction.
+Recent selections (row positions per filters + sort) are kept, so paging only
+slices. Only the rows of the current page are ever materialized for display.
+"""
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+LEAD_VIEW_COLUMNS = ["company_domain", "full_name", "title", "email", "li_profile", "source", "lead_score"]
+
+
+def _factorize(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """(codes, distinct values); missing values get code -1."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories.to_numpy(dtype=object)
+    codes, uniques = pd.factorize(values)
+    return codes, np.asarray(uniques, dtype=object)
+
+
+class ResultView:
+    """
+    Paged view of `frame` showing `columns`. choices: columns filtered by a set of
+    values; text: columns filtered by a case-insensitive substring. extra: filter-only
+    columns aligned with frame (e.g. each lead's company country).
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        columns: Optional[Sequence[str]] = None,
+        choices: Iterable[str] = (),
+        text: Iterable[str] = (),
+        extra: Optional[Dict[str, pd.Series]] = None,
+        max_selections: int = 8,
+    ):
+        self.frame = frame
+        self.columns = [c for c in (columns or frame.columns) if c in frame.columns]
+        self.max_selections = max_selections
+        self.stats = Counter()
+
+        sources = {c: frame[c] for c in (*choices, *text) if c in frame.columns}
+        sources.update(extra or {})
+        self.choices = [c for c in (*choices, *(extra or {})) if c in sources and c not in text]
+        self.text = [c for c in text if c in sources]
+        self._codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {c: _factorize(s) for c, s in sources.items()}
+        self._lower: Dict[str, np.ndarray] = {
+            c: np.char.lower(self._codes[c][1].astype(str)) for c in self.text
+        }
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._selections: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def options(self, column: str) -> List:
+        """Distinct values of a filter column, sorted."""
+        return sorted(v for v in self._codes[column][1] if pd.notna(v))
+
+    def _allowed(self, column: str, value) -> Optional[np.ndarray]:
+        """Lookup table code -> kept (index -1, missing values, is the last slot), or None for no filter."""
+        uniques = self._codes[column][1]
+        if column in self._lower:
+            needle = str(value or "").strip().lower()
+            if not needle:
+                return None
+            hit = np.char.find(self._lower[column], needle) >= 0
+        else:
+            if not value:
+                return None
+            hit = pd.Index(uniques).isin(list(value))
+        return np.append(hit, False)
+
+    def _order(self, column: str, ascending: bool) -> np.ndarray:
+        key = (column, ascending)
+        if key not in self._orders:
+            # ranks of the distinct values, sorted once; missing values go last either way
+            ranks, uniques = pd.factorize(self.frame[column], sort=True)
+            sort_key = np.where(ranks < 0, len(uniques), ranks) if ascending else np.where(ranks < 0, 1, -ranks)
+            self._orders[key] = np.argsort(sort_key, kind="stable")
+        return self._orders[key]
+
+    def select(self, filters: Optional[Dict] = None, sort_by: Optional[str] = None, ascending: bool = True) -> np.ndarray:
+        """Row positions matching `filters` ({column: values or substring}), in display order."""
+        filters = {c: v for c, v in (filters or {}).items() if c in self._codes}
+        key = (
+            tuple(sorted((c, v if isinstance(v, str) else tuple(sorted(map(str, v)))) for c, v in filters.items())),
+            sort_by, ascending,
+        )
+        if key in self._selections:
+            self._selections.move_to_end(key)
+            self.stats["selection_hits"] += 1
+            return self._selections[key]
+
+        mask = None
+        for column, value in filters.items():
+            allowed = self._allowed(column, value)
+            if allowed is None:
+                continue
+            rows = allowed[self._codes[column][0]]
+            mask = rows if mask is None else mask & rows
+        if sort_by:
+            order = self._order(sort_by, ascending)
+            rows = order if mask is None else order[mask[order]]
+        else:
+            rows = np.arange(len(self.frame)) if mask is None else np.flatnonzero(mask)
+
+        self.stats["selection_misses"] += 1
+        self._selections[key] = rows
+        while len(self._selections) > self.max_selections:
+            self._selections.popitem(last=False)
+        return rows
+
+    def page(self, rows: np.ndarray, page: int = 0, page_size: int = 50) -> pd.DataFrame:
+        """The shown columns of rows[page * page_size:(page + 1) * page_size]."""
+        start = max(page, 0) * page_size
+        return self.frame.take(rows[start:start + page_size])[self.columns]
+
+
+def lead_view(leads: pd.DataFrame, companies: pd.DataFrame) -> ResultView:
+    """Leads with the table columns of the UI, filterable by company country, source and title."""
+    country = companies.drop_duplicates("domain").set_index("domain")["country"]
+    return ResultView(
+        leads,
+        LEAD_VIEW_COLUMNS,
+        choices=("source",),
+        text=("title",),
+        extra={"country": leads["company_domain"].map(country)} if "company_domain" in leads.columns else None,
+    )
+
+
+def company_view(companies: pd.DataFrame) -> ResultView:
+    return ResultView(companies, choices=("country", "vertical", "status"))
+
+
+def to_arrow(page: pd.DataFrame):
+    """The page as a pyarrow Table (what st.dataframe ships to the browser), or the frame without pyarrow."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return page
+    return pa.Table.from_pandas(page, preserve_index=False)
@@ -1,22 +1,122 @@
 # app/utils/sales_navigator_csv.py
+import io
 import os
+from typing import Dict, List
 import pandas as pd
 
 REQUIRED_COLUMNS = ['Company Name','Company Website','Company LinkedIn URL','Country']
 
-def accounts_csv(companies_df: pd.DataFrame, path: str):
-    # ensure parent directory exists
-    parent = os.path.dirname(path)
-    if parent:
-        os.makedirs(parent, exist_ok=True)
-
-    rows = []
-    for _, c in companies_df.iterrows():
-        rows.append({
-            'Company Name': c.get('company_name') or c['domain'],
-            'Company Website': c.get('company_url') or f"https://{c['domain']}",   # prefer company_url if present
-            'Company LinkedIn URL': c.get('li_company_url') or '',
-            'Country': c.get('hq_country') or c.get('country') or ''               # prefer HQ country
-        })
-    pd.DataFrame(rows, columns=REQUIRED_COLUMNS).to_csv(path, index=False)
+# Sales Navigator accepts at most this many accounts per CSV upload
+SN_UPLOAD_ROW_LIMIT = 10_000
+
+
+def _first_present(df: pd.DataFrame, columns: List[str], default: pd.Series) -> pd.Series:
+    """Per row, the first of `columns` that is neither missing nor empty, else default."""
+    out = default.astype(object)
+    for col in reversed(columns):
+        if col in df.columns:
+            values = df[col].astype(object)
+            out = values.where(values.notna() & values.ne(''), out)
+    return out
+
+
+def accounts_frame(companies_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sales Navigator account rows for companies_df, built column-wise:
+      Company Name         company_name, else domain
+      Company Website      company_url, else https://<domain>
+      Company LinkedIn URL li_company_url, else ''
+      Country              hq_country, else country, else ''
+    """
+    domain = companies_df['domain'].astype(object).fillna('') if 'domain' in companies_df.columns \
+        else pd.Series('', index=companies_df.index, dtype=object)
+    blank = pd.Series('', index=companies_df.index, dtype=object)
+    return pd.DataFrame({
+        'Company Name': _first_present(companies_df, ['company_name'], domain),
+        'Company Website': _first_present(companies_df, ['company_url'], 'https://' + domain),
+        'Company LinkedIn URL': _first_present(companies_df, ['li_company_url'], blank),
+        'Country': _first_present(companies_df, ['hq_country', 'country'], blank),
+    }, columns=REQUIRED_COLUMNS).reset_index(drop=True)
+
+
+def part_path(path: str, part: int) -> str:
+    """File name of the part-th upload file: path itself, then <stem>_part2<ext>, ..."""
+    if part == 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_part{part}{ext}"
+
+
+class AccountsCsvWriter:
+    """
+    Streams account rows to path, starting a new file (with header) every max_rows rows
+    so each file can be uploaded as is. append=True continues existing files instead of
+    replacing them.
+    """
+
+    def __init__(self, path: str, max_rows: int = SN_UPLOAD_ROW_LIMIT, append: bool = False):
+        self.path = path
+        self.max_rows = max_rows
+        self.paths: List[str] = []
+        self.rows = 0
+        self._part_rows = 0
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        part = 1
+        while os.path.exists(part_path(path, part)):
+            if append:
+                self.paths.append(part_path(path, part))
+            else:
+                os.remove(part_path(path, part))
+            part += 1
+        if self.paths:
+            with open(self.paths[-1], encoding='utf-8') as f:
+                self._part_rows = max(sum(1 for _ in f) - 1, 0)
+
+    def _next_part(self):
+        path = part_path(self.path, len(self.paths) + 1)
+        pd.DataFrame(columns=REQUIRED_COLUMNS).to_csv(path, index=False)
+        self.paths.append(path)
+        self._part_rows = 0
+
+    def append(self, companies_df: pd.DataFrame):
+        frame = accounts_frame(companies_df)
+        if not self.paths:
+            self._next_part()
+        start = 0
+        while start < len(frame):
+            if self._part_rows >= self.max_rows:
+                self._next_part()
+            take = min(self.max_rows - self._part_rows, len(frame) - start)
+            frame.iloc[start:start + take].to_csv(self.paths[-1], mode='a', header=False, index=False)
+            start += take
+            self._part_rows += take
+            self.rows += take
+
+
+def accounts_csv(companies_df: pd.DataFrame, path, append: bool = False, max_rows: int = SN_UPLOAD_ROW_LIMIT):
+    """
+    Write the Sales Navigator upload CSV. Files are split at max_rows (see AccountsCsvWriter);
+    append=True adds rows below existing files. path may also be a writable text buffer
+    (in-memory exports), which is never split.
+    """
+    if not isinstance(path, str):
+        accounts_frame(companies_df).to_csv(path, header=not append, index=False)
+        return path
+    AccountsCsvWriter(path, max_rows=max_rows, append=append).append(companies_df)
     return path
+
+
+def accounts_csv_bytes(
+    companies_df: pd.DataFrame, file_name: str = 'sn_accounts_upload.csv', max_rows: int = SN_UPLOAD_ROW_LIMIT
+) -> Dict[str, bytes]:
+    """In-memory upload files: file name (split like AccountsCsvWriter) -> CSV bytes."""
+    frame = accounts_frame(companies_df)
+    files = {}
+    for part, start in enumerate(range(0, max(len(frame), 1), max_rows), start=1):
+        bio = io.StringIO()
+        frame.iloc[start:start + max_rows].to_csv(bio, index=False)
+        files[part_path(file_name, part)] = bio.getvalue().encode('utf-8')
+    return files
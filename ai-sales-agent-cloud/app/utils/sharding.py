@@ -0,0 +1,132 @@
+# app/utils/sharding.py
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from app.connectors import zoominfo as zi
+from app.schema import as_companies, concat_leads
+from app.utils.cache import EnrichmentCache, active_cache, uninstall_cache
+from app.utils.dedupe import FuzzyDeduper, variant_keys
+from app.utils.enrichment import DomainRandom, enrich_companies
+from app.utils.instrumentation import RunReport
+
+# Enrichment shards: one task per (country, vertical) present in the deduped frame
+SHARD_KEYS = ("country", "vertical")
+
+
+# The worker process's own handle on the run's connector cache (set by _init_worker)
+_worker_cache: Optional[EnrichmentCache] = None
+
+
+def _init_worker(cache_spec: Optional[Dict]):
+    global _worker_cache
+    # forked workers would otherwise all continue the parent's random stream
+    random.seed()
+    # never share the parent's SQLite connection across processes: open our own
+    uninstall_cache()
+    _worker_cache = EnrichmentCache(**cache_spec) if cache_spec is not None else None
+
+
+@contextmanager
+def shard_pool(processes: Optional[int], cache: Optional[EnrichmentCache] = None):
+    """
+    ProcessPoolExecutor for a sharded run, or None (run in-process) for processes <= 1.
+    Workers get their own handle on the run's connector cache (else the installed one), if any.
+    """
+    if not processes or processes <= 1:
+        yield None
+        return
+    active = cache if cache is not None else active_cache()
+    spec = None if active is None else {"path": active.path, "ttls": active.ttls}
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(spec,)) as pool:
+        yield pool
+
+
+def _dedupe_mask(domains: List[str], countries: List, names: List, brands: List, threshold: float) -> List[bool]:
+    deduper = FuzzyDeduper(threshold)
+    return [deduper.add(d, c, n, b) for d, c, n, b in zip(domains, countries, names, brands)]
+
+
+def sharded_dedupe(norm: pd.DataFrame, threshold: float, pool: ProcessPoolExecutor) -> pd.DataFrame:
+    """
+    fuzzy_dedupe(norm, threshold), computed one country per task. Exact, because the
+    deduper drops every repeat of a domain (the first occurrence wins, kept or not)
+    and only compares names (and brand variant keys) within one country: drop repeated
+    domains globally, then the countries are independent.
+    """
+    if norm.empty:
+        return norm.reset_index(drop=True)
+    candidates = norm[~norm["domain"].duplicated().to_numpy()].reset_index(drop=True)
+    domains = candidates["domain"].to_numpy(dtype=object)
+    countries = candidates["country"].to_numpy(dtype=object)
+    names = (candidates["company_name"].to_numpy(dtype=object) if "company_name" in candidates.columns
+             else np.full(len(candidates), "", dtype=object))
+    brands = np.asarray(variant_keys(candidates), dtype=object)
+
+    groups = candidates.groupby("country", sort=False, dropna=False, observed=True).indices
+    futures = [
+        (pos, pool.submit(_dedupe_mask, domains[pos].tolist(), countries[pos].tolist(), names[pos].tolist(),
+                           brands[pos].tolist(), threshold))
+        for pos in groups.values()
+    ]
+    keep = np.zeros(len(candidates), dtype=bool)
+    for pos, future in futures:
+        keep[pos] = future.result()
+    return candidates[keep].reset_index(drop=True)
+
+
+def _enrich_shard(
+    shard: pd.DataFrame, params: Dict, randoms: Optional[DomainRandom]
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
+    report = RunReport()
+    connector = zi.for_run(params)
+    connector = _worker_cache.connector(connector) if _worker_cache is not None else connector
+    companies, leads_df = enrich_companies(shard, params, connector=report.connector(connector, "zoominfo"),
+                                           randoms=randoms)
+    return companies, leads_df, report.connectors
+
+
+def sharded_enrich(
+    deduped: pd.DataFrame,
+    params: Dict,
+    pool: ProcessPoolExecutor,
+    report: Optional[RunReport] = None,
+    randoms: Optional[DomainRandom] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    enrich_companies over (country, vertical) shards in the pool, merged back into the
+    order of `deduped` (leads: by company, then in the order the connector returned them).
+    Seeded runs match the in-process result, since every domain draws from its own rng
+    (randoms, e.g. the run's MiniModeStream, travels to the workers).
+    Connector stats of the workers are folded into `report`.
+    params["zoominfo_rate_limit"] stays the quota of the whole run: up to
+    params["processes"] shards run at once, each limited to its share of the rate.
+    """
+    workers = max(1, int(params.get("processes") or 1))
+    if params.get("zoominfo_rate_limit") and workers > 1:
+        params = {**params, "zoominfo_rate_limit": params["zoominfo_rate_limit"] / workers}
+    keys = [k for k in SHARD_KEYS if k in deduped.columns]
+    if deduped.empty or not keys:
+        groups = {None: np.arange(len(deduped))}
+    else:
+        groups = deduped.groupby(keys, sort=False, dropna=False, observed=True).indices
+    futures = [(pos, pool.submit(_enrich_shard, deduped.iloc[pos], params, randoms)) for pos in groups.values()]
+
+    company_parts, lead_parts = [], []
+    for pos, future in futures:
+        companies, leads_df, stats = future.result()
+        company_parts.append(companies.set_axis(pos))
+        lead_parts.append(leads_df)
+        if report is not None:
+            report.merge_connectors(stats)
+
+    companies = as_companies(pd.concat(company_parts).sort_index().reset_index(drop=True))
+    leads_df = concat_leads(lead_parts)
+    if not leads_df.empty:
+        position = pd.Series(np.arange(len(deduped)), index=deduped["domain"].to_numpy())
+        order = np.argsort(leads_df["company_domain"].astype(object).map(position).to_numpy(), kind="stable")
+        leads_df = leads_df.iloc[order].reset_index(drop=True)
+    return companies, leads_df
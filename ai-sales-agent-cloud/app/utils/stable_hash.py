@@ -0,0 +1,70 @@
+# app/utils/stable_hash.py
+"""
+Process-independent hashing for mock IDs, email patterns and profile slugs.
+
+Python's built-in hash() is salted per process (PYTHONHASHSEED), so it yields different
+values in every worker and after every restart. These helpers use a 64-bit blake2b
+digest of the parts joined with "|" instead: same input, same value, everywhere.
+The column variants (stable_hashes, slug_suffixes, stable_ids) are conveniences for
+frames: they give exactly the scalar results, so they still compute one blake2b digest
+per row (in a list comprehension); only the key joining and hex formatting work on
+whole columns. They are not vectorized and are not meaningfully faster than calling
+the scalar helpers in a loop.
+"""
+from hashlib import blake2b
+from typing import Iterable, List, Union
+import numpy as np
+import pandas as pd
+
+DIGEST_SIZE = 8  # bytes → 64-bit hashes / 16 hex digit IDs
+
+Column = Union[pd.Series, Iterable]
+
+
+def _digest(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=DIGEST_SIZE).digest(), "little")
+
+
+def stable_hash(*parts) -> int:
+    """64-bit unsigned hash of the parts (joined with '|')."""
+    return _digest("|".join(map(str, parts)))
+
+
+def stable_id(prefix: str, *parts) -> str:
+    """Wide ID: prefix + 16 hex digits of stable_hash(*parts), e.g. ZC_3f9a0c1d2e4b5a67."""
+    return f"{prefix}{stable_hash(*parts):016x}"
+
+
+def _keys(columns) -> pd.Series:
+    cols = [pd.Series(c, dtype=object).reset_index(drop=True).astype(str) for c in columns]
+    keys = cols[0]
+    for c in cols[1:]:
+        keys = keys + "|" + c
+    return keys
+
+
+def stable_hashes(*columns: Column) -> np.ndarray:
+    """stable_hash row-wise over equally long columns, as a uint64 array (one digest per row)."""
+    digests = b"".join([blake2b(k.encode("utf-8"), digest_size=DIGEST_SIZE).digest() for k in _keys(columns).tolist()])
+    return np.frombuffer(digests, dtype="<u8").astype(np.uint64)
+
+
+def _hex(hashes: np.ndarray, digits: int = 16) -> List[str]:
+    """Leading `digits` hex digits of each hash, as f"{h:016x}" would print it."""
+    text = hashes.astype(">u8").tobytes().hex()
+    return [text[i:i + digits] for i in range(0, len(text), 16)]
+
+
+def slug_suffix(*parts) -> str:
+    """8 hex digits (top 32 bits of stable_hash), e.g. for LinkedIn-style profile slugs."""
+    return f"{stable_hash(*parts) >> 32:08x}"
+
+
+def slug_suffixes(*columns: Column) -> pd.Series:
+    """slug_suffix row-wise over equally long columns (per-row digests, see stable_hashes)."""
+    return pd.Series(_hex(stable_hashes(*columns), 8), dtype=object)
+
+
+def stable_ids(prefix: str, *columns: Column) -> pd.Series:
+    """stable_id row-wise over equally long columns (per-row digests, see stable_hashes)."""
+    return prefix + pd.Series(_hex(stable_hashes(*columns)), dtype=object)
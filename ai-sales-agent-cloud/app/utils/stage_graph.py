@@ -0,0 +1,166 @@
+# app/utils/stage_graph.py
+"""
+Memoized pipeline stages for incremental re-runs (human-in-the-loop edits).
+
+Every memoized stage declares what it depends on: upstream stages plus the params /
+ui_decisions keys it reads. A stage's key hashes exactly those inputs (and the keys of
+its upstream stages), so editing ui_decisions["keep_domains"] or ["create_sf_accounts"]
+leaves the search and dedupe keys unchanged and their outputs are reused.
+
+Per-domain stages (enrichment, Sales Navigator) memoize one result per domain under
+the key of their params: a run only computes the domains that no earlier run with the
+same params computed, e.g. the newly kept ones. The keep_domains override and the
+Salesforce join are cheap and simply run again. Concurrent runs sharing one memo (a
+batch of overlapping territories) compute each domain once: a domain another run is
+computing right now is waited for, not fetched again.
+"""
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    deps: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+    ui: Tuple[str, ...] = ()
+    per_domain: bool = False
+
+
+_SEED_PARAMS = ("seed", "mini_mode")
+
+STAGE_GRAPH: Dict[str, StageSpec] = {
+    "search": StageSpec(params=(
+        "verticals", "countries", "min_monthly_visits", "synthetic_rows", "similarweb_api_url", *_SEED_PARAMS
+    )),
+    "dedupe": StageSpec(deps=("search",), params=("mini_mode",)),
+    "enrichment": StageSpec(
+        params=("titles_regex", "enable_zoominfo_email_enrichment", *_SEED_PARAMS), per_domain=True
+    ),
+    "sales_navigator": StageSpec(params=("titles_regex", *_SEED_PARAMS), per_domain=True),
+}
+
+
+def _copy(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    return value
+
+
+class StageMemo:
+    """
+    In-process memo of STAGE_GRAPH stage outputs, shared by consecutive runs (e.g. one
+    per Streamlit server). Whole-stage outputs are kept for the last max_entries keys,
+    per-domain tables for the last max_tables param keys. Callers get private copies of
+    memoized frames. Thread-safe; a stage is computed outside the lock.
+    """
+
+    def __init__(self, max_entries: int = 16, max_tables: int = 8):
+        self.max_entries = max_entries
+        self.max_tables = max_tables
+        self.stats = Counter()
+        self._outputs: "OrderedDict[str, Any]" = OrderedDict()
+        self._tables: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], threading.Event] = {}  # (key, domain) being computed
+        self._lock = threading.RLock()
+
+    def key(self, name: str, params: Dict, ui_decisions: Dict) -> str:
+        """Hash of the inputs `name` reads, including the keys of its upstream stages."""
+        spec = STAGE_GRAPH[name]
+        blob = json.dumps({
+            "stage": name,
+            "params": {p: params.get(p) for p in spec.params},
+            "ui": {u: ui_decisions.get(u) for u in spec.ui},
+            "deps": [self.key(d, params, ui_decisions) for d in spec.deps],
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+    def run(self, name: str, params: Dict, ui_decisions: Dict, compute: Callable[[], Any]):
+        """Memoized output of a whole stage."""
+        key = self.key(name, params, ui_decisions)
+        with self._lock:
+            if key in self._outputs:
+                self._outputs.move_to_end(key)
+                self.stats[f"{name}.hit"] += 1
+                return _copy(self._outputs[key])
+        value = compute()
+        with self._lock:
+            self.stats[f"{name}.miss"] += 1
+            self._outputs[key] = _copy(value)
+            while len(self._outputs) > self.max_entries:
+                self._outputs.popitem(last=False)
+        return value
+
+    def run_domains(
+        self, name: str, params: Dict, domains: Iterable[str], compute: Callable[[List[str]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Per-domain results for `domains`; compute(missing) is called once with the domains
+        no earlier run computed under the same params and must return a value for each.
+        Domains a concurrent call is computing are waited for (and computed here only if
+        that call fails).
+        """
+        key = self.key(name, params, {})
+        domains = list(dict.fromkeys(domains))
+        with self._lock:
+            table = self._tables.setdefault(key, {})
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+            missing = [d for d in domains if d not in table and (key, d) not in self._pending]
+            waiting = {d: self._pending[(key, d)] for d in domains if (key, d) in self._pending}
+            claimed = threading.Event()
+            self._pending.update(((key, d), claimed) for d in missing)
+        try:
+            if missing:
+                computed = compute(missing)
+                with self._lock:
+                    table.update(computed)
+        finally:
+            with self._lock:
+                for d in missing:
+                    self._pending.pop((key, d), None)
+            claimed.set()
+        for event in set(waiting.values()):
+            event.wait()
+        with self._lock:
+            failed = [d for d in waiting if d not in table]
+        if failed:
+            computed = compute(failed)
+            with self._lock:
+                table.update(computed)
+        with self._lock:
+            self.stats[f"{name}.rows_reused"] += len(domains) - len(missing) - len(failed)
+            self.stats[f"{name}.rows_computed"] += len(missing) + len(failed)
+            if waiting:
+                self.stats[f"{name}.rows_waited"] += len(waiting) - len(failed)
+            return {d: table[d] for d in domains}
+
+    def clear(self):
+        with self._lock:
+            self._outputs.clear()
+            self._tables.clear()
+
+
+def rows_by_domain(frame: pd.DataFrame, domains: Iterable[str], columns: List[str],
+                   domain_column: str = "company_domain") -> Dict[str, List[tuple]]:
+    """Rows of `frame` (as tuples of `columns`) per domain; every domain in `domains` gets a list."""
+    out: Dict[str, List[tuple]] = {d: [] for d in domains}
+    if frame is None or frame.empty:
+        return out
+    values = [frame[c].astype(object).where(frame[c].notna(), None).tolist() for c in columns]
+    for domain, row in zip(frame[domain_column].astype(object).tolist(), zip(*values)):
+        out.setdefault(domain, []).append(row)
+    return out
+
+
+def frame_from_rows(domains: Iterable[str], rows: Dict[str, List[tuple]], columns: List[str]) -> pd.DataFrame:
+    """The rows of each domain, in the order of `domains`, as one frame."""
+    return pd.DataFrame([r for d in domains for r in rows.get(d, ())], columns=columns)
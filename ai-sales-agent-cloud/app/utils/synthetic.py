@@ -0,0 +1,231 @@
+# app/utils/synthetic.py
+"""
+Deterministic, NumPy-vectorized synthetic data at production scale.
+
+The connector mocks know a handful of sample names, so on their own they never produce
+more than a few dozen companies. SyntheticGenerator emits millions of Similarweb-shaped
+company rows (unique brand names, near-duplicate variants for dedupe) and ZoomInfo /
+Sales Navigator-shaped personas. Same seed and arguments, same rows.
+
+It sits behind the existing connector: similarweb.search_companies(..., size=N) (or
+params["synthetic_rows"] in run_pipeline) returns generated rows.
+"""
+import itertools
+from typing import Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from app.connectors import sales_navigator as sn
+from app.connectors import similarweb as sw
+from app.connectors import zoominfo as zi
+
+SYLLABLES = np.array([c + v for c in "bcdfghklmnprstvz" for v in "aeiou"])  # 80 → 80**k brand names
+MIN_SYLLABLES = 3
+# Multiplier scrambling ids over the name space (odd, not a multiple of 5: coprime to 80**k)
+_SCRAMBLE = 1_000_003
+# splitmix64 increment / seed spread of SyntheticGenerator._uniform
+_GOLDEN = 0x9E3779B97F4A7C15
+_SALTS = 1_000_033
+
+# Near-duplicate variants injected for dedupe (share of generated rows, then kind)
+VARIANT_RATE = 0.05
+VARIANT_KINDS = ("tld", "www", "url", "plural")
+
+COMPANY_COLUMNS = sw.SEARCH_COLUMNS
+
+
+def _syllables_for(n: int) -> int:
+    k = MIN_SYLLABLES
+    while len(SYLLABLES) ** k < n:
+        k += 1
+    return k
+
+
+def _options(values: Sequence[str], default: str) -> np.ndarray:
+    return np.asarray(list(values) or [default], dtype=str)
+
+
+def _tlds(country: np.ndarray) -> np.ndarray:
+    return np.asarray([sw.COUNTRY_DOMAINS.get(c, ".com") for c in country.tolist()], dtype=str)
+
+
+def _join(*parts) -> np.ndarray:
+    """Element-wise string concatenation of arrays / scalars."""
+    out = np.asarray(parts[0], dtype=str)
+    for part in parts[1:]:
+        out = np.char.add(out, np.asarray(part, dtype=str))
+    return out
+
+
+class SyntheticGenerator:
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def _rng(self, *salt: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, *salt])
+
+    def _uniform(self, ids: np.ndarray, salt: int) -> np.ndarray:
+        """One uniform [0, 1) draw per id (splitmix64 of seed, salt and id): any id range, same values."""
+        with np.errstate(over="ignore"):
+            x = np.asarray(ids, dtype=np.uint64) * np.uint64(_GOLDEN)
+            x += np.uint64((self.seed * _SALTS + salt) % 2 ** 64)
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            x ^= x >> np.uint64(31)
+        return (x >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+    def _pick(self, ids: np.ndarray, salt: int, options: np.ndarray) -> np.ndarray:
+        return options[(self._uniform(ids, salt) * len(options)).astype(np.int64)]
+
+    def brands(self, ids: np.ndarray, total: int) -> np.ndarray:
+        """Unique lower-case brand names for ids in [0, total): scrambled base-80 syllable digits."""
+        k = _syllables_for(total)
+        space = len(SYLLABLES) ** k
+        code = (np.asarray(ids, dtype=np.int64) * _SCRAMBLE + self.seed) % space
+        digits = [SYLLABLES[(code // len(SYLLABLES) ** j) % len(SYLLABLES)] for j in range(k)]
+        return _join(*digits)
+
+    def _base(self, ids: np.ndarray, total: int, verticals, countries, min_visits: int) -> pd.DataFrame:
+        """The unique company rows of `ids`."""
+        brand = self.brands(ids, total)
+        country = self._pick(ids, 1, countries)
+        domain = _join(brand, _tlds(country))
+        # Mock HQ logic as in similarweb: 70% same country, else any selected country
+        hq = np.where(self._uniform(ids, 2) < 0.7, country, self._pick(ids, 3, countries))
+        top = max(min_visits + 50_000, min_visits * 3)
+        visits = min_visits + (self._uniform(ids, 4) * (top - min_visits + 1)).astype(np.int64)
+        return pd.DataFrame({
+            "domain": domain.astype(object),
+            "company_name": np.char.capitalize(brand).astype(object),
+            "country": country.astype(object),
+            "hq_country": hq.astype(object),
+            "vertical": self._pick(ids, 5, verticals).astype(object),
+            "sw_visits": visits,
+            "company_url": _join("https://", domain).astype(object),
+        })
+
+    def _variants(self, ids: np.ndarray, total: int, verticals, countries, min_visits: int,
+                  variant_rate: float) -> pd.DataFrame:
+        """Near-duplicates (other TLD, www., full URL, plural name) of the ~variant_rate of `ids` drawn for one."""
+        ids = ids[self._uniform(ids, 6) < variant_rate]
+        variants = self._base(ids, total, verticals, countries, min_visits)
+        kind = (self._uniform(ids, 7) * len(VARIANT_KINDS)).astype(np.int64)
+        brand, domain = self.brands(ids, total), variants["domain"].to_numpy(dtype=str)
+        tld = _tlds(variants["country"].to_numpy(dtype=str))
+        variant_domain = np.select(
+            [kind == 0, kind == 1, kind == 2],
+            [_join(brand, np.where(tld == ".io", ".com", ".io")), _join("www.", domain),
+             _join("https://", domain, "/")],
+            default=_join(brand, "s", tld),
+        )
+        variants["domain"] = variant_domain.astype(object)
+        plural = kind == 3
+        variants.loc[plural, "company_name"] = variants.loc[plural, "company_name"] + "s"
+        return variants
+
+    def companies(
+        self,
+        n: int,
+        verticals: Sequence[str] = tuple(sw.VERTICAL_SAMPLES),
+        countries: Sequence[str] = tuple(sw.COUNTRY_DOMAINS),
+        min_visits: int = 50_000,
+        variant_rate: float = VARIANT_RATE,
+        start: int = 0,
+        total: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Rows start..start+n of a territory of `total` (default n) unique companies in the
+        shape of similarweb.search_companies, plus ~variant_rate near-duplicates of them
+        (other TLD, www., full URL, plural name) appended at the end. Every row is drawn
+        from its own id, so a company looks the same in any slice of the territory.
+        """
+        total = total or start + n
+        args = (total, _options(verticals, "SaaS"), _options(countries, "US"), min_visits)
+        ids = np.arange(start, start + n)
+        return pd.concat([self._base(ids, *args), self._variants(ids, *args, variant_rate)], ignore_index=True)
+
+    def iter_companies(self, n: int, chunk_size: int = 100_000, **kwargs) -> Iterator[pd.DataFrame]:
+        """companies() for a territory of n, in chunks (for run_pipeline_streaming raw_chunks)."""
+        for start in range(0, n, chunk_size):
+            yield self.companies(min(chunk_size, n - start), start=start, total=n, **kwargs)
+
+    def company_pages(
+        self,
+        n: int,
+        page_size: int,
+        verticals: Sequence[str] = tuple(sw.VERTICAL_SAMPLES),
+        countries: Sequence[str] = tuple(sw.COUNTRY_DOMAINS),
+        min_visits: int = 50_000,
+        variant_rate: float = VARIANT_RATE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        companies(n) in pages of page_size rows (the last one shorter), generated as they
+        are consumed: at most two pages of rows in memory at a time.
+        """
+        args = (n, _options(verticals, "SaaS"), _options(countries, "US"), min_visits)
+        blocks = range(0, n, page_size)
+        parts = itertools.chain(
+            (self._base(np.arange(i, min(i + page_size, n)), *args) for i in blocks),
+            (self._variants(np.arange(i, min(i + page_size, n)), *args, variant_rate) for i in blocks),
+        )
+        pending = None
+        for part in parts:
+            pending = part if pending is None else pd.concat([pending, part], ignore_index=True)
+            while len(pending) >= page_size:
+                yield pending.iloc[:page_size].reset_index(drop=True)
+                pending = pending.iloc[page_size:].reset_index(drop=True)
+        if pending is not None and len(pending):
+            yield pending
+
+    def personas(
+        self,
+        domains: Sequence[str],
+        source: str = "zoominfo",
+        per_company: Tuple[int, int] = (0, 3),
+        enable_email_enrichment: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Personas for every domain (per_company = inclusive min/max count) in the shape of
+        the zoominfo / sales_navigator connectors: same name and title pools, emails
+        (ZoomInfo only) and profile slugs built like the connectors build them.
+        """
+        domains = np.asarray(list(domains), dtype=object)
+        if source == "sales_navigator":
+            firsts, lasts, titles = sn.SN_FIRST, sn.SN_LAST, sn.SN_TITLES
+        else:
+            firsts, lasts, titles = zi.FIRST_NAMES, zi.LAST_NAMES, zi.TITLES
+        rng = self._rng(1, len(domains), len(source))
+        counts = rng.integers(per_company[0], per_company[1] + 1, size=len(domains))
+        k = int(counts.sum())
+        if not k:
+            return pd.DataFrame(columns=zi.PERSONA_COLUMNS)
+
+        domain = pd.Series(np.repeat(domains, counts), dtype=object)
+        first = pd.Series(np.asarray(firsts, dtype=object)[rng.integers(len(firsts), size=k)])
+        last = pd.Series(np.asarray(lasts, dtype=object)[rng.integers(len(lasts), size=k)])
+        zoominfo = source != "sales_navigator"
+        # the connectors' own email / slug builders, so generated rows match theirs
+        return pd.DataFrame({
+            "company_domain": domain,
+            "full_name": first + " " + last,
+            "title": np.asarray(titles, dtype=object)[rng.integers(len(titles), size=k)],
+            "email": zi._emails_for(first, last, domain) if zoominfo and enable_email_enrichment else "",
+            "li_profile": "https://www.linkedin.com/in/" + zi._person_slugs(first, last, domain) + "/",
+            "source": source,
+            "confidence": rng.uniform(0.6, 0.95, size=k).round(2) if zoominfo else 0.6,
+        })
+
+
+def synthetic_search(
+    verticals: List[str], countries: List[str], min_visits: int, size: int, seed: Optional[int] = None
+) -> pd.DataFrame:
+    """similarweb.search_companies answer for a generated territory of `size` companies."""
+    return SyntheticGenerator(seed or 0).companies(size, verticals, countries, min_visits)
+
+
+def synthetic_search_pages(
+    verticals: List[str], countries: List[str], min_visits: int, size: int, page_size: int,
+    seed: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """synthetic_search in pages of page_size rows, generated lazily."""
+    return SyntheticGenerator(seed or 0).company_pages(size, page_size, verticals, countries, min_visits)
@@ -0,0 +1,118 @@
+# benchmarks/bench_app.py
+"""
+Streamlit page responsiveness, before vs. after result caching and deferred imports.
+
+  1) time to first paint: cold import cost of what the page loads before its first
+     element (each in a fresh interpreter)
+       legacy:   pandas + orchestrator + cache/export/instrumentation at module top
+       deferred: nothing beyond streamlit itself
+  2) rerun latency for identical inputs
+       legacy:   run_pipeline again (what the synchronous button did)
+       cached:   run_key + lookup of the finished PipelineJob
+  3) with streamlit installed: AppTest timings of the real page (first run, Run click,
+     identical re-click)
+
+    python benchmarks/bench_app.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+LEGACY_TOP_IMPORTS = (
+    "import pandas; "
+    "import app.agent_orchestrator_clean, app.utils.cache, app.utils.export, app.utils.instrumentation"
+)
+DEFERRED_TOP_IMPORTS = "pass"
+
+PARAMS = {
+    "verticals": ["SaaS", "Fintech"], "countries": ["DE", "AT", "CH"], "min_monthly_visits": 50_000,
+    "titles_regex": "(Head|VP|Director) (Marketing|Sales|Growth|Demand Gen)", "mini_mode": False,
+    "enable_zoominfo_email_enrichment": True, "use_sales_navigator_mock": True, "checkpoint": False,
+}
+UI = {"keep_domains": [], "create_sf_accounts": []}
+
+
+def cold_import(statement: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def rerun_latency(repeat: int):
+    from app.agent_orchestrator_clean import run_pipeline
+    from app.utils.jobs import PipelineJob, run_key
+
+    legacy = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run_pipeline(PARAMS, UI)
+        legacy.append(time.perf_counter() - t0)
+
+    jobs = {run_key(PARAMS, UI): PipelineJob(PARAMS, UI).start()}
+    next(iter(jobs.values())).wait()
+    cached = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        job = jobs[run_key(PARAMS, UI)]
+        assert job.done and job.result is not None
+        cached.append(time.perf_counter() - t0)
+    return statistics.median(legacy), statistics.median(cached)
+
+
+def app_test(repeat: int):
+    from streamlit.testing.v1 import AppTest
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        fn()
+        return time.perf_counter() - t0
+
+    at = AppTest.from_file(os.path.join(ROOT, "app", "streamlit_app.py"), default_timeout=120)
+    first = timed(at.run)
+    run_button = next(b for b in at.button if b.label == "Run pipeline")
+    click = timed(lambda: run_button.click().run())
+    reclicks = [timed(lambda: next(b for b in at.button if b.label == "Run pipeline").click().run())
+                for _ in range(repeat)]
+    return first, click, statistics.median(reclicks)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    baseline = cold_import("pass", args.repeat)
+    legacy = max(cold_import(LEGACY_TOP_IMPORTS, args.repeat) - baseline, 0.0)
+    deferred = max(cold_import(DEFERRED_TOP_IMPORTS, args.repeat) - baseline, 0.0)
+    print("time to first paint (app imports before the first element, excl. streamlit):")
+    print(f"  legacy top-level imports   {legacy * 1000:8.1f} ms")
+    print(f"  deferred imports           {deferred * 1000:8.1f} ms")
+
+    slow, fast = rerun_latency(args.repeat)
+    print("rerun with identical inputs:")
+    print(f"  legacy run_pipeline        {slow * 1000:8.1f} ms")
+    print(f"  cached PipelineJob lookup  {fast * 1000:8.3f} ms")
+
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("streamlit not installed: skipping AppTest page timings")
+        return
+    first, click, reclick = app_test(args.repeat)
+    print("AppTest page timings:")
+    print(f"  first run                  {first * 1000:8.1f} ms")
+    print(f"  Run pipeline (new inputs)  {click * 1000:8.1f} ms")
+    print(f"  Run pipeline (identical)   {reclick * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_batch.py
+"""
+Weekly refresh of --jobs overlapping territories (generated, --rows companies each,
+neighbouring jobs share countries) with a fixed latency per ZoomInfo call:
+
+  clicks        one run_pipeline per territory, one after the other, nothing shared
+                (what clicking through the Streamlit app does)
+  batch w=1     app/batch_runner.run_batch on one worker: shared StageMemo only
+  batch w=N     the same on --workers workers
+
+Reports wall time, companies/min and ZoomInfo calls, and checks that every job's
+outputs match the clicks run (row counts, sn_accounts_upload.csv).
+
+    python benchmarks/bench_batch.py --jobs 6 --rows 1000 --workers 4 --latency-ms 5
+"""
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import time
+import warnings
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agent_orchestrator_clean import run_pipeline
+from app.batch_runner import DEFAULT_PARAMS, BatchJob, run_batch
+from app.connectors import zoominfo as zi
+
+COUNTRIES = ["DE", "AT", "CH", "FR", "US"]
+VERTICALS = ["SaaS", "Ecommerce", "Fintech"]
+
+calls = Counter()
+
+
+def with_latency(fn, latency: float):
+    @functools.wraps(fn)
+    def slow(*args, **kwargs):
+        calls[fn.__name__] += 1
+        time.sleep(latency)
+        return fn(*args, **kwargs)
+    return slow
+
+
+def territories(n: int, rows: int, output_root: str):
+    jobs = []
+    for i in range(n):
+        params = {
+            **DEFAULT_PARAMS,
+            "verticals": [VERTICALS[i % len(VERTICALS)]],
+            "countries": [COUNTRIES[i % len(COUNTRIES)], COUNTRIES[(i + 1) % len(COUNTRIES)]],
+            "synthetic_rows": rows,
+            "seed": 7,
+        }
+        name = f"job-{i:02d}"
+        jobs.append(BatchJob(name, {**params, "output_dir": os.path.join(output_root, name)}))
+    return jobs
+
+
+def outputs(jobs, counts):
+    out = {}
+    for job in jobs:
+        with open(os.path.join(job.params["output_dir"], "sn_accounts_upload.csv"), "rb") as f:
+            out[job.name] = (counts[job.name], f.read())
+    return out
+
+
+def clicks(jobs):
+    counts = {}
+    for job in jobs:
+        companies, leads, needs = run_pipeline(job.params, job.ui_decisions)
+        counts[job.name] = (len(companies), len(leads), len(needs))
+    return counts
+
+
+def batch(jobs, workers):
+    summary = run_batch(jobs, workers)
+    return {r["name"]: (r["companies"], r["leads"], r["needs_salesnav"]) for r in summary["jobs"]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=6)
+    ap.add_argument("--rows", type=int, default=1000, help="companies per territory")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--latency-ms", type=float, default=5.0, help="per ZoomInfo call")
+    args = ap.parse_args()
+    warnings.filterwarnings("ignore")
+
+    zi.enrich_company = with_latency(zi.enrich_company, args.latency_ms / 1000)
+    zi.find_personas_batch = with_latency(zi.find_personas_batch, args.latency_ms / 1000)
+
+    modes = [("clicks", clicks), ("batch w=1", lambda jobs: batch(jobs, 1)),
+             (f"batch w={args.workers}", lambda jobs: batch(jobs, args.workers))]
+    expected = None
+    rows = []
+    for label, fn in modes:
+        jobs = territories(args.jobs, args.rows, tempfile.mkdtemp())
+        calls.clear()
+        t0 = time.perf_counter()
+        counts = fn(jobs)
+        seconds = time.perf_counter() - t0
+        got = outputs(jobs, counts)
+        if expected is None:
+            expected = got
+        assert got == expected, f"{label}: outputs differ from the clicks run"
+        companies = sum(c for c, _, _ in counts.values())
+        rows.append((label, seconds, companies / seconds * 60, sum(calls.values())))
+
+    print(f"\n{args.jobs} territories x {args.rows:,} companies, ZoomInfo latency {args.latency_ms} ms")
+    print(f"{'mode':<12} {'seconds':>8} {'companies/min':>14} {'zi_calls':>9}")
+    for label, seconds, per_min, zi_calls in rows:
+        print(f"{label:<12} {seconds:8.2f} {per_min:14,.0f} {zi_calls:>9,}")
+
+
+if __name__ == "__main__":
+    main()
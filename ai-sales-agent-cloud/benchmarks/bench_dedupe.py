@@ -0,0 +1,111 @@
+# benchmarks/bench_dedupe.py
+"""
+Blocked FuzzyDeduper vs. the old pairwise fuzzy_dedupe loop.
+
+Synthetic territories are grown from similarweb.search_companies rows (country,
+vertical, visits, HQ) with generated brand names; ~10% of rows are near-duplicate
+spellings of an earlier company in the same country.
+
+    python benchmarks/bench_dedupe.py --sizes 10000 50000 100000 --legacy-max 2000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors import similarweb as sw
+from app.utils.dedupe import _sim, fuzzy_dedupe, normalize
+
+
+def legacy_fuzzy_dedupe(df: pd.DataFrame, threshold: float = 0.92) -> pd.DataFrame:
+    """The pre-blocking implementation, kept here as the reference."""
+    df = df.drop_duplicates(subset=['domain']).reset_index(drop=True)
+    keep_idx = []
+    seen = set()
+    for i, row in df.iterrows():
+        if i in seen:
+            continue
+        keep_idx.append(i)
+        name_i = row.get('company_name', '') or ''
+        for j in range(i + 1, len(df)):
+            if j in seen:
+                continue
+            if row.get('country') != df.at[j, 'country']:
+                continue
+            name_j = df.at[j, 'company_name'] or ''
+            if _sim(name_i, name_j) >= threshold:
+                seen.add(j)
+    return df.loc[keep_idx].reset_index(drop=True)
+
+
+_SYLLABLES = [a + b for a in 'bcdfghklmnprstvz' for b in 'aeiou'] + ['ly', 'fy', 'hq', 'io', 'ex']
+
+
+def _mutate(name: str, rng: random.Random) -> str:
+    pos = rng.randrange(len(name))
+    op = rng.choice('sdi')
+    ch = rng.choice(string.ascii_lowercase)
+    if op == 's':
+        return name[:pos] + ch + name[pos + 1:]
+    if op == 'd':
+        return name[:pos] + name[pos + 1:]
+    return name[:pos] + ch + name[pos:]
+
+
+def synthetic_territory(n: int, seed: int = 7) -> pd.DataFrame:
+    random.seed(seed)
+    base = sw.search_companies(['SaaS', 'Ecommerce', 'Fintech'], ['DE', 'AT', 'CH', 'FR', 'US'], 50_000)
+    base = base.to_dict('records')
+    rng = random.Random(seed)
+    rows = []
+    for k in range(n):
+        r = dict(base[k % len(base)])
+        if rows and rng.random() < 0.1:
+            src = rows[rng.randrange(len(rows))]
+            name = _mutate(src['company_name'].lower(), rng)
+            r['country'] = src['country']
+        else:
+            name = ''.join(rng.choices(_SYLLABLES, k=rng.randint(3, 5)))
+        tld = r['domain'].rsplit('.', 1)[1]
+        r['company_name'] = name.capitalize()
+        r['domain'] = f"{name}{k}.{tld}"
+        r['company_url'] = f"https://{r['domain']}"
+        rows.append(r)
+    return normalize(pd.DataFrame(rows))
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10_000, 50_000, 100_000])
+    ap.add_argument('--legacy-max', type=int, default=2_000,
+                    help='largest size the O(n²) reference is run on')
+    ap.add_argument('--threshold', type=float, default=0.92)
+    args = ap.parse_args()
+
+    print(f"{'rows':>8} {'kept':>8} {'blocked_s':>10} {'legacy_s':>10} {'speedup':>8}")
+    for n in args.sizes:
+        df = synthetic_territory(n)
+        fast, t_fast = _timed(fuzzy_dedupe, df, args.threshold)
+        if n <= args.legacy_max:
+            slow, t_slow = _timed(legacy_fuzzy_dedupe, df, args.threshold)
+            assert fast['domain'].tolist() == slow['domain'].tolist(), 'blocked dedupe diverged'
+            legacy, speedup = f"{t_slow:10.2f}", f"{t_slow / t_fast:7.0f}x"
+        else:
+            legacy, speedup = f"{'-':>10}", f"{'-':>8}"
+        print(f"{n:>8} {len(fast):>8} {t_fast:10.2f} {legacy} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
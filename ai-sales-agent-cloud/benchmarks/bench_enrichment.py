@@ -0,0 +1,64 @@
+# benchmarks/bench_enrichment.py
+"""
+Wall time of the enrichment stage against a ZoomInfo stand-in with fixed latency.
+
+Serial wall time is companies + persona batches round trips; with the thread pool it
+should drop to roughly that / concurrency (until the rate limit binds).
+
+    python benchmarks/bench_enrichment.py --companies 200 --latency-ms 20
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors import zoominfo as zi
+from app.utils.enrichment import enrich_companies
+
+
+class SlowZoomInfo:
+    """Delegates to the mock connector after sleeping `latency` seconds per call."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def enrich_company(self, domain, rng=None):
+        time.sleep(self.latency)
+        return {"id": f"ZC_{domain}", "linkedin_url": f"https://www.linkedin.com/company/{domain}/"}
+
+    def find_personas_batch(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return zi.find_personas_batch(*args, **kwargs)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--companies", type=int, default=200)
+    ap.add_argument("--latency-ms", type=float, default=20)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    ap.add_argument("--rate-limit", type=float, default=None, help="connector calls per second")
+    args = ap.parse_args()
+
+    deduped = pd.DataFrame({
+        "domain": [f"company{i}.de" for i in range(args.companies)],
+        "company_name": [f"Company{i}" for i in range(args.companies)],
+        "country": "DE",
+    })
+    connector = SlowZoomInfo(args.latency_ms / 1000)
+    params = {"titles_regex": "", "zoominfo_rate_limit": args.rate_limit}
+
+    print(f"{'workers':>8} {'wall_s':>8} {'per_company_ms':>15} {'leads':>6}")
+    for workers in args.concurrency:
+        t0 = time.perf_counter()
+        companies, leads = enrich_companies(deduped, params, connector=connector, max_workers=workers)
+        wall = time.perf_counter() - t0
+        assert companies["domain"].tolist() == deduped["domain"].tolist()
+        print(f"{workers:>8} {wall:8.2f} {wall / args.companies * 1000:15.1f} {len(leads):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_export.py
+"""
+Export time and peak (Python-allocated) memory per artifact at several lead counts.
+
+"legacy" is the previous pandas ExcelWriter path, which ran twice per run (disk + UI).
+
+    python benchmarks/bench_export.py --sizes 1000 50000 200000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors import zoominfo as zi
+from app.utils import export
+
+
+def legacy_xlsx(companies, leads, needs):
+    bio = io.BytesIO()
+    with pd.ExcelWriter(bio, engine="xlsxwriter") as xl:
+        companies.to_excel(xl, sheet_name="Companies", index=False)
+        leads.to_excel(xl, sheet_name="Leads", index=False)
+        needs.to_excel(xl, sheet_name="Needs_SalesNav", index=False)
+    return bio.getvalue()
+
+
+def frames(n_leads: int):
+    n_companies = max(n_leads // 2, 1)
+    domains = [f"company{i}.de" for i in range(n_companies)]
+    companies = pd.DataFrame({
+        "domain": domains,
+        "company_name": [d.split(".")[0].capitalize() for d in domains],
+        "country": "DE", "hq_country": "DE", "vertical": "SaaS", "sw_visits": 75_000,
+        "company_url": ["https://" + d for d in domains],
+        "sf_account_id": None, "zoominfo_company_id": "ZC_1",
+        "li_company_url": [f"https://www.linkedin.com/company/{d.split('.')[0]}/" for d in domains],
+    })
+    leads = zi.find_personas_batch(domains * 2, "", True).head(n_leads)
+    needs = companies[~companies["domain"].isin(leads["company_domain"])]
+    return companies, leads, needs
+
+
+def measure(fn):
+    """(wall seconds, peak MB, output MB); the peak comes from a second, traced run."""
+    t0 = time.perf_counter()
+    out = fn()
+    wall = time.perf_counter() - t0
+    if isinstance(out, export.ExportBundle):
+        out = b"".join(data for name, data in out.artifacts.items() if not name.startswith("sn_accounts_upload"))
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall, peak / 2**20, len(out) / 2**20
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 50_000, 200_000])
+    args = ap.parse_args()
+    warnings.filterwarnings("ignore")  # legacy path warns per URL past Excel's 65k limit
+
+    print(f"{'leads':>8} {'artifact':<22} {'time_s':>8} {'peak_mb':>9} {'size_mb':>8}")
+    for n in args.sizes:
+        companies, leads, needs = frames(n)
+        cases = {
+            "legacy to_excel": lambda: legacy_xlsx(companies, leads, needs),
+            "xlsx (auto mode)": lambda: export.xlsx_bytes(
+                {"Companies": companies, "Leads": leads, "Needs_SalesNav": needs}),
+            "csv.gz": lambda: export.build_exports("bench", companies, leads, needs, formats=["csv.gz"]),
+        }
+        try:
+            import pyarrow  # noqa: F401
+            cases["parquet"] = lambda: export.build_exports("bench", companies, leads, needs, formats=["parquet"])
+        except ImportError:
+            pass
+        for name, fn in cases.items():
+            wall, peak, size = measure(fn)
+            print(f"{n:>8} {name:<22} {wall:8.2f} {peak:9.1f} {size:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
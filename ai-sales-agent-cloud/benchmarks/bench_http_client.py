@@ -0,0 +1,124 @@
+# benchmarks/bench_http_client.py
+"""
+Throughput and tail latency of company lookups against the local stub API
+(app.utils.http_stub) under a fixed server-side quota, from a thread pool:
+
+  naive      new connection per call, no client-side limit, immediate retries
+  pooled     HttpClient: keep-alive pool + token bucket at the quota + jittered backoff
+  coalesced  pooled, identical in-flight lookups share one request
+  batched    BulkBatcher over the bulk endpoint (--bulk-size domains per request)
+
+    python benchmarks/bench_http_client.py --lookups 2000 --quota 200 --latency-ms 5 --error-rate 0.02
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.http_client import BulkBatcher, HostQuota, HttpClient
+from app.utils.http_stub import StubServer
+
+
+def naive_lookup(base_url: str, domain: str, retries: int = 4):
+    """One fresh connection per attempt, retried right away: what per-call requests would do."""
+    parts = urlsplit(base_url)
+    for _ in range(retries + 1):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        try:
+            conn.request("GET", f"/zoominfo/company?{urlencode({'domain': domain})}")
+            resp = conn.getresponse()
+            body = resp.read()
+        finally:
+            conn.close()
+        if resp.status == 200:
+            return json.loads(body)
+    return None
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(label, lookup, domains, threads, stub):
+    before = dict(stub.stats)
+    latencies, failures = [], 0
+
+    def one(domain):
+        t0 = time.perf_counter()
+        try:
+            ok = lookup(domain) is not None
+        except Exception:
+            ok = False
+        latencies.append(time.perf_counter() - t0)
+        return ok
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(one, domains))
+    wall = time.perf_counter() - t0
+    failures = results.count(False)
+    seen = {k: stub.stats[k] - before.get(k, 0) for k in ("requests", "throttled", "errors", "connections")}
+    print(f"{label:<10} {len(domains) / wall:9.0f} {statistics.median(latencies) * 1000:8.1f} "
+          f"{percentile(latencies, 0.95) * 1000:8.1f} {percentile(latencies, 0.99) * 1000:8.1f} "
+          f"{seen['requests']:>9} {seen['throttled']:>6} {seen['errors']:>5} {seen['connections']:>6} {failures:>5}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lookups", type=int, default=2000)
+    ap.add_argument("--distinct", type=float, default=0.8, help="share of distinct domains")
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--quota", type=float, default=200, help="server-side requests/s")
+    ap.add_argument("--latency-ms", type=float, default=5)
+    ap.add_argument("--error-rate", type=float, default=0.02)
+    ap.add_argument("--bulk-size", type=int, default=25)
+    args = ap.parse_args()
+
+    rng = random.Random(3)
+    distinct = max(1, int(args.lookups * args.distinct))
+    domains = [f"company{rng.randrange(distinct)}.de" for _ in range(args.lookups)]
+    burst = max(1, int(args.quota // 10))
+
+    with StubServer(latency=args.latency_ms / 1000, error_rate=args.error_rate, quota=args.quota,
+                    burst=burst, seed=1) as stub:
+        url = f"{stub.url}/zoominfo/company"
+        quota = {"127.0.0.1": HostQuota(rate=args.quota, burst=burst, max_connections=args.threads,
+                                        bulk_size=args.bulk_size)}
+        print(f"{args.lookups:,} lookups ({distinct:,} distinct), {args.threads} threads, quota {args.quota:.0f} req/s, "
+              f"latency {args.latency_ms} ms, errors {args.error_rate:.0%}")
+        print(f"{'client':<10} {'lookups/s':>9} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} "
+              f"{'requests':>9} {'429s':>6} {'5xx':>5} {'conns':>6} {'fail':>5}")
+
+        run("naive", lambda d: naive_lookup(stub.url, d), domains, args.threads, stub)
+        time.sleep(1)  # let the server bucket refill between runs
+
+        pooled = HttpClient(quotas=quota, backoff_base=0.02)
+        run("pooled", lambda d: pooled.get_json(url, {"domain": d}, coalesce=False), domains, args.threads, stub)
+        time.sleep(1)
+
+        coalesced = HttpClient(quotas=quota, backoff_base=0.02)
+        run("coalesced", lambda d: coalesced.get_json(url, {"domain": d}), domains, args.threads, stub)
+        time.sleep(1)
+
+        bulk = HttpClient(quotas=quota, backoff_base=0.02)
+        # a read-only lookup, but POST: retried only with an idempotency key
+        batcher = BulkBatcher(lambda ds: bulk.post_json(f"{url}/bulk", {"domains": ds},
+                                                        idempotency_key=uuid.uuid4().hex)["results"],
+                              max_batch=args.bulk_size, max_wait=0.005)
+        run("batched", batcher.call, domains, args.threads, stub)
+        for client in (pooled, coalesced, bulk):
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
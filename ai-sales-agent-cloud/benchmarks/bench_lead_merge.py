@@ -0,0 +1,101 @@
+# benchmarks/bench_lead_merge.py
+"""
+Cross-source lead merge (app.utils.lead_merge.LeadIndex) vs. the plain concat it replaces.
+
+Builds ZoomInfo-shaped leads plus Sales Navigator leads of which a share are the same
+people (same name with other spacing/case, or the same profile URL in another form),
+then reports:
+  1) merge time: legacy pd.concat vs. LeadIndex.add of both sources
+  2) duplicates collapsed / rows left
+  3) "needs Sales Navigator" lookup: legacy isin scan over all leads vs. per-domain counts
+
+    python benchmarks/bench_lead_merge.py --leads 500000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors import sales_navigator as sn
+from app.connectors import zoominfo as zi
+from app.schema import concat_leads
+from app.utils.lead_merge import LeadIndex
+
+
+def synthetic_leads(leads: int, overlap: float, seed: int = 7):
+    """(zoominfo, sales_navigator, companies) with ~leads rows in total, 2 leads per domain per source."""
+    rng = random.Random(seed)
+    domains = [f"company{i}.de" for i in range(leads // 4)]
+    z_rows, s_rows = [], []
+    for d in domains:
+        for _ in range(2):
+            fn, ln = rng.choice(zi.FIRST_NAMES), rng.choice(zi.LAST_NAMES)
+            z_rows.append((d, f"{fn} {ln}", rng.choice(zi.TITLES), zi._email_for(fn, ln, d),
+                           f"https://www.linkedin.com/in/{zi._person_slug(fn, ln, d)}/", "zoominfo",
+                           round(rng.uniform(0.6, 0.95), 2)))
+            if rng.random() < overlap:  # same person, seen by Sales Navigator
+                if rng.random() < 0.5:
+                    name, profile = f"{fn.lower()}  {ln.upper()}", f"https://linkedin.com/in/{fn}-{ln}-sn"
+                else:
+                    name, profile = f"{fn} {ln}", f"https://de.linkedin.com/in/{zi._person_slug(fn, ln, d)}?trk=x"
+            else:
+                fn, ln = rng.choice(sn.SN_FIRST), rng.choice(sn.SN_LAST)
+                name, profile = f"{fn} {ln}", f"https://www.linkedin.com/in/{sn._person_slug(fn, ln, d)}/"
+            s_rows.append((d, name, rng.choice(sn.SN_TITLES), "", profile, "sales_navigator", 0.6))
+    zoominfo = concat_leads([pd.DataFrame(z_rows, columns=zi.PERSONA_COLUMNS)])
+    sales_nav = concat_leads([pd.DataFrame(s_rows, columns=sn.PERSONA_COLUMNS)])
+    companies = pd.DataFrame({"domain": domains + [f"nolead{i}.de" for i in range(len(domains) // 5)]})
+    return zoominfo, sales_nav, companies
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--leads", type=int, default=500_000)
+    ap.add_argument("--overlap", type=float, default=0.3, help="share of SN leads that are ZoomInfo people")
+    args = ap.parse_args()
+
+    zoominfo, sales_nav, companies = synthetic_leads(args.leads, args.overlap)
+    total = len(zoominfo) + len(sales_nav)
+    print(f"leads: {total:,} ({len(zoominfo):,} zoominfo + {len(sales_nav):,} sales_navigator), "
+          f"companies: {len(companies):,}")
+
+    concat_s, concatenated = timed(lambda: concat_leads([zoominfo, sales_nav]))
+    merge_s, index = timed(lambda: LeadIndex().add(zoominfo).add(sales_nav))
+    frame_s, merged = timed(index.frame)
+    print("merge:")
+    print(f"  legacy pd.concat              {concat_s:7.3f}s  rows {len(concatenated):,}")
+    print(f"  LeadIndex.add (both sources)  {merge_s:7.3f}s  {total / merge_s / 1e6:5.2f} M leads/s")
+    print(f"  LeadIndex.frame               {frame_s:7.3f}s  rows {len(merged):,} "
+          f"({index.duplicates:,} duplicates collapsed)")
+    zi_rows = merged[merged["source"] == "zoominfo"]
+    print(f"  merged ZoomInfo rows with SN profile: "
+          f"{(~zi_rows['li_profile'].str.contains('www.linkedin.com')).sum():,}")
+
+    legacy_s, legacy = timed(lambda: companies[~companies["domain"].isin(concatenated["company_domain"])])
+    lookup_s, needs = timed(lambda: index.without_leads(companies))
+    print("companies needing Sales Navigator:")
+    print(f"  legacy isin over all leads    {legacy_s * 1000:8.1f} ms  ({len(legacy):,})")
+    print(f"  per-domain lead counts        {lookup_s * 1000:8.1f} ms  ({len(needs):,})")
+    assert legacy["domain"].tolist() == needs["domain"].tolist()
+
+    probes = companies["domain"].sample(1000, random_state=1).tolist()
+    scan_s, _ = timed(lambda: [(concatenated["company_domain"] == d).sum() for d in probes[:50]])
+    count_s, _ = timed(lambda: [index.count(d) for d in probes])
+    print("single-domain lead count:")
+    print(f"  legacy scan                   {scan_s / 50 * 1e6:8.1f} µs")
+    print(f"  LeadIndex.count               {count_s / len(probes) * 1e6:8.3f} µs")
+
+
+if __name__ == "__main__":
+    main()
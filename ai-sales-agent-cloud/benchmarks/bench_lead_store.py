@@ -0,0 +1,86 @@
+# benchmarks/bench_lead_store.py
+"""
+Local lead/account store (app.utils.lead_store.LeadStore): bulk ingest and the
+"already seen / suppressed" anti-joins run_pipeline does before paid calls.
+
+  1) ingest --rows companies + --rows leads in batches (as many runs would)
+  2) suppress --suppressed domains and emails
+  3) filter_companies / filter_leads for one run's frames (--probe rows, half of them
+     already stored), with and without skip_seen
+
+    python benchmarks/bench_lead_store.py --rows 1000000 --probe 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.utils.lead_store import LeadStore
+
+
+def companies_frame(start: int, stop: int) -> pd.DataFrame:
+    domains = [f"company{i}.de" for i in range(start, stop)]
+    return pd.DataFrame({"domain": domains, "company_name": [d.split(".")[0].capitalize() for d in domains],
+                         "country": "DE", "vertical": "SaaS"})
+
+
+def leads_frame(start: int, stop: int) -> pd.DataFrame:
+    ids = range(start, stop)
+    return pd.DataFrame({
+        "company_domain": [f"company{i}.de" for i in ids],
+        "full_name": [f"Person {i}" for i in ids],
+        "title": "VP Sales",
+        "email": [f"person.{i}@company{i}.de" for i in ids],
+        "li_profile": [f"https://www.linkedin.com/in/person-{i}/" for i in ids],
+        "source": "zoominfo",
+        "confidence": 0.8,
+    })
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--probe", type=int, default=20_000)
+    ap.add_argument("--batch", type=int, default=100_000)
+    ap.add_argument("--suppressed", type=int, default=10_000)
+    args = ap.parse_args()
+
+    store = LeadStore(os.path.join(tempfile.mkdtemp(), "leads.sqlite"))
+    t0 = time.perf_counter()
+    for start in range(0, args.rows, args.batch):
+        stop = min(start + args.batch, args.rows)
+        store.ingest(companies_frame(start, stop), leads_frame(start, stop), run_id=f"run{start}")
+    ingest_s = time.perf_counter() - t0
+    print(f"ingest: {args.rows:,} companies + {args.rows:,} leads in {ingest_s:.1f}s "
+          f"({2 * args.rows / ingest_s / 1000:.0f}k rows/s)  store: {store.counts()}")
+
+    step = max(args.rows // args.suppressed, 1)
+    store.suppress("domain", [f"https://www.company{i}.de/" for i in range(0, args.rows, step)], reason="bench")
+    store.suppress("email", [f"Person.{i}@company{i}.de" for i in range(1, args.rows, step)], reason="bench")
+
+    # one run's frames: half already stored, half new
+    lo = args.rows - args.probe // 2
+    companies, leads = companies_frame(lo, lo + args.probe), leads_frame(lo, lo + args.probe)
+    print(f"anti-joins for one run ({args.probe:,} companies / leads, half stored) against {args.rows:,} rows:")
+    for skip_seen in (False, True):
+        c_s, kept_c = timed(lambda: store.filter_companies(companies, skip_seen=skip_seen))
+        l_s, kept_l = timed(lambda: store.filter_leads(leads, skip_seen=skip_seen))
+        print(f"  skip_seen={str(skip_seen):<5}  filter_companies {c_s * 1000:7.1f} ms (kept {len(kept_c):,})"
+              f"   filter_leads {l_s * 1000:7.1f} ms (kept {len(kept_l):,})")
+        assert c_s < 1.0 and l_s < 1.0
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
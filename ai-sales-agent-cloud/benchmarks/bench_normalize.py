@@ -0,0 +1,121 @@
+# benchmarks/bench_normalize.py
+"""
+Domain canonicalization and variant grouping on --rows raw Similarweb-style rows
+(generated brands; a share of messy spellings: scheme, www., paths, ports, upper case,
+co.uk hosts, and the .com/.io variants the search injects, here with renamed companies):
+
+  normalize   legacy .apply(canonical_domain / simple_company_name_from_domain), the
+              host/registrable/brand keys as a chain of pandas str ops, and domain_keys
+              (one compiled-regex pass per distinct value) + normalize
+  dedupe      rows reaching the fuzzy stage and FuzzyDeduper time on --dedupe-rows rows,
+              without and with (country, brand) variant grouping
+
+    python benchmarks/bench_normalize.py --rows 1000000 --dedupe-rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.dedupe import (
+    PUBLIC_SUFFIXES, FuzzyDeduper, canonical_domain, domain_keys, normalize, simple_company_name_from_domain,
+    variant_keys,
+)
+from app.utils.synthetic import SyntheticGenerator
+
+
+def raw_territory(n: int, seed: int = 3) -> pd.DataFrame:
+    gen = SyntheticGenerator(seed)
+    df = gen.companies(n, variant_rate=0)
+    rng = np.random.default_rng(seed)
+    domain = df["domain"].to_numpy(dtype=object)
+    kind = rng.integers(10, size=n)
+    # 0 https://www.<d>/about  1 HTTP://<D>:443/  2 <brand>.co.uk  3 .com/.io variant of an earlier row
+    domain = np.where(kind == 0, "https://www." + domain + "/about", domain)
+    upper = np.flatnonzero(kind == 1)
+    domain[upper] = ["HTTP://" + d.upper() + ":443/" for d in domain[upper]]
+    uk = np.flatnonzero(kind == 2)
+    domain[uk] = [d.rsplit(".", 1)[0] + ".co.uk" for d in domain[uk]]
+    variants = np.flatnonzero(kind == 3)
+    src = (variants * rng.random(len(variants))).astype(int)
+    domain[variants] = [d.rsplit(".", 1)[0] + (".com" if d.endswith(".io") else ".io") for d in
+                        df["domain"].to_numpy(dtype=object)[src]]
+    countries = df["country"].to_numpy(dtype=object)
+    countries[variants] = countries[src]
+    names = df["company_name"].to_numpy(dtype=object)
+    names[variants] = [f"{names[s]} {suffix}" for s, suffix in
+                       zip(src, rng.choice(["GmbH", "Inc", "Group", "Labs"], size=len(variants)))]
+    return df.assign(domain=domain, country=countries, company_name=names)
+
+
+def legacy_normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["domain"] = df["domain"].apply(canonical_domain)
+    df["company_name"] = df["domain"].apply(simple_company_name_from_domain)
+    return df
+
+
+def str_ops_keys(domains: pd.Series) -> pd.DataFrame:
+    """
+    domain_keys as a chain of pandas str ops (each one loops over the object column);
+    only looks at two-label suffixes, which is all raw_territory generates.
+    """
+    host = domains.str.lower().str.extract(
+        r'^\s*(?:[a-z][a-z0-9+.\-]*://)?/*(?:www\d*\.)?([^/:?#\s]*)', expand=False).str.rstrip(".")
+    labels = host.str.extract(r"(?:([^.]+)\.)?([^.]+)\.([^.]+)$")
+    last2 = labels[1] + "." + labels[2]
+    multi = last2.isin(PUBLIC_SUFFIXES) & labels[0].notna()
+    registrable = (labels[0] + "." + last2).where(multi, last2).fillna(host)
+    brand = labels[0].where(multi, labels[1]).fillna(host)
+    return pd.DataFrame({"host": host, "registrable": registrable, "brand": brand})
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def dedupe(norm: pd.DataFrame, grouped: bool):
+    deduper = FuzzyDeduper(0.92)
+    brands = variant_keys(norm) if grouped else [None] * len(norm)
+    t0 = time.perf_counter()
+    kept = sum(deduper.add(d, c, n, b) for d, c, n, b in
+               zip(norm["domain"].tolist(), norm["country"].tolist(), norm["company_name"].tolist(), brands))
+    fuzzy_in = len(deduper.seen_domains) - deduper.variants_dropped
+    return time.perf_counter() - t0, kept, fuzzy_in
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--dedupe-rows", type=int, default=100_000)
+    args = ap.parse_args()
+
+    raw = raw_territory(args.rows)
+    print(f"{len(raw):,} raw rows, e.g. {raw['domain'].head(4).tolist()}")
+    legacy_s, _ = timed(legacy_normalize, raw)
+    str_ops_s, expected = timed(str_ops_keys, raw["domain"])
+    keys_s, keys = timed(domain_keys, raw["domain"])
+    assert keys.equals(expected)
+    normalize_s, _ = timed(normalize, raw.drop(columns=["company_name"]))
+    print(f"legacy .apply normalize     {legacy_s:6.2f}s  (no www/path/port/registrable handling)")
+    print(f"pandas str ops keys         {str_ops_s:6.2f}s")
+    print(f"domain_keys                 {keys_s:6.2f}s   normalize (keys + names) {normalize_s:6.2f}s")
+    print(f"{keys['host'].nunique():,} hosts, {keys['registrable'].nunique():,} registrable domains, "
+          f"{keys['brand'].nunique():,} brands")
+
+    norm = normalize(raw.head(args.dedupe_rows))
+    print(f"\ndedupe of {len(norm):,} rows   {'fuzzy_in':>9} {'kept':>8} {'seconds':>8}")
+    for grouped in (False, True):
+        seconds, kept, fuzzy_in = dedupe(norm, grouped)
+        print(f"  {'with' if grouped else 'without'} variant grouping  {fuzzy_in:>9,} {kept:>8,} {seconds:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_personas.py
+"""
+Batched persona generation vs. one small DataFrame per company + pd.concat.
+
+    python benchmarks/bench_personas.py --domains 10000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors import sales_navigator as sn
+from app.connectors import zoominfo as zi
+
+REGEX = "(Head|VP|Director) (Marketing|Sales|Growth|Demand Gen)"
+
+
+def legacy_find_personas(zoominfo_company_id, titles_regex, country, company_domain, enable_email_enrichment=True):
+    """The per-row implementation find_personas used to have, for reference."""
+    try:
+        pattern = re.compile(titles_regex or "", re.IGNORECASE)
+    except re.error:
+        pattern = re.compile(".*")
+    rows = []
+    for _ in range(random.choice([0, 1, 2, 3])):
+        fn = random.choice(zi.FIRST_NAMES)
+        ln = random.choice(zi.LAST_NAMES)
+        title = random.choice(zi.TITLES)
+        if not pattern.search(title or ""):
+            continue
+        rows.append({
+            "company_domain": company_domain,
+            "full_name": f"{fn} {ln}",
+            "title": title,
+            "email": zi._email_for(fn, ln, company_domain) if enable_email_enrichment else "",
+            "li_profile": f"https://www.linkedin.com/in/{zi._person_slug(fn, ln, company_domain)}/",
+            "source": "zoominfo",
+            "confidence": round(random.uniform(0.6, 0.95), 2),
+        })
+    return pd.DataFrame(rows)
+
+
+def _run(label, fn):
+    random.seed(42)
+    t0 = time.perf_counter()
+    out = fn()
+    wall = time.perf_counter() - t0
+    print(f"{label:<34} {wall:8.3f}s  rows={len(out)}")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--domains", type=int, default=10_000)
+    args = ap.parse_args()
+    domains = [f"company{i}.de" for i in range(args.domains)]
+
+    def per_company(fn):
+        frames = [fn("ZC_1", REGEX, "DE", d) for d in domains]
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True)
+
+    legacy = _run("zoominfo legacy per-company+concat", lambda: per_company(legacy_find_personas))
+    batch = _run("zoominfo find_personas_batch", lambda: zi.find_personas_batch(domains, REGEX))
+    assert legacy.astype(str).equals(batch.astype(str)), "batched personas diverged from legacy"
+    _run("sales navigator account list", lambda: sn.find_personas_from_account_list(domains, REGEX))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_result_view.py
+"""
+Per-interaction latency of the Streamlit result tables at --leads leads:
+
+  full      what the page did: project the lead columns and ship the whole frame
+            to st.dataframe (serialized on every rerun)
+  refilter  server-side page, but re-filtering/sorting the whole frame with pandas
+  view      ResultView (app/utils/result_view.py): precomputed codes and sort orders,
+            cached selections, one page serialized
+
+Serialization is Arrow IPC (what st.dataframe sends) when pyarrow is installed,
+JSON otherwise. Times are medians over --repeat runs of each interaction.
+
+    python benchmarks/bench_result_view.py --leads 100000 --page-size 50
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schema import as_companies, as_leads
+from app.utils.result_view import LEAD_VIEW_COLUMNS, lead_view
+from app.utils.synthetic import SyntheticGenerator
+
+INTERACTIONS = [
+    ("first render", {}, None, True, 0),
+    ("next page", {}, None, True, 1),
+    ("title filter", {"title": "head"}, None, True, 0),
+    ("+ country", {"title": "head", "country": ["DE", "AT"]}, None, True, 0),
+    ("+ source", {"title": "head", "country": ["DE", "AT"], "source": ["zoominfo"]}, None, True, 0),
+    ("sort by name", {"title": "head", "country": ["DE", "AT"], "source": ["zoominfo"]}, "full_name", True, 0),
+    ("page 3", {"title": "head", "country": ["DE", "AT"], "source": ["zoominfo"]}, "full_name", True, 2),
+]
+
+
+def serializer():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return "json", lambda df: df.to_json(orient="split").encode("utf-8")
+
+    def arrow(df):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return "arrow", arrow
+
+
+def territory(n_leads: int):
+    gen = SyntheticGenerator(5)
+    companies = as_companies(gen.companies(max(1, n_leads // 2), variant_rate=0))
+    split = len(companies) * 3 // 4
+    leads = as_leads(pd.concat([
+        gen.personas(companies["domain"][:split], per_company=(1, 4)),
+        gen.personas(companies["domain"][split:], "sales_navigator", per_company=(1, 3)),
+    ], ignore_index=True))
+    return companies, leads.head(n_leads)
+
+
+def refilter(leads, country, filters, sort_by, ascending, page, page_size):
+    mask = pd.Series(True, index=leads.index)
+    if "title" in filters:
+        mask &= leads["title"].astype(str).str.contains(filters["title"], case=False, regex=False)
+    if "country" in filters:
+        mask &= country.isin(filters["country"])
+    if "source" in filters:
+        mask &= leads["source"].isin(filters["source"])
+    shown = leads.loc[mask, LEAD_VIEW_COLUMNS]
+    if sort_by:
+        shown = shown.sort_values(sort_by, ascending=ascending, kind="stable")
+    return shown.iloc[page * page_size:(page + 1) * page_size]
+
+
+def timed(fn, repeat):
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--leads", type=int, default=100_000)
+    ap.add_argument("--page-size", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    companies, leads = territory(args.leads)
+    fmt, serialize = serializer()
+    t0 = time.perf_counter()
+    view = lead_view(leads, companies)
+    build_ms = (time.perf_counter() - t0) * 1000
+    country = leads["company_domain"].map(companies.set_index("domain")["country"])
+    print(f"{len(leads):,} leads, {len(companies):,} companies, page size {args.page_size}, "
+          f"{fmt} serialization, view build {build_ms:.0f} ms (once per run)")
+    print(f"{'interaction':<14} {'full_ms':>8} {'refilter_ms':>11} {'view_ms':>8} {'full_kb':>8} {'page_kb':>8} {'rows':>7}")
+
+    full_ms, full_payload = timed(lambda: serialize(leads[LEAD_VIEW_COLUMNS]), args.repeat)
+    for label, filters, sort_by, ascending, page in INTERACTIONS:
+        refilter_ms, _ = timed(lambda: serialize(refilter(leads, country, filters, sort_by, ascending, page,
+                                                          args.page_size)), args.repeat)
+        # The view's first call per (filters, sort) builds the selection; report that cold call
+        view._selections.clear()
+        view_ms, payload = timed(lambda: serialize(view.page(view.select(filters, sort_by, ascending), page,
+                                                             args.page_size)), 1)
+        rows = len(view.select(filters, sort_by, ascending))
+        print(f"{label:<14} {full_ms:8.1f} {refilter_ms:11.1f} {view_ms:8.1f} {len(full_payload) / 1024:8.0f} "
+              f"{len(payload) / 1024:8.1f} {rows:>7,}")
+
+
+if __name__ == "__main__":
+    main()
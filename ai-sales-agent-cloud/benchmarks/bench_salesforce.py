@@ -0,0 +1,67 @@
+# benchmarks/bench_salesforce.py
+"""
+Batch account matching vs. one lookup call per domain, against the local org stand-in.
+
+    python benchmarks/bench_salesforce.py --accounts 50000 --domains 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors.salesforce import LocalSalesforceOrg, SalesforceClient
+
+TLDS = [".de", ".at", ".ch", ".fr", ".com", ".io", ".co.uk"]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--accounts", type=int, default=50_000)
+    ap.add_argument("--domains", type=int, default=50_000)
+    ap.add_argument("--per-row-sample", type=int, default=500,
+                    help="domains timed through find_account_by_domain (extrapolated)")
+    args = ap.parse_args()
+
+    rng = random.Random(3)
+    org = LocalSalesforceOrg()
+    websites = [f"https://www.brand{i}{rng.choice(TLDS)}/" for i in range(args.accounts)]
+    for start in range(0, len(websites), 10_000):
+        org.bulk_insert([{"Name": f"Brand {i}", "Website": w} for i, w in enumerate(websites[start:start + 10_000])])
+    client = SalesforceClient(org)
+
+    domains = pd.Series([f"brand{rng.randrange(args.accounts * 2)}{rng.choice(TLDS)}" for _ in range(args.domains)])
+
+    t0 = time.perf_counter()
+    client.sync()
+    t_sync = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ids = client.match_accounts(domains)
+    t_match = time.perf_counter() - t0
+
+    sample = domains.head(args.per_row_sample)
+    t0 = time.perf_counter()
+    for d in sample:
+        client.find_account_by_domain(d)
+    t_row = (time.perf_counter() - t0) / len(sample) * len(domains)
+
+    print(f"accounts={args.accounts} domains={args.domains} matched={ids.notna().sum()}")
+    print(f"sync (index build):        {t_sync:8.2f}s  api_calls={org.api_calls}")
+    print(f"match_accounts (batched):  {t_match:8.2f}s")
+    print(f"per-row lookups (extrap.): {t_row:8.2f}s")
+
+    new = pd.DataFrame({"company_name": [f"New {i}" for i in range(25_000)],
+                        "domain": [f"new{i}.de" for i in range(25_000)]})
+    calls = org.api_calls
+    t0 = time.perf_counter()
+    client.create_accounts(new)
+    print(f"create 25k accounts:       {time.perf_counter() - t0:8.2f}s  api_calls={org.api_calls - calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_schema.py
+"""
+Per-row memory of the companies and leads frames as the pipeline used to carry them
+(all object columns) vs. the canonical dtypes from app.schema, plus row-wise
+iteration as dicts (to_dict("records")) vs. slotted Company records.
+
+    python benchmarks/bench_schema.py --leads 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.connectors import zoominfo as zi
+from app.models import Company
+from app.schema import as_companies, as_leads, iter_records, memory_report
+
+
+def untyped_frames(n_leads: int, seed: int = 42):
+    """Companies/leads shaped like the Similarweb + ZoomInfo mocks, before any typing."""
+    random.seed(seed)
+    n_companies = max(n_leads // 2, 1)
+    countries = ["DE", "AT", "CH", "FR", "US"]
+    rows = []
+    for i in range(n_companies):
+        country = random.choice(countries)
+        domain = f"company{i}.{country.lower()}"
+        rows.append({
+            "domain": domain,
+            "company_name": f"Company{i}",
+            "country": country,
+            "hq_country": random.choice(countries),
+            "vertical": random.choice(["SaaS", "Ecommerce", "Fintech"]),
+            "sw_visits": random.randint(50_000, 150_000),
+            "company_url": f"https://{domain}",
+            "sf_account_id": None,
+            "zoominfo_company_id": f"ZC_{i}",
+            "li_company_url": f"https://www.linkedin.com/company/company{i}/",
+        })
+    companies = pd.DataFrame(rows).astype(object)
+    leads = zi.find_personas_batch(companies["domain"].tolist() * 3, "", True).head(n_leads)
+    return companies, leads.astype(object).reset_index(drop=True)
+
+
+def traced_peak(fn) -> float:
+    tracemalloc.start()
+    out = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del out
+    return peak / 2**20
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--leads", type=int, default=100_000)
+    args = ap.parse_args()
+
+    companies, leads = untyped_frames(args.leads)
+    typed_companies, typed_leads = as_companies(companies), as_leads(leads)
+
+    report = memory_report({
+        "companies (object)": companies,
+        "companies (schema)": typed_companies,
+        "leads (object)": leads,
+        "leads (schema)": typed_leads,
+    })
+    pd.set_option("display.width", 120)
+    print(report.to_string(index=False))
+    for name in ("companies", "leads"):
+        before, after = report.set_index("frame").loc[[f"{name} (object)", f"{name} (schema)"], "bytes"]
+        print(f"{name}: {before / after:.2f}x smaller")
+
+    print()
+    print("per-column bytes/row (leads):")
+    per_col = pd.DataFrame({
+        "object": leads.memory_usage(deep=True, index=False) / len(leads),
+        "schema": typed_leads.memory_usage(deep=True, index=False) / len(leads),
+        "dtype": typed_leads.dtypes.astype(str),
+    }).round(1)
+    print(per_col.to_string())
+
+    print()
+    dicts_mb = traced_peak(lambda: typed_companies.to_dict("records"))
+    records_mb = traced_peak(lambda: list(iter_records(typed_companies, Company)))
+    print(f"row-wise companies: dict records {dicts_mb:.1f} MiB, slotted Company records {records_mb:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
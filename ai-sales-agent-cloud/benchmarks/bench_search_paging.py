@@ -0,0 +1,86 @@
+# benchmarks/bench_search_paging.py
+"""
+Time to first row and total time of a Similarweb search consumed page by page
+against the local paged stub (app.utils.http_stub, /similarweb/search), with
+per-page processing (normalize + streaming fuzzy dedupe) as the pipeline does it:
+
+  eager         all pages fetched (what search_companies() does), then processed
+  paged         search_pages(prefetch=0): process each page as it arrives
+  prefetch      search_pages(prefetch=1): next page fetched while processing
+  no_pushdown   like prefetch, but filters applied client-side after fetching everything
+
+    python benchmarks/bench_search_paging.py --territory 100000 --page-size 2000 --latency-ms 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.connectors import similarweb as sw
+from app.schema import as_companies
+from app.utils.dedupe import FuzzyDeduper, normalize
+from app.utils.http_client import HttpClient
+from app.utils.http_stub import StubServer
+
+
+def process(page, deduper):
+    norm = normalize(as_companies(page))
+    return sum(deduper.add(d, c, n) for d, c, n in
+               zip(norm["domain"].tolist(), norm["country"].tolist(), norm["company_name"].tolist()))
+
+
+def run(label, pages, stub, keep=None):
+    before = stub.stats["search_rows_served"]
+    deduper = FuzzyDeduper(0.92)
+    t0 = time.perf_counter()
+    first, rows, kept = None, 0, 0
+    for page in pages:
+        if keep is not None:
+            page = page[keep(page)]
+        if first is None and len(page):
+            first = time.perf_counter() - t0
+        rows += len(page)
+        kept += process(page, deduper)
+    total = time.perf_counter() - t0
+    served = stub.stats["search_rows_served"] - before
+    print(f"{label:<12} {first or 0:8.2f} {total:8.2f} {rows:>8,} {kept:>8,} {served:>10,}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--territory", type=int, default=100_000, help="companies behind the stub")
+    ap.add_argument("--page-size", type=int, default=2000)
+    ap.add_argument("--latency-ms", type=float, default=100, help="server time per page request")
+    ap.add_argument("--min-visits", type=int, default=30_000)
+    ap.add_argument("--verticals", nargs="+", default=["SaaS", "Fintech"])
+    ap.add_argument("--countries", nargs="+", default=["DE", "AT", "CH"])
+    args = ap.parse_args()
+    filters = (args.verticals, args.countries, args.min_visits)
+
+    with StubServer(latency=args.latency_ms / 1000, search_rows=args.territory, seed=1) as stub:
+        client = HttpClient(quotas={})
+        kw = dict(page_size=args.page_size, base_url=stub.url, client=client)
+        list(sw.search_pages(*filters, **kw))  # build the stub territory, warm the connection
+        print(f"territory {args.territory:,}, page size {args.page_size:,}, {args.latency_ms:.0f} ms per page, "
+              f"filters {args.verticals} {args.countries} visits>={args.min_visits:,}")
+        print(f"{'mode':<12} {'first_s':>8} {'total_s':>8} {'rows':>8} {'kept':>8} {'rows_sent':>10}")
+
+        eager = (pd.concat(list(sw.search_pages(*filters, prefetch=0, **kw))) for _ in range(1))
+        run("eager", eager, stub)
+        run("paged", sw.search_pages(*filters, prefetch=0, **kw), stub)
+        run("prefetch", sw.search_pages(*filters, prefetch=1, **kw), stub)
+
+        def keep(page):
+            return (page["vertical"].isin(args.verticals) & page["country"].isin(args.countries)
+                    & (page["sw_visits"] >= args.min_visits))
+        everything = (list(sw.VERTICAL_SAMPLES), list(sw.COUNTRY_DOMAINS), 0)
+        run("no_pushdown", sw.search_pages(*everything, prefetch=1, **kw), stub, keep)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_sharding.py
+"""
+run_pipeline in-process vs. params["processes"] = 2, 4, ... on a large synthetic
+territory (countries x verticals). Reports the wall time of the sharded stages
+(normalize_dedupe + enrichment) and of the whole run, and checks that every sharded
+result equals the single-process one (seeded run).
+
+    python benchmarks/bench_sharding.py --rows 60000 --processes 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app import agent_orchestrator_clean as orch
+from app.connectors import similarweb as sw
+
+SYLLABLES = [a + b for a in "bcdfghklmnprstvz" for b in "aeiou"]
+COUNTRIES = ["DE", "AT", "CH", "FR", "US"]
+SHARDED_STAGES = ("normalize_dedupe", "enrichment")
+
+
+def synthetic_territory(rows: int, seed: int = 5) -> pd.DataFrame:
+    """Similarweb-shaped rows spread over 5 countries x 3 verticals, with near-duplicate names."""
+    rng = random.Random(seed)
+    out = []
+    for k in range(rows):
+        name = "".join(rng.choices(SYLLABLES, k=rng.randint(3, 5)))
+        if out and rng.random() < 0.1:  # variant of an earlier name
+            name = out[rng.randrange(len(out))]["company_name"].lower() + rng.choice("sx")
+        country = rng.choice(COUNTRIES)
+        domain = f"{name}{k}{sw.COUNTRY_DOMAINS[country]}"
+        out.append({
+            "domain": domain, "company_name": name.capitalize(), "country": country,
+            "hq_country": country, "vertical": rng.choice(list(sw.VERTICAL_SAMPLES)),
+            "sw_visits": rng.randint(50_000, 150_000), "company_url": f"https://{domain}",
+        })
+    return pd.DataFrame(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=60_000)
+    ap.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = ap.parse_args()
+    warnings.filterwarnings("ignore")  # xlsxwriter warns once per URL past Excel's 65k limit
+
+    territory = synthetic_territory(args.rows)
+    sw.search_companies = lambda *a, **k: territory.copy()
+    orch.OUTPUT_DIR = tempfile.mkdtemp()
+    params = {"verticals": list(sw.VERTICAL_SAMPLES), "countries": COUNTRIES, "min_monthly_visits": 50_000,
+              "titles_regex": "(Head|VP|Director)", "seed": 42}
+
+    print(f"rows: {args.rows:,}  cores: {os.cpu_count()}")
+    print(f"{'processes':>9} {'sharded_s':>10} {'speedup':>8} {'total_s':>8} {'same':>5}")
+    reference, base = None, None
+    for n in sorted(set(args.processes)):
+        t0 = time.perf_counter()
+        result = orch.run_pipeline({**params, "processes": n}, {})
+        total = time.perf_counter() - t0
+        stages = {s["stage"]: s["wall_s"] for s in result[0].attrs["run_report"]["stages"]}
+        sharded = sum(stages[s] for s in SHARDED_STAGES)
+        if reference is None:
+            reference, base = result, sharded
+        same = all(a.equals(b) for a, b in zip(reference, result))
+        print(f"{n:>9} {sharded:>10.2f} {base / sharded:>7.2f}x {total:>8.2f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
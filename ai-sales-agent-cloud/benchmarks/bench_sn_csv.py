@@ -0,0 +1,92 @@
+# benchmarks/bench_sn_csv.py
+"""
+Sales Navigator upload CSV: previous iterrows builder vs the columnar accounts_frame,
+to an in-memory buffer and streamed to disk (split at the upload row limit).
+
+    python benchmarks/bench_sn_csv.py --accounts 100000
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.utils.sales_navigator_csv import REQUIRED_COLUMNS, AccountsCsvWriter, accounts_frame
+
+
+def legacy_accounts_csv(companies_df: pd.DataFrame, path):
+    rows = []
+    for _, c in companies_df.iterrows():
+        rows.append({
+            'Company Name': c.get('company_name') or c['domain'],
+            'Company Website': c.get('company_url') or f"https://{c['domain']}",
+            'Company LinkedIn URL': c.get('li_company_url') or '',
+            'Country': c.get('hq_country') or c.get('country') or ''
+        })
+    pd.DataFrame(rows, columns=REQUIRED_COLUMNS).to_csv(path, index=False)
+    return path
+
+
+def synthetic_accounts(n: int, seed: int = 7) -> pd.DataFrame:
+    """Mixed coverage: some names/URLs/HQ countries are empty and need the fallbacks."""
+    rng = np.random.default_rng(seed)
+    domains = np.array([f"company{i}.de" for i in range(n)], dtype=object)
+    names = np.array([d.split(".")[0].capitalize() for d in domains], dtype=object)
+    names[rng.random(n) < 0.1] = ""
+    urls = np.array([f"https://www.{d}" for d in domains], dtype=object)
+    urls[rng.random(n) < 0.5] = ""
+    li = np.array([f"https://www.linkedin.com/company/{d.split('.')[0]}" for d in domains], dtype=object)
+    li[rng.random(n) < 0.3] = ""
+    hq = rng.choice(np.array(["DE", "AT", "CH", ""], dtype=object), n)
+    return pd.DataFrame({
+        "domain": domains, "company_name": names, "company_url": urls,
+        "li_company_url": li, "hq_country": hq, "country": "DE",
+        "vertical": "SaaS", "sw_visits": 75_000,
+    })
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--accounts", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    df = synthetic_accounts(args.accounts)
+
+    legacy_buf, new_buf = io.StringIO(), io.StringIO()
+    legacy_accounts_csv(df, legacy_buf)
+    accounts_frame(df).to_csv(new_buf, index=False)
+    assert legacy_buf.getvalue() == new_buf.getvalue(), "outputs differ"
+
+    t_legacy = timed(lambda: legacy_accounts_csv(df, io.StringIO()), args.repeat)
+    t_frame = timed(lambda: accounts_frame(df), args.repeat)
+    t_buffer = timed(lambda: accounts_frame(df).to_csv(io.StringIO(), index=False), args.repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sn_accounts_upload.csv")
+        t_disk = timed(lambda: AccountsCsvWriter(path).append(df), args.repeat)
+        files = len(AccountsCsvWriter(path, append=True).paths)
+
+    print(f"accounts: {args.accounts:,}")
+    print(f"legacy iterrows → csv        {t_legacy:8.3f}s")
+    print(f"accounts_frame only          {t_frame:8.3f}s")
+    print(f"accounts_frame → csv         {t_buffer:8.3f}s  ({t_legacy / t_buffer:.1f}x)")
+    print(f"AccountsCsvWriter → disk     {t_disk:8.3f}s  ({files} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_stable_hash.py
+"""
+Stable hashing (app.utils.stable_hash) vs. the built-in hash() it replaces.
+
+  1) cross-process check: ZoomInfo IDs, emails and LinkedIn slugs computed in
+     subprocesses with different PYTHONHASHSEED values must be identical
+     (built-in hash() is shown for contrast)
+  2) throughput over 1M domains: hash(), stable_hash per value, stable_hashes /
+     stable_ids on the whole column (the column helpers still hash row by row, so
+     expect them close to the per-value loop; the cost of stability is blake2b vs hash())
+
+    python benchmarks/bench_stable_hash.py --domains 1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import pandas as pd
+
+from app.utils.stable_hash import stable_hash, stable_hashes, stable_ids
+
+SAMPLE = ["acmeapp.de", "cloudify.at", "payflux.com", "ledgr.ch", "marketoid.fr"]
+
+CHILD = """
+import json, random, sys
+sys.path.append({root!r})
+from app.connectors import zoominfo as zi, sales_navigator as sn
+out = {{}}
+for d in {sample!r}:
+    out[d] = {{
+        "builtin": hash(d),
+        "zoominfo_id": zi.enrich_company(d, rng=random.Random(1))["id"],  # Random(1) draws 0.13 < 0.8
+        "email": zi._email_for("Jane", "Doe", d),
+        "zi_slug": zi._person_slug("Jane", "Doe", d),
+        "sn_slug": sn._person_slug("Jane", "Doe", d),
+    }}
+print(json.dumps(out))
+"""
+
+
+def cross_process_check():
+    runs = []
+    for seed in ("1", "2", "3"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        code = CHILD.format(root=ROOT, sample=SAMPLE)
+        runs.append(json.loads(subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                                              capture_output=True, text=True).stdout))
+    for field in ("builtin", "zoominfo_id", "email", "zi_slug", "sn_slug"):
+        same = all(r[d][field] == runs[0][d][field] for r in runs for d in SAMPLE)
+        print(f"  {field:<12} identical across PYTHONHASHSEED=1,2,3: {same}")
+        if field != "builtin":
+            assert same, f"{field} differs between processes"
+    print(f"  e.g. {SAMPLE[0]} → {runs[0][SAMPLE[0]]['zoominfo_id']}, {runs[0][SAMPLE[0]]['zi_slug']}")
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--domains", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    print("cross-process stability:")
+    cross_process_check()
+
+    domains = pd.Series([f"company{i}.de" for i in range(args.domains)], dtype=object)
+    values = domains.tolist()
+    cases = {
+        "builtin hash() (unstable)": lambda: [hash(d) for d in values],
+        "stable_hash per value": lambda: [stable_hash(d) for d in values],
+        "stable_hashes column": lambda: stable_hashes(domains),
+        "stable_ids column": lambda: stable_ids("ZC_", domains),
+    }
+    print(f"throughput over {args.domains:,} domains:")
+    results = {}
+    for name, fn in cases.items():
+        seconds, results[name] = timed(fn)
+        print(f"  {name:<28} {seconds:7.3f}s  {args.domains / seconds / 1e6:6.2f} M/s")
+    assert list(results["stable_hashes column"][:1000]) == results["stable_hash per value"][:1000]
+
+    ids = results["stable_ids column"]
+    legacy_ids = pd.Series([f"ZC_{abs(hash(d)) % 10000}" for d in values])
+    print(f"distinct IDs: stable {ids.nunique():,} / legacy % 10000 {legacy_ids.nunique():,} of {args.domains:,}")
+
+
+if __name__ == "__main__":
+    main()
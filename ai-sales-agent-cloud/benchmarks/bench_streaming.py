@@ -0,0 +1,89 @@
+# benchmarks/bench_streaming.py
+"""
+Peak RSS of run_pipeline (batch) vs. run_pipeline_streaming on a synthetic territory.
+Each mode runs in its own subprocess so the peaks don't mix.
+
+    python benchmarks/bench_streaming.py --rows 20000 --chunk-size 2000
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import pandas as pd
+
+from app.connectors import similarweb as sw
+
+SYLLABLES = [a + b for a in "bcdfghklmnprstvz" for b in "aeiou"]
+COUNTRIES = ["DE", "AT", "CH", "FR", "US"]
+
+
+def synthetic_chunks(rows: int, chunk_size: int, seed: int = 11):
+    """Similarweb-shaped rows, generated chunk by chunk."""
+    rng = random.Random(seed)
+    for start in range(0, rows, chunk_size):
+        out = []
+        for k in range(start, min(start + chunk_size, rows)):
+            name = "".join(rng.choices(SYLLABLES, k=rng.randint(3, 5)))
+            country = rng.choice(COUNTRIES)
+            domain = f"{name}{k}{sw.COUNTRY_DOMAINS[country]}"
+            out.append({
+                "domain": domain, "company_name": name.capitalize(), "country": country,
+                "hq_country": country, "vertical": rng.choice(list(sw.VERTICAL_SAMPLES)),
+                "sw_visits": rng.randint(50_000, 150_000), "company_url": f"https://{domain}",
+            })
+        yield pd.DataFrame(out)
+
+
+def _child(mode: str, rows: int, chunk_size: int, output_dir: str):
+    from app import agent_orchestrator_clean as orch
+
+    warnings.filterwarnings("ignore")  # xlsxwriter warns once per URL past Excel's 65k limit
+
+    params = {"verticals": ["SaaS"], "countries": COUNTRIES, "min_monthly_visits": 50_000,
+              "titles_regex": "(Head|VP|Director)", "use_sales_navigator_mock": True}
+    t0 = time.perf_counter()
+    if mode == "batch":
+        full = pd.concat(synthetic_chunks(rows, chunk_size), ignore_index=True)
+        sw.search_companies = lambda *a, **k: full
+        orch.OUTPUT_DIR = output_dir
+        companies, leads, _ = orch.run_pipeline(params, {})
+        n_companies, n_leads = len(companies), len(leads)
+    else:
+        summary = orch.run_pipeline_streaming(params, {}, chunk_size=chunk_size, output_dir=output_dir,
+                                              raw_chunks=synthetic_chunks(rows, chunk_size))
+        n_companies, n_leads = summary["rows"]["final_companies"], summary["rows"]["final_leads"]
+    wall = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>9} {wall:8.1f} {peak_mb:12.0f} {n_companies:>10} {n_leads:>8}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--chunk-size", type=int, default=2_000)
+    ap.add_argument("--mode", choices=["batch", "streaming"], help=argparse.SUPPRESS)
+    ap.add_argument("--output-dir", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.mode:
+        _child(args.mode, args.rows, args.chunk_size, args.output_dir)
+        return
+
+    print(f"{'mode':>9} {'wall_s':>8} {'peak_rss_mb':>12} {'companies':>10} {'leads':>8}")
+    for mode in ("batch", "streaming"):
+        with tempfile.TemporaryDirectory() as out:
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--rows", str(args.rows),
+                            "--chunk-size", str(args.chunk_size), "--output-dir", out], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_suite.py
+"""
+End-to-end benchmark suite on generated territories (params["synthetic_rows"]):
+run_pipeline at several sizes, each in a fresh process, recording the wall time of
+every stage (search, normalize_dedupe, salesforce, enrichment, sales_navigator,
+export: XLSX + CSV/csv.gz bundle) and the peak RSS of the process.
+
+Results are compared against the stored baseline (benchmarks/baseline.json); the
+suite exits with status 1 when a stage got slower than --tolerance x baseline
+(+ --slack seconds) or peak memory grew past --mem-tolerance x baseline.
+
+    python benchmarks/bench_suite.py                      # compare to the baseline
+    python benchmarks/bench_suite.py --update-baseline    # record a new baseline
+    python benchmarks/bench_suite.py --sizes 1000 100000 --baseline /tmp/b.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIZES = [1_000, 10_000, 50_000]
+
+PARAMS = {
+    "verticals": ["SaaS", "Ecommerce", "Fintech"],
+    "countries": ["DE", "AT", "CH", "FR", "US"],
+    "min_monthly_visits": 50_000,
+    "titles_regex": "(Head|VP|Director) (Marketing|Sales|Growth|Demand Gen)",
+    "enable_zoominfo_email_enrichment": True,
+    "use_sales_navigator_mock": True,
+    "export_formats": ["csv.gz"],
+    "seed": 7,
+}
+
+
+def child(size: int):
+    """One run in this (fresh) process; prints its measurements as JSON."""
+    warnings.filterwarnings("ignore")  # xlsxwriter warns once per URL past Excel's 65k limit
+    from app import agent_orchestrator_clean as orch
+
+    orch.OUTPUT_DIR = tempfile.mkdtemp()
+    t0 = time.perf_counter()
+    companies, leads, needs = orch.run_pipeline({**PARAMS, "synthetic_rows": size}, {})
+    total = time.perf_counter() - t0
+    stages = {s["stage"]: s["wall_s"] for s in companies.attrs["run_report"]["stages"]}
+    # ru_maxrss is KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        "stages": stages, "total_s": total, "peak_rss_mb": peak_mb,
+        "rows": {"companies": len(companies), "leads": len(leads), "needs_salesnav": len(needs)},
+    }))
+
+
+def measure(size: int) -> dict:
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", str(size)],
+                         cwd=tempfile.mkdtemp(), check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def regressions(size: str, result: dict, base: dict, args) -> list:
+    found = []
+    for stage, seconds in {**result["stages"], "total": result["total_s"]}.items():
+        ref = base["stages"].get(stage) if stage != "total" else base.get("total_s")
+        if ref is not None and seconds > ref * args.tolerance + args.slack:
+            found.append(f"{size}: {stage} {seconds:.2f}s > {ref:.2f}s baseline")
+    if result["peak_rss_mb"] > base["peak_rss_mb"] * args.mem_tolerance:
+        found.append(f"{size}: peak RSS {result['peak_rss_mb']:.0f} MB > {base['peak_rss_mb']:.0f} MB baseline")
+    return found
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor per stage")
+    ap.add_argument("--slack", type=float, default=0.25, help="seconds added to every stage's allowance")
+    ap.add_argument("--mem-tolerance", type=float, default=1.25)
+    ap.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(args.child)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results, failed = {}, []
+    for size in args.sizes:
+        result = results[str(size)] = measure(size)
+        stages = " ".join(f"{k}={v:.2f}" for k, v in result["stages"].items())
+        print(f"{size:>9,} rows  total {result['total_s']:7.2f}s  peak {result['peak_rss_mb']:7.0f} MB  "
+              f"{result['rows']}\n           {stages}")
+        if str(size) in baseline and not args.update_baseline:
+            failed += regressions(str(size), result, baseline[str(size)], args)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline written: {args.baseline}")
+        return
+    missing = [s for s in results if s not in baseline]
+    if missing:
+        print(f"no baseline for sizes {missing} (run with --update-baseline)")
+    if failed:
+        print("REGRESSIONS:\n  " + "\n  ".join(failed))
+        sys.exit(1)
+    print("no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
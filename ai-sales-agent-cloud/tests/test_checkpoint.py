@@ -0,0 +1,72 @@
+# tests/test_checkpoint.py
+import pandas as pd
+import pytest
+
+from app.agent_orchestrator_clean import run_pipeline
+from app.connectors import zoominfo as zi
+
+PARAMS = {
+    "verticals": ["SaaS"],
+    "countries": ["DE", "AT"],
+    "min_monthly_visits": 50000,
+    "titles_regex": "",
+    "use_sales_navigator_mock": True,
+    "synthetic_rows": 150,
+    "seed": 3,
+    "enrichment_concurrency": 1,
+}
+
+
+def counting(monkeypatch, fail_after=None):
+    """Replace zoominfo.enrich_company with a counting wrapper (raising after fail_after calls)."""
+    real, calls = zi.enrich_company, []
+
+    def enrich_company(*args, **kwargs):
+        calls.append(args[0])
+        if fail_after is not None and len(calls) > fail_after:
+            raise ConnectionError("ZoomInfo unavailable")
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(zi, "enrich_company", enrich_company)
+    return calls
+
+
+def assert_same_run(got, expected):
+    for g, e in zip(got, expected):
+        pd.testing.assert_frame_equal(g, e)
+
+
+def test_resume_after_crash_matches_uninterrupted_run(tmp_path, monkeypatch):
+    expected = run_pipeline({**PARAMS, "output_dir": str(tmp_path / "full")}, {})
+    params = {**PARAMS, "output_dir": str(tmp_path / "ck"), "checkpoint_dir": str(tmp_path / "checkpoints"),
+              "checkpoint_every": 40}
+
+    with monkeypatch.context() as m:
+        counting(m, fail_after=100)  # dies in the third batch of 40
+        with pytest.raises(ConnectionError):
+            run_pipeline(params, {})
+
+    calls = counting(monkeypatch)
+    resumed = run_pipeline(params, {})
+    assert_same_run(resumed, expected)
+    # the two finished batches were not enriched again
+    assert len(calls) == len(expected[0]) - 80
+    assert (tmp_path / "ck" / "sn_accounts_upload.csv").read_bytes() == \
+        (tmp_path / "full" / "sn_accounts_upload.csv").read_bytes()
+
+
+def test_finished_run_is_served_from_checkpoints(tmp_path, monkeypatch):
+    params = {**PARAMS, "output_dir": str(tmp_path / "out"), "checkpoint_dir": str(tmp_path / "checkpoints")}
+    first = run_pipeline(params, {})
+    calls = counting(monkeypatch)
+    again = run_pipeline(params, {})
+    assert_same_run(again, first)
+    assert calls == []
+
+
+def test_checkpoints_are_per_run_id(tmp_path):
+    base = {**PARAMS, "checkpoint_dir": str(tmp_path / "checkpoints")}
+    run_pipeline({**base, "run_id": "a", "output_dir": str(tmp_path / "a")}, {})
+    run_pipeline({**base, "run_id": "b", "output_dir": str(tmp_path / "b")}, {})
+    assert sorted(p.name.split("-")[0] for p in (tmp_path / "checkpoints").iterdir()) == ["a", "b"]
+    assert (tmp_path / "b" / "sn_accounts_upload.csv").exists()
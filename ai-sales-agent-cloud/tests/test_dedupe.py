@@ -0,0 +1,67 @@
+# tests/test_dedupe.py
+import random
+from collections import defaultdict
+
+import pandas as pd
+import pytest
+
+from app.utils.dedupe import FuzzyDeduper, _sim, fuzzy_dedupe, host_keys, normalize, variant_keys
+from app.utils.synthetic import SyntheticGenerator
+
+
+def pairwise_dedupe(df: pd.DataFrame, threshold: float):
+    """The O(n²) reference: first row per domain, brand variants dropped, then every kept name of the country."""
+    kept, kept_names = [], defaultdict(list)
+    seen_domains, seen_brands = set(), set()
+    for domain, country, name, brand in zip(df["domain"], df["country"], df["company_name"], variant_keys(df)):
+        if domain in seen_domains:
+            continue
+        seen_domains.add(domain)
+        if brand is not None:
+            if (country, brand) in seen_brands:
+                continue
+            seen_brands.add((country, brand))
+        name = name if isinstance(name, str) else ""
+        if any(_sim(other, name) >= threshold for other in kept_names[country]):
+            continue
+        kept_names[country].append(name)
+        kept.append(domain)
+    return kept
+
+
+def territory(n: int, seed: int = 5) -> pd.DataFrame:
+    """Generated companies (with domain variants) where ~1 in 6 names is a one-edit misspelling of an earlier one."""
+    df = SyntheticGenerator(seed).companies(n, countries=["DE", "AT", "CH"], variant_rate=0.1)
+    rng = random.Random(seed)
+    names = df["company_name"].tolist()
+    for i in range(1, len(names)):
+        if rng.random() < 0.16:
+            src = names[rng.randrange(i)]
+            pos = rng.randrange(len(src))
+            names[i] = src[:pos] + rng.choice("aeiouxyz") + src[pos + 1:]
+    return normalize(df.assign(company_name=names))
+
+
+@pytest.mark.parametrize("threshold", [0.8, 0.92])
+def test_blocked_dedupe_matches_pairwise(threshold):
+    df = territory(800)
+    assert fuzzy_dedupe(df, threshold)["domain"].tolist() == pairwise_dedupe(df, threshold)
+
+
+def test_chunked_feed_matches_one_pass():
+    df = territory(800)
+    deduper = FuzzyDeduper(0.92)
+    chunked = pd.concat([deduper.filter(df.iloc[i:i + 128]) for i in range(0, len(df), 128)])
+    assert chunked["domain"].tolist() == fuzzy_dedupe(df, 0.92)["domain"].tolist()
+
+
+def test_hosting_suffixes_keep_stores_apart():
+    assert host_keys("https://www.a.myshopify.com/products") == ("a.myshopify.com", "a.myshopify.com", "a")
+    assert host_keys("shop.acme.co.uk") == ("shop.acme.co.uk", "acme.co.uk", "acme")
+    df = pd.DataFrame({
+        "domain": ["a.myshopify.com", "b.myshopify.com", "x.github.io", "y.github.io", "acme.com", "www.acme.io"],
+        "country": ["US"] * 6,
+        "company_name": ["Alpha Outdoor", "Bravo Kitchen", "Xeno Labs", "Yotta Tools", "Acme", "Acme GmbH"],
+    })
+    # distinct stores on one hosting suffix stay; acme.com / acme.io are one brand
+    assert fuzzy_dedupe(df)["domain"].tolist() == df["domain"].tolist()[:5]
@@ -0,0 +1,65 @@
+# tests/test_export.py
+import io
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils import export
+from app.utils.synthetic import SyntheticGenerator
+
+
+def frames(n: int):
+    gen = SyntheticGenerator(1)
+    companies = gen.companies(n, variant_rate=0)
+    return companies, gen.personas(companies["domain"].head(5), per_company=(1, 1)), companies
+
+
+def sheet_rows(workbook: bytes, sheet: int = 1) -> int:
+    """Rows in one worksheet of an xlsx (header included), read from its XML."""
+    with zipfile.ZipFile(io.BytesIO(workbook)) as zf:
+        xml = zf.read(f"xl/worksheets/sheet{sheet}.xml").decode("utf-8")
+    return len(re.findall(r"<row ", xml))
+
+
+def test_xlsx_refuses_sheets_past_excel_row_limit():
+    # one row more than fits under the header; refused before anything is written
+    df = pd.DataFrame({"n": np.zeros(export.EXCEL_MAX_ROWS, dtype=np.int8)})
+    with pytest.raises(ValueError, match="rows"):
+        export.xlsx_bytes({"Companies": df})
+
+
+def test_xlsx_fills_a_sheet_up_to_the_limit(monkeypatch):
+    monkeypatch.setattr(export, "EXCEL_MAX_ROWS", 21)
+    companies, _, _ = frames(20)
+    for constant_memory in (False, True):
+        assert sheet_rows(export.xlsx_bytes({"Companies": companies}, constant_memory=constant_memory)) == 21
+    with pytest.raises(ValueError):
+        export.xlsx_bytes({"Companies": frames(21)[0]})
+
+
+def test_past_the_limit_exports_csv_and_clears_the_stale_workbook(monkeypatch, tmp_path):
+    small = export.build_exports("small", *frames(10))
+    small.write(str(tmp_path))
+    assert (tmp_path / "final.xlsx").exists()
+
+    monkeypatch.setattr(export, "EXCEL_MAX_ROWS", 21)
+    companies, leads, needs = frames(30)
+    bundle = export.build_exports("large", companies, leads, needs)
+    assert bundle.get("final.xlsx") is None
+    bundle.write(str(tmp_path))
+    assert not (tmp_path / "final.xlsx").exists()
+    written = pd.read_csv(tmp_path / "final_companies.csv")
+    assert written["domain"].tolist() == companies["domain"].tolist()
+
+
+def test_write_leaves_files_it_did_not_write_alone(monkeypatch, tmp_path):
+    # e.g. run_pipeline_streaming's outputs in the same directory
+    (tmp_path / "final_companies.csv").write_text("domain\nstreamed.de\n")
+    (tmp_path / "final_leads.csv").write_text("company_domain\n")
+    export.build_exports("xlsx", *frames(10)).write(str(tmp_path))
+    assert (tmp_path / "final.xlsx").exists()
+    assert (tmp_path / "final_companies.csv").read_text() == "domain\nstreamed.de\n"
+    assert (tmp_path / "final_leads.csv").exists()
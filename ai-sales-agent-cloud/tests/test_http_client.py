@@ -0,0 +1,52 @@
+# tests/test_http_client.py
+import time
+
+from app.agent_orchestrator_clean import run_pipeline
+from app.utils import http_client
+from app.utils.http_client import HostQuota, HttpClient
+from app.utils.http_stub import StubServer
+
+ACCOUNT = {"records": [{"Name": "Acme", "Website": "acme.io"}]}
+
+
+def test_post_after_the_server_closed_an_idle_connection():
+    with StubServer(idle_timeout=0.1) as stub:
+        client = HttpClient(max_retries=0)
+        client.post_json(f"{stub.url}/salesforce/accounts/bulk", ACCOUNT)
+        time.sleep(0.3)  # the stub drops the keep-alive connection meanwhile
+        assert len(client.post_json(f"{stub.url}/salesforce/accounts/bulk", ACCOUNT)["ids"]) == 1
+    assert client.stats["connections_dropped"] == 1 and client.stats["requests"] == 2
+
+
+def test_post_reconnects_once_when_a_reused_socket_fails_to_send(monkeypatch):
+    with StubServer() as stub:
+        client = HttpClient(max_retries=0)
+        client.get_json(f"{stub.url}/echo")
+        pool = next(iter(client._pools.values()))
+        stale = pool._idle[0]
+
+        def broken(*args, **kwargs):
+            raise BrokenPipeError("stale keep-alive socket")
+
+        monkeypatch.setattr(stale, "request", broken)
+        monkeypatch.setattr(http_client, "_dropped", lambda conn: False)  # not noticed before the send
+        assert len(client.post_json(f"{stub.url}/salesforce/accounts/bulk", ACCOUNT)["ids"]) == 1
+        assert stub.stats["requests"] == 2
+    assert client.stats["stale_reconnects"] == 1
+
+
+def test_pipeline_against_the_vendor_apis(tmp_path, monkeypatch):
+    with StubServer(search_rows=200, seed=3) as stub:
+        client = HttpClient(quotas={"127.0.0.1": HostQuota(bulk_size=25)})
+        monkeypatch.setattr(http_client, "_shared", client)
+        params = {
+            "verticals": ["SaaS"], "countries": ["DE", "AT"], "min_monthly_visits": 50000, "titles_regex": "",
+            "seed": 3, "use_sales_navigator_mock": True, "output_dir": str(tmp_path),
+            **{f"{vendor}_api_url": stub.url for vendor in ("similarweb", "zoominfo", "sales_navigator", "salesforce")},
+        }
+        companies, leads, _ = run_pipeline(params, {})
+    assert len(companies) and set(leads["source"]) == {"zoominfo", "sales_navigator"}
+    assert companies["zoominfo_company_id"].notna().all()  # the stub knows every company
+    # every connector went through the one client: one pool, its connections reused
+    assert list(client._pools) == [("http", "127.0.0.1", stub._server.server_address[1])]
+    assert client.stats["connections_reused"] > client.stats["connections_opened"]
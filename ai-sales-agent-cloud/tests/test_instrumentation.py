@@ -0,0 +1,32 @@
+# tests/test_instrumentation.py
+from app.agent_orchestrator_clean import run_pipeline
+from app.utils.cache import EnrichmentCache
+from app.utils.instrumentation import RunReport
+
+PARAMS = {
+    "verticals": ["SaaS"],
+    "countries": ["DE"],
+    "min_monthly_visits": 50000,
+    "titles_regex": "",
+    "synthetic_rows": 40,
+    "seed": 5,
+}
+
+
+def test_cache_hits_are_not_connector_calls(tmp_path):
+    cache = EnrichmentCache(path=None)
+    params = {**PARAMS, "output_dir": str(tmp_path)}
+    run_pipeline(params, {}, cache=cache)
+    report = RunReport()
+    run_pipeline(params, {}, report=report, cache=cache)
+    stats = report.connectors["zoominfo.enrich_company"]
+    assert (stats.calls, stats.cache_hits, sum(stats.buckets)) == (0, 40, 0)
+
+
+def test_cprofile_includes_worker_threads(tmp_path):
+    report = RunReport(profile="cprofile")
+    params = {**PARAMS, "output_dir": str(tmp_path), "enrichment_concurrency": 4}
+    with report.profiling(top=1000):
+        run_pipeline(params, {})
+    assert "worker thread(s)" in report.profile_text
+    assert "(_lookup)" in report.profile_text  # runs on the enrichment pool only
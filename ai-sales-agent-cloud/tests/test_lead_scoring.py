@@ -0,0 +1,23 @@
+# tests/test_lead_scoring.py
+import numpy as np
+import pandas as pd
+
+from app.utils.lead_scoring import top_k_per_company
+
+
+def reference_top_k(leads: pd.DataFrame, scores: np.ndarray, k: int) -> np.ndarray:
+    """Full sort by (company, score desc, position), first k per company."""
+    ranked = leads.assign(score=scores, pos=np.arange(len(leads)))
+    ranked = ranked.sort_values(["company_domain", "score", "pos"], ascending=[True, False, True])
+    return np.sort(ranked.groupby("company_domain").head(k)["pos"].to_numpy())
+
+
+def test_top_k_matches_a_full_sort_including_ties():
+    rng = np.random.default_rng(5)
+    n = 5000
+    # interleaved companies of very different sizes; few distinct scores, so many ties
+    leads = pd.DataFrame({"company_domain": rng.choice([f"c{i}.de" for i in range(300)], size=n,
+                                                       p=np.r_[np.full(10, 0.05), np.full(290, 0.5 / 290)])})
+    scores = rng.choice(np.array([0.25, 0.5, 0.75, -0.0, 0.0], dtype=np.float32), size=n)
+    for k in (1, 2, 3, 7):
+        np.testing.assert_array_equal(top_k_per_company(leads, scores, k), reference_top_k(leads, scores, k))
@@ -0,0 +1,102 @@
+# tests/test_lead_store.py
+import pandas as pd
+import pytest
+
+from app.agent_orchestrator_clean import run_pipeline
+from app.connectors import zoominfo as zi
+from app.utils.lead_store import LeadStore
+
+PARAMS = {
+    "verticals": ["SaaS"],
+    "countries": ["DE"],
+    "min_monthly_visits": 50000,
+    "titles_regex": "",
+    "synthetic_rows": 50,
+    "seed": 2,
+}
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Every LeadStore a run opens."""
+    stores = []
+    init = LeadStore.__init__
+
+    def tracked(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        stores.append(self)
+
+    monkeypatch.setattr(LeadStore, "__init__", tracked)
+    return stores
+
+
+def test_store_is_closed_after_a_run(tmp_path, opened):
+    params = {**PARAMS, "lead_store": str(tmp_path / "leads.sqlite"), "output_dir": str(tmp_path / "out")}
+    companies, _, _ = run_pipeline(params, {})
+    assert [s._db for s in opened] == [None]
+    with LeadStore(params["lead_store"]) as store:
+        assert store.filter_companies(companies, skip_seen=True).empty
+
+
+def test_store_is_closed_when_a_stage_fails(tmp_path, opened, monkeypatch):
+    def down(*args, **kwargs):
+        raise ConnectionError("ZoomInfo unavailable")
+
+    monkeypatch.setattr(zi, "enrich_company", down)
+    params = {**PARAMS, "lead_store": str(tmp_path / "leads.sqlite"), "output_dir": str(tmp_path / "out"),
+              "enrichment_concurrency": 1}
+    with pytest.raises(ConnectionError):
+        run_pipeline(params, {})
+    assert [s._db for s in opened] == [None]
+
+
+def person(source: str, email: str, profile: str):
+    return pd.DataFrame({
+        "company_domain": ["https://www.acme.de/"], "full_name": ["Anna Müller "], "title": ["VP Sales"],
+        "email": [email], "li_profile": [profile], "source": [source], "confidence": [0.7],
+    })
+
+
+def test_a_person_from_two_sources_is_one_lead(tmp_path):
+    sn = person("sales_navigator", "", "https://www.linkedin.com/in/anna-mueller-1/")
+    zoominfo = person("zoominfo", "Anna.Mueller@acme.de", "")
+    with LeadStore(str(tmp_path / "leads.sqlite")) as store:
+        store.ingest(pd.DataFrame(), sn, run_id="r1")
+        store.ingest(pd.DataFrame(), zoominfo, run_id="r2")
+        assert store.counts()["leads"] == 1
+        row = store._db.execute("SELECT email, li_profile, first_run, last_run FROM leads").fetchone()
+        assert row == ("Anna.Mueller@acme.de", "https://www.linkedin.com/in/anna-mueller-1/", "r1", "r2")
+        # seen under either source: a third source without email or profile is skipped too
+        assert store.filter_leads(person("apollo", "", ""), skip_seen=True).empty
+
+
+def test_leads_of_older_stores_are_rekeyed(tmp_path):
+    path = str(tmp_path / "leads.sqlite")
+    with LeadStore(path) as store:
+        store.ingest(pd.DataFrame(), person("zoominfo", "anna.mueller@acme.de", ""), run_id="r1")
+        store._db.execute("UPDATE leads SET lead_key = email_key")  # keyed like before SCHEMA_VERSION 1
+        store._db.execute("PRAGMA user_version = 0")
+    with LeadStore(path) as store:
+        store.ingest(pd.DataFrame(), person("sales_navigator", "", "https://linkedin.com/in/anna"), run_id="r2")
+        assert store.counts()["leads"] == 1
+
+
+def test_checkpointed_rerun_applies_the_current_store(tmp_path):
+    params = {**PARAMS, "lead_store": str(tmp_path / "leads.sqlite"), "output_dir": str(tmp_path / "out"),
+              "checkpoint_dir": str(tmp_path / "ck"), "skip_seen": True}
+    companies, leads, _ = run_pipeline(params, {})
+    assert len(companies) and len(leads)
+    # same inputs, so every stage comes from the checkpoint: the companies stored by the first run are skipped
+    companies, leads, _ = run_pipeline(params, {})
+    assert companies.empty and leads.empty
+
+
+def test_checkpointed_rerun_drops_new_suppressions(tmp_path):
+    params = {**PARAMS, "lead_store": str(tmp_path / "leads.sqlite"), "output_dir": str(tmp_path / "out"),
+              "checkpoint_dir": str(tmp_path / "ck")}
+    companies, leads, _ = run_pipeline(params, {})
+    domain = leads["company_domain"].iloc[0]
+    with LeadStore(params["lead_store"]) as store:
+        store.suppress("domain", [domain])
+    companies, leads, _ = run_pipeline(params, {})
+    assert domain not in set(companies["domain"]) and domain not in set(leads["company_domain"])
@@ -0,0 +1,14 @@
+# tests/test_ratelimit.py
+from app.utils import ratelimit
+from app.utils.ratelimit import shared_limiter
+
+
+def test_one_bucket_per_provider_at_the_lowest_rate(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_shared", {})
+    fast = shared_limiter("zoominfo", 50)
+    slow = shared_limiter("zoominfo", 5)
+    again = shared_limiter("zoominfo", 20)
+    assert fast is slow is again
+    assert (fast.rate, fast.capacity) == (5, 5.0)
+    assert shared_limiter("similarweb", 20) is not fast
+    assert [fast.try_acquire() for _ in range(6)] == [True] * 5 + [False]
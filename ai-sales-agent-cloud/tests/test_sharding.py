@@ -0,0 +1,39 @@
+# tests/test_sharding.py
+import pandas as pd
+
+from app.agent_orchestrator_clean import DEDUPE_THRESHOLD, run_pipeline
+from app.utils.dedupe import fuzzy_dedupe, normalize
+from app.utils.enrichment import enrich_companies
+from app.utils.sharding import shard_pool, sharded_dedupe, sharded_enrich
+from app.utils.synthetic import SyntheticGenerator
+
+PARAMS = {
+    "verticals": ["SaaS", "Fintech"],
+    "countries": ["DE", "AT", "CH"],
+    "min_monthly_visits": 50000,
+    "titles_regex": "(Head|VP|Director)",
+    "use_sales_navigator_mock": True,
+    "synthetic_rows": 400,
+    "seed": 11,
+}
+
+
+def test_sharded_steps_match_in_process():
+    norm = normalize(SyntheticGenerator(11).companies(400, ["SaaS", "Fintech"], ["DE", "AT", "CH"], variant_rate=0.1))
+    deduped = fuzzy_dedupe(norm, DEDUPE_THRESHOLD)
+    params = {**PARAMS, "processes": 2}
+    with shard_pool(2) as pool:
+        pd.testing.assert_frame_equal(sharded_dedupe(norm, DEDUPE_THRESHOLD, pool), deduped)
+        companies, leads = sharded_enrich(deduped, params, pool)
+    serial_companies, serial_leads = enrich_companies(deduped, PARAMS)
+    pd.testing.assert_frame_equal(companies, serial_companies)
+    pd.testing.assert_frame_equal(leads, serial_leads)
+
+
+def test_sharded_run_matches_serial_run(tmp_path):
+    serial = run_pipeline({**PARAMS, "output_dir": str(tmp_path / "serial")}, {})
+    sharded = run_pipeline({**PARAMS, "processes": 2, "output_dir": str(tmp_path / "sharded")}, {})
+    for expected, got in zip(serial, sharded):
+        pd.testing.assert_frame_equal(got, expected)
+    assert (tmp_path / "serial" / "sn_accounts_upload.csv").read_bytes() == \
+        (tmp_path / "sharded" / "sn_accounts_upload.csv").read_bytes()
@@ -0,0 +1,52 @@
+# tests/test_stable_hash.py
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pandas as pd
+
+from app.connectors import sales_navigator as sn
+from app.connectors import zoominfo as zi
+from app.utils.stable_hash import slug_suffix, slug_suffixes, stable_hash, stable_hashes, stable_id, stable_ids
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAINS = ["acme.com", "acme.de", "flowhq.de", "münchen-shop.de", "", "a|b.io"]
+
+
+def connector_values(domains):
+    """Everything the connectors derive from a domain via the stable hash."""
+    return {
+        "ids": [stable_id("ZC_", d) for d in domains],
+        "hashes": [stable_hash(d, "Jane", "Doe") for d in domains],
+        "emails": [zi._email_for("Jane", "Doe", d) for d in domains],
+        "zi_slugs": [zi._person_slug("Jane", "Doe", d) for d in domains],
+        "sn_slugs": [sn._person_slug("Eva", "Keller", d) for d in domains],
+    }
+
+
+def test_ids_match_across_subprocesses():
+    script = ("import json; from tests.test_stable_hash import DOMAINS, connector_values; "
+              "print(json.dumps(connector_values(DOMAINS)))")
+    expected = connector_values(DOMAINS)
+    # built-in hash() differs between these interpreters; the connector values must not
+    for hash_seed in ("0", "1", "random"):
+        env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+        assert json.loads(out.stdout) == expected
+
+
+def test_column_variants_match_scalars():
+    firsts = pd.Series(["Jane"] * len(DOMAINS))
+    domains = pd.Series(DOMAINS)
+    assert stable_hashes(domains, firsts).tolist() == [stable_hash(d, "Jane") for d in DOMAINS]
+    assert stable_ids("ZC_", domains).tolist() == [stable_id("ZC_", d) for d in DOMAINS]
+    assert slug_suffixes(domains, firsts).tolist() == [slug_suffix(d, "Jane") for d in DOMAINS]
+
+
+def test_ids_are_wide_and_do_not_collide():
+    ids = [stable_id("ZC_", f"company{i}.de") for i in range(200_000)]
+    assert all(re.fullmatch(r"ZC_[0-9a-f]{16}", i) for i in ids[:1000])
+    assert len(set(ids)) == len(ids)
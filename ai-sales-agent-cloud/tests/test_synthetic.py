@@ -0,0 +1,20 @@
+# tests/test_synthetic.py
+import pandas as pd
+
+from app.connectors import similarweb as sw
+from app.utils.synthetic import SyntheticGenerator
+
+
+def test_pages_are_the_full_territory_page_by_page():
+    filters = (["SaaS", "Fintech"], ["DE", "AT", "US"], 50_000)
+    full = sw.search_companies(*filters, size=2500, seed=4)
+    pages = list(sw.search_pages(*filters, page_size=700, prefetch=0, size=2500, seed=4))
+    assert [len(p) for p in pages[:-1]] == [700] * (len(pages) - 1)
+    pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True), full)
+
+
+def test_a_slice_has_the_rows_of_the_full_territory():
+    gen = SyntheticGenerator(7)
+    full = gen.companies(1000, variant_rate=0)
+    part = gen.companies(100, start=300, total=1000, variant_rate=0)
+    pd.testing.assert_frame_equal(part, full.iloc[300:400].reset_index(drop=True))